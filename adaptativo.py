@@ -1,105 +1,62 @@
-from threading import Thread, Lock
+from functools import partial
 from balanceador_base import BalanceadorBase
-import tkinter as tk
-from tkinter import messagebox
-import time
-import random
+from indice_carga import IndiceCarga
+from modelo_costos import DescriptorTarea, ModeloCostos
 
 class BalanceadorAdaptativo(BalanceadorBase):
-    def __init__(self, tareas, num_workers=3):
-        super().__init__(tareas, num_workers)
-        # Inicializar cargas de trabajadores y estimaciones de tareas
-        self.cargas_workers = [0] * self.num_workers
-        self.estimaciones_tareas = []
+    def __init__(self, tareas, num_workers=3, modelo_costos=None, archivo_modelo=None, **opciones):
+        super().__init__(tareas, num_workers, **opciones)
         self.carga_umbral = 2.5  # Umbral para cambiar de estrategia
-        self.lock = Lock()  # Agregar un lock para sincronización
+        # Segundos de trabajo pendiente estimados por worker, indexados para elegir el mínimo en O(log W)
+        self.indice = IndiceCarga(self.num_workers, umbral=self.carga_umbral)
+        # El modelo se puede compartir entre balanceadores o cargar de una ejecución anterior
+        self.modelo = modelo_costos if modelo_costos is not None else ModeloCostos(archivo_modelo)
         
     def estimar_peso_tarea(self, tarea):
-        """Estima el peso/dificultad de una tarea basado en características conocidas"""
-        # Intentamos detectar el tipo de tarea por su nombre o atributos
-        tarea_str = str(tarea)
-        if "calcular_primos" in tarea_str:
-            if "pesado" in tarea_str:
-                return 3.0  # tarea pesada
-            return 2.0
-        elif "multiplicar_matrices" in tarea_str:
-            return 2.5
-        elif "simulacion_montecarlo" in tarea_str:
-            return 1.8
-        elif "servidor" in tarea_str or "request" in tarea_str:
-            # Para tareas de servidor, asumimos un peso aleatorio pero predecible
-            # basado en alguna característica de la función
-            return 1.0 + (hash(tarea_str) % 100) / 50.0
-        # Para tareas desconocidas, peso intermedio
-        return 1.5
+        """Estima la duración (s) de una tarea con el modelo de costes aprendido"""
+        return self.modelo.estimar(tarea)
         
     def ejecutar(self):
         self.tipo_balanceador = "Adaptativo"
         self.crear_ventana("Balanceo Adaptativo", 
                         "== BALANCEO ADAPTATIVO ==\nSe asignarán tareas usando round-robin o por carga mínima según la saturación.")
         
-        hilos = []
-        self.cargas_workers = [0] * self.num_workers
-        asignaciones = ""
+        self.indice = IndiceCarga(self.num_workers, umbral=self.carga_umbral)
         
-        # Pre-estimamos los pesos de las tareas
-        self.estimaciones_tareas = [self.estimar_peso_tarea(tarea) for tarea in self.tareas]
-        
-        for i, tarea in enumerate(self.tareas):
-            peso_tarea = self.estimaciones_tareas[i]
+        for i, tarea in enumerate(self.iterar_tareas()):
+            # El peso se estima al recibir cada tarea: las tareas pueden llegar como flujo
+            peso_tarea = self.estimar_peso_tarea(tarea)
             
             # Si algún worker tiene carga por encima del umbral, usar carga mínima
-            carga_maxima = max(self.cargas_workers)
-            if carga_maxima >= self.carga_umbral:
-                worker_id = self.cargas_workers.index(min(self.cargas_workers))
-                estrategia = f"Carga mínima (carga máx: {carga_maxima:.2f} > umbral {self.carga_umbral})"
+            saturados = self.indice.saturados
+            if saturados:
+                worker_id = self.indice.asignar_minimo(peso_tarea)
+                estrategia = f"Carga mínima ({saturados} workers sobre el umbral {self.carga_umbral})"
             else:
                 worker_id = i % self.num_workers
-                estrategia = f"Round-robin (carga máx: {carga_maxima:.2f} < umbral {self.carga_umbral})"
+                self.indice.sumar(worker_id, peso_tarea)
+                estrategia = f"Round-robin (ningún worker sobre el umbral {self.carga_umbral})"
                 
-            asignaciones += f"Tarea {i+1} (peso {peso_tarea:.2f}) → Worker {worker_id} ({estrategia})\n"
+            self.anotar_asignacion(f"Tarea {i+1} (≈{peso_tarea:.2f} s) → Worker {worker_id} ({estrategia})")
             
             try:
-                # Actualizar la carga del worker seleccionado
-                self.cargas_workers[worker_id] += peso_tarea
-                
-                # Crear un hilo para ejecutar la tarea
-                t = Thread(target=self.worker_adaptativo, args=(worker_id, tarea, peso_tarea))
-                hilos.append(t)
-                t.start()
+                # Encolar la tarea; su carga se descuenta al terminar
+                self.enviar(worker_id, tarea, al_terminar=partial(self.liberar_carga, peso_tarea=peso_tarea, tarea=tarea))
             except Exception as e:
-                asignaciones += f"Error asignando tarea {i+1}: {e}\n"
+                self.indice.sumar(worker_id, -peso_tarea)
+                self.anotar_asignacion(f"Error asignando tarea {i+1}: {e}")
                 
-        self.crear_ventana("Asignaciones Adaptativo", f"Asignaciones realizadas:\n\n{asignaciones}")
+        self.crear_ventana("Asignaciones Adaptativo", f"Asignaciones realizadas:\n\n{self.texto_asignaciones()}")
         
-        for t in hilos:
-            t.join()
+        self.esperar_workers()
+        if self.modelo.archivo:
+            self.modelo.guardar()
             
         self.mostrar_resultados()
 
-    def worker_adaptativo(self, worker_id, tarea, peso_tarea):
-        """Worker modificado que ajusta la carga al completar la tarea"""
-        inicio = time.time()
-        
-        # Ejecutar la tarea
-        try:
-            resultado = tarea()
-            tiempo = time.time() - inicio
-            with self.lock:
-                # Almacenar los resultados en el formato que espera la clase base
-                while len(self.resultados[worker_id]) < len(self.tiempos[worker_id]):
-                    self.resultados[worker_id].append(False)
-                self.resultados[worker_id].append(True)
-                self.tiempos[worker_id].append(tiempo)
-                # Reducir la carga del worker una vez completada la tarea
-                self.cargas_workers[worker_id] -= peso_tarea
-        except Exception as e:
-            tiempo = time.time() - inicio
-            with self.lock:
-                # Registrar el error
-                while len(self.resultados[worker_id]) < len(self.tiempos[worker_id]):
-                    self.resultados[worker_id].append(False)
-                self.resultados[worker_id].append(False)
-                self.tiempos[worker_id].append(tiempo)
-                # Reducir la carga aunque haya habido un error
-                self.cargas_workers[worker_id] -= peso_tarea
+    def liberar_carga(self, worker_id, exito, tiempo, resultado, peso_tarea, tarea):
+        """Reduce la carga del worker al completar la tarea (también si hubo error) y
+        actualiza el modelo de costes con la duración observada"""
+        self.indice.sumar(worker_id, -peso_tarea)
+        if exito and isinstance(tarea, DescriptorTarea):
+            self.modelo.observar(tarea.tipo, tarea.tamano, tiempo)
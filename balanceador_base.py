@@ -1,194 +1,307 @@
 import time
+import asyncio
+import logging
 import threading
+from collections import deque
 from threading import Thread
-import tkinter as tk
-from tkinter import messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
+from typing import Dict, List, NamedTuple
+from colas_workers import FIN, MODOS_COLA
+from ejecucion import crear_ejecutor
+from metricas import MetricasBalanceo
+from instrumentacion import CAPACIDAD_EVENTOS, EventoTarea, RegistroEventos
+
+# Asignaciones que se conservan para la ventana de resumen
+MAX_ASIGNACIONES = 200
+
+registro = logging.getLogger(__name__)
+
+class ResultadoBalanceo(NamedTuple):
+    """Resultado de una ejecución de un balanceador; listas indexadas por worker"""
+    balanceador: str
+    backend: str
+    num_workers: int
+    num_tareas: int
+    tareas_rechazadas: int
+    duracion: float  # Segundos desde el primer envío hasta que terminan todos los workers
+    completadas: List[int]
+    fallidas: List[int]
+    tiempos_totales: List[float]
+    tiempos_promedio: List[float]
+    percentiles_latencia: Dict[str, float]  # p50/p95/p99/p99.9 de envío → fin, en segundos
+    robos: List[int]  # Tareas que cada worker robó a otros (modo_cola="robo")
+    detalles: Dict[str, float]  # Métricas propias de cada balanceador (detalles_resultado)
 
 class BalanceadorBase:
-    def __init__(self, tareas, num_workers=3):
+    def __init__(self, tareas, num_workers=3, backend="hilos", capacidad_cola=1000, hilos_blas=None,
+                 usar_cache=False, interactivo=True, capacidad_eventos=CAPACIDAD_EVENTOS, archivo_eventos=None,
+                 max_en_vuelo=None, modo_cola="fifo"):
+        # Cualquier iterable o iterador asíncrono; se consume de forma perezosa con iterar_tareas()
         self.tareas = tareas
         self.num_workers = num_workers
-        self.resultados = [[] for _ in range(num_workers)]
-        self.tiempos = [[] for _ in range(num_workers)]
+        self.backend = backend
+        self.ejecutor = crear_ejecutor(backend, num_workers, hilos_blas)
+        # Por defecto las tareas ignoran la caché de resultados: los tiempos medidos son de
+        # cómputo real (alimentan los modelos de costes); usar_cache=True la aprovecha
+        self.usar_cache = usar_cache
+        self.capacidad_cola = capacidad_cola  # Tamaño máximo de la cola de cada worker
+        # Límite de tareas enviadas y aún sin terminar: enviar() bloquea al alcanzarlo
+        self.max_en_vuelo = max_en_vuelo or num_workers * (capacidad_cola + 1)
+        self._cupos_en_vuelo = threading.BoundedSemaphore(self.max_en_vuelo)
+        # "fifo": cada worker ejecuta solo lo suyo; "robo": los workers ociosos roban
+        # tareas pendientes al más cargado (sin efecto con el backend "asyncio")
+        if modo_cola not in MODOS_COLA:
+            raise ValueError(f"Modo de cola no válido: {modo_cola!r} (opciones: {', '.join(MODOS_COLA)})")
+        self.modo_cola = modo_cola
+        self.colas = None
+        self.robos = [0] * num_workers  # Tareas robadas por cada worker
+        self.hilos_workers = []
+        self.en_curso = [0] * num_workers  # Tareas ejecutándose ahora mismo en cada worker
+        self.inicio_en_curso_ns = [None] * num_workers  # Despacho de la tarea en curso (workers con hilo)
+        # Éxitos, tiempos e histogramas de latencia por worker (memoria constante)
+        self.metricas = MetricasBalanceo(num_workers)
         self.root = None
         self.tipo_balanceador = "Base"  # Será sobrescrito por las subclases
         self.colores_worker = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6']
+        # Sin interfaz no se abren ventanas: los resultados se leen con obtener_resultado()
+        self.interactivo = interactivo
+        self.tareas_recibidas = 0
+        self.tareas_enviadas = 0
+        self.instante_inicio = None  # time.perf_counter() del primer envío
+        self.instante_fin = None  # time.perf_counter() al terminar todos los workers
+        # Un EventoTarea por tarea (envío, despacho, inicio, fin, CPU...), opcionalmente a JSONL
+        self.eventos = RegistroEventos(capacidad_eventos, archivo_eventos)
+        # Solo se conservan las últimas asignaciones para mostrarlas (memoria acotada)
+        self.asignaciones = deque(maxlen=MAX_ASIGNACIONES)
+        self.asignaciones_totales = 0
         
-    def worker(self, worker_id, tarea):
-        inicio = time.time()
+    def worker(self, worker_id, tarea, id_tarea=None, envio_ns=None, despacho_ns=None):
+        # El tiempo se mide dentro del contexto que ejecuta la tarea (hilo, proceso
+        # o intérprete del worker), así refleja el rendimiento paralelo real.
+        exito, tiempo, resultado, marcas = self.ejecutor.ejecutar(worker_id, tarea, self.usar_cache)
+        self._registrar(worker_id, exito, marcas, id_tarea, envio_ns, despacho_ns)
+        return exito, tiempo, resultado
+
+    def _registrar(self, worker_id, exito, marcas, id_tarea, envio_ns, despacho_ns):
+        if envio_ns is None:  # Ejecución directa con worker(), sin pasar por enviar()
+            envio_ns = despacho_ns = marcas.inicio_ns
+        self.metricas.registrar(worker_id, exito, marcas.fin_ns - marcas.inicio_ns, marcas.fin_ns - envio_ns)
+        self.eventos.registrar(EventoTarea(
+            -1 if id_tarea is None else id_tarea, worker_id, envio_ns, despacho_ns,
+            marcas.inicio_ns, marcas.fin_ns, marcas.cpu_ns, exito, marcas.tipo_excepcion))
+
+    def registrar_error_worker(self, worker_id, id_tarea, envio_ns, despacho_ns, error):
+        """Deja constancia de un fallo del propio worker (no de la tarea), p. ej. en al_terminar"""
+        registro.error("Error en Worker %d (tarea %d): %s", worker_id, id_tarea, error, exc_info=error)
+        self.eventos.registrar(EventoTarea(id_tarea, worker_id, envio_ns, despacho_ns, None, None, None,
+                                           False, type(error).__name__))
+
+    def registrar_rechazo(self):
+        """Deja constancia de una tarea que el balanceador no asignó a ningún worker"""
+        ahora = time.perf_counter_ns()
+        self.eventos.registrar(EventoTarea(-1, -1, ahora, None, None, None, None, False, "Rechazada"))
+
+    def iniciar_workers(self):
+        """Arranca N workers persistentes, cada uno drenando su propia cola acotada"""
+        self.colas = MODOS_COLA[self.modo_cola](self.num_workers, self.capacidad_cola)
+        self.hilos_workers = []
+        for worker_id in range(self.num_workers):
+            hilo = Thread(target=self._bucle_worker, args=(worker_id,),
+                          name=f"Worker-{worker_id}", daemon=True)
+            hilo.start()
+            self.hilos_workers.append(hilo)
+
+    def iterar_tareas(self):
+        """Recorre self.tareas de forma perezosa, sea un iterable o un iterador asíncrono"""
+        if hasattr(self.tareas, "__aiter__"):
+            yield from self._iterar_asincrono(self.tareas.__aiter__())
+            return
+        for tarea in self.tareas:
+            self.tareas_recibidas += 1
+            yield tarea
+
+    def _iterar_asincrono(self, iterador):
+        # Con el backend "asyncio" se avanza en su propio loop; si no, en uno temporal
+        loop = self.ejecutor.loop if self.backend == "asyncio" else None
+        loop_propio = asyncio.new_event_loop() if loop is None else None
+        try:
+            while True:
+                try:
+                    if loop_propio is not None:
+                        tarea = loop_propio.run_until_complete(iterador.__anext__())
+                    else:
+                        tarea = asyncio.run_coroutine_threadsafe(iterador.__anext__(), loop).result()
+                except StopAsyncIteration:
+                    return
+                self.tareas_recibidas += 1
+                yield tarea
+        finally:
+            if loop_propio is not None:
+                loop_propio.close()
+
+    def anotar_asignacion(self, texto):
+        self.asignaciones.append(texto)
+        self.asignaciones_totales += 1
+
+    def texto_asignaciones(self):
+        """Últimas asignaciones, para la ventana de resumen"""
+        omitidas = self.asignaciones_totales - len(self.asignaciones)
+        cabecera = f"(... {omitidas} asignaciones anteriores omitidas)\n" if omitidas > 0 else ""
+        return cabecera + "\n".join(self.asignaciones)
+
+    def enviar(self, worker_id, tarea, al_terminar=None):
+        """Encola una tarea para un worker; bloquea si su cola está llena o si hay
+        max_en_vuelo tareas sin terminar (contrapresión hacia el origen de las tareas).
+
+        al_terminar(worker_id, exito, tiempo, resultado) se invoca en el hilo del
+        worker cuando la tarea finaliza. Con el backend "asyncio" la tarea se lanza
+        como corrutina en el event loop.
+        """
+        self._cupos_en_vuelo.acquire()
+        envio_ns = time.perf_counter_ns()
+        if self.instante_inicio is None:
+            self.instante_inicio = envio_ns / 1e9
+        id_tarea = self.tareas_enviadas
+        self.tareas_enviadas += 1
+        try:
+            if self.backend == "asyncio":
+                self.ejecutor.programar(self._worker_async(worker_id, tarea, al_terminar, id_tarea, envio_ns))
+                return
+            if self.colas is None:
+                self.iniciar_workers()
+            self.colas.poner(worker_id, (tarea, al_terminar, id_tarea, envio_ns, worker_id))
+        except BaseException:
+            self._cupos_en_vuelo.release()
+            raise
+
+    def profundidad_cola(self, worker_id):
+        """Tareas pendientes más en ejecución de un worker (señal de carga real)"""
+        if self.colas is None:
+            return 0
+        return self.colas.tamano(worker_id) + self.en_curso[worker_id]
+
+    def tiempo_en_ejecucion(self, worker_id):
+        """Segundos que lleva ejecutándose la tarea en curso del worker (0 si está libre)"""
+        inicio = self.inicio_en_curso_ns[worker_id]
+        return 0.0 if inicio is None else (time.perf_counter_ns() - inicio) / 1e9
+
+    def migrar_pendiente(self, origen, destino):
+        """Mueve al worker destino la última tarea encolada (aún no empezada) de origen.
+
+        La tarea pasa a contar como asignada a destino: su al_terminar recibirá ese
+        worker. Devuelve False si origen no tenía tareas pendientes.
+        """
+        if self.colas is None:
+            return False
+        elemento = self.colas.extraer(origen)
+        if elemento is None:
+            return False
+        tarea, al_terminar, id_tarea, envio_ns, _ = elemento
+        self.colas.poner(destino, (tarea, al_terminar, id_tarea, envio_ns, destino))
+        return True
+
+    def esperar_workers(self):
+        """Espera a que los workers vacíen sus colas, los detiene y libera el backend"""
+        if self.backend == "asyncio":
+            self.ejecutor.esperar()
+        if self.colas is not None:
+            self.colas.cerrar()
+            for hilo in self.hilos_workers:
+                hilo.join()
+            self.robos = [a + b for a, b in zip(self.robos, self.colas.robos)]
+            self.colas = None
+            self.hilos_workers = []
+        self.instante_fin = time.perf_counter()
+        self.eventos.cerrar()
+        self.cerrar_backend()
+
+    def _bucle_worker(self, worker_id):
+        """Bucle de un worker persistente: ejecuta sus tareas una tras otra"""
+        colas = self.colas
+        while True:
+            elemento = colas.tomar(worker_id)
+            if elemento is FIN:
+                return
+            despacho_ns = time.perf_counter_ns()
+            tarea, al_terminar, id_tarea, envio_ns, worker_asignado = elemento
+            self.en_curso[worker_id] += 1
+            self.inicio_en_curso_ns[worker_id] = despacho_ns
+            try:
+                exito, tiempo, resultado = self.worker(worker_id, tarea, id_tarea, envio_ns, despacho_ns)
+                # Con robo de trabajo la tarea puede ejecutarla otro worker; el callback
+                # recibe el worker al que se asignó, que es el que contabilizó su carga
+                if al_terminar is not None:
+                    al_terminar(worker_asignado, exito, tiempo, resultado)
+            except Exception as e:
+                self.registrar_error_worker(worker_id, id_tarea, envio_ns, despacho_ns, e)
+            finally:
+                self.en_curso[worker_id] -= 1
+                self.inicio_en_curso_ns[worker_id] = None
+                self._cupos_en_vuelo.release()
+
+    async def _worker_async(self, worker_id, tarea, al_terminar, id_tarea, envio_ns):
+        """Equivalente de _bucle_worker para una única tarea en el event loop"""
+        despacho_ns = time.perf_counter_ns()
+        # en_curso solo se modifica desde el hilo del loop
+        self.en_curso[worker_id] += 1
         try:
-            result = tarea()
-            tiempo = time.time() - inicio
-            self.tiempos[worker_id].append(tiempo)
-            self.resultados[worker_id].append(True)
-            return True, tiempo, result
+            exito, tiempo, resultado, marcas = await self.ejecutor.ejecutar_async(worker_id, tarea, self.usar_cache)
+            self._registrar(worker_id, exito, marcas, id_tarea, envio_ns, despacho_ns)
+            if al_terminar is not None:
+                al_terminar(worker_id, exito, tiempo, resultado)
         except Exception as e:
-            tiempo = time.time() - inicio
-            self.tiempos[worker_id].append(tiempo)
-            self.resultados[worker_id].append(False)
-            return False, tiempo, str(e)
+            self.registrar_error_worker(worker_id, id_tarea, envio_ns, despacho_ns, e)
+        finally:
+            self.en_curso[worker_id] -= 1
+            self._cupos_en_vuelo.release()
+
+    def cerrar_backend(self):
+        """Libera los procesos o intérpretes asociados a los workers"""
+        self.ejecutor.cerrar()
 
     def crear_ventana(self, titulo, mensaje):
         """Método seguro para mostrar ventanas en el hilo principal"""
+        if not self.interactivo:
+            return None
+        # Tk se importa solo cuando hay interfaz: los usos sin pantalla no lo cargan
+        import tkinter as tk
+        from tkinter import messagebox
         if not hasattr(self, 'root') or self.root is None:
             self.root = tk.Tk()
             self.root.withdraw()
         return messagebox.showinfo(titulo, mensaje)
 
+    def obtener_resultado(self):
+        """Resume la ejecución en un ResultadoBalanceo (independiente de la interfaz)"""
+        duracion = 0.0
+        if self.instante_inicio is not None and self.instante_fin is not None:
+            duracion = self.instante_fin - self.instante_inicio
+        return ResultadoBalanceo(
+            balanceador=self.tipo_balanceador,
+            backend=self.backend,
+            num_workers=self.num_workers,
+            num_tareas=self.tareas_recibidas,
+            tareas_rechazadas=self.tareas_recibidas - self.tareas_enviadas,
+            duracion=duracion,
+            completadas=self.metricas.completadas(),
+            fallidas=self.metricas.fallidas(),
+            tiempos_totales=self.metricas.tiempos_totales(),
+            tiempos_promedio=self.metricas.tiempos_promedio(),
+            percentiles_latencia=self.metricas.percentiles("latencia"),
+            robos=list(self.robos),
+            detalles=self.detalles_resultado(),
+        )
+
+    def detalles_resultado(self):
+        """Métricas específicas del balanceador para ResultadoBalanceo (las subclases lo amplían)"""
+        return {}
+
     def mostrar_resultados(self):
-        """Muestra resultados con gráficos en una ventana detallada"""
-        # Crear ventana para gráficos
-        ventana_resultados = tk.Toplevel()
-        ventana_resultados.title(f"Resultados - {self.tipo_balanceador}")
-        ventana_resultados.geometry("900x700")
-        ventana_resultados.configure(bg="#f5f5f5")
-        
-        # Frame para título y resumen
-        frame_superior = tk.Frame(ventana_resultados, bg="#f5f5f5", padx=20, pady=10)
-        frame_superior.pack(fill=tk.X)
-        
-        tk.Label(frame_superior, text=f"RESULTADOS DEL BALANCEO {self.tipo_balanceador.upper()}", 
-                 font=("Arial", 16, "bold"), bg="#f5f5f5").pack()
-        
-        # Descripción del algoritmo
-        descripciones = {
-            "Centralizado": "Balanceo centralizado: Distribuye las tareas de manera secuencial (round-robin), asignando cada tarea al siguiente worker en la secuencia. Ofrece una distribución equitativa ideal para tareas similares.",
-            "Distribuido": "Balanceo distribuido: Cada worker tiene una capacidad máxima propia y decide independientemente si acepta nuevas tareas. La asignación es aleatoria simulando un entorno descentralizado.",
-            "Adaptativo": "Balanceo adaptativo: Cambia dinámicamente entre round-robin y asignación por carga mínima según la saturación del sistema. Se adapta automáticamente al estado actual de los workers.",
-            "Predictivo": "Balanceo predictivo: Utiliza predicciones basadas en el historial de tiempos para asignar tareas al worker que se estima será más eficiente, actualizando constantemente sus predicciones.",
-            "Reactivo": "Balanceo reactivo: Monitorea la carga de los workers y reacciona cuando detecta saturación, reasignando tareas a los menos ocupados para evitar cuellos de botella."
-        }
-        
-        if self.tipo_balanceador in descripciones:
-            tk.Label(frame_superior, text=descripciones[self.tipo_balanceador], 
-                     font=("Arial", 10, "italic"), bg="#f5f5f5", wraplength=850, 
-                     justify="left").pack(pady=10)
-        
-        # Datos para los gráficos
-        tareas_completadas = [sum(self.resultados[i]) for i in range(self.num_workers)]
-        tareas_fallidas = [len(self.resultados[i]) - sum(self.resultados[i]) for i in range(self.num_workers)]
-        tiempos_totales = [sum(self.tiempos[i]) for i in range(self.num_workers)]
-        tiempos_promedio = [sum(self.tiempos[i])/max(1,len(self.tiempos[i])) for i in range(self.num_workers)]
-        
-        # Frame para gráficos
-        frame_graficos = tk.Frame(ventana_resultados, bg="#f5f5f5")
-        frame_graficos.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Gráfico 1: Tareas completadas vs fallidas (barras)
-        fig1 = plt.Figure(figsize=(5, 4), dpi=100)
-        ax1 = fig1.add_subplot(111)
-        ind = np.arange(self.num_workers)
-        width = 0.35
-        
-        bar1 = ax1.bar(ind, tareas_completadas, width, label='Completadas', color='#2ecc71')
-        bar2 = ax1.bar(ind + width, tareas_fallidas, width, label='Fallidas', color='#e74c3c')
-        
-        # Añadir etiquetas con valores
-        for i, v in enumerate(tareas_completadas):
-            ax1.text(i, v + 0.1, str(v), ha='center')
-        for i, v in enumerate(tareas_fallidas):
-            ax1.text(i + width, v + 0.1, str(v), ha='center')
-        
-        ax1.set_ylabel('Número de tareas')
-        ax1.set_title('Distribución de Tareas por Worker')
-        ax1.set_xticks(ind + width / 2)
-        ax1.set_xticklabels([f'Worker {i}' for i in range(self.num_workers)])
-        ax1.legend()
-        fig1.tight_layout()
-        
-        # Gráfico 2: Tiempo total por worker (pastel)
-        fig2 = plt.Figure(figsize=(5, 4), dpi=100)
-        ax2 = fig2.add_subplot(111)
-        labels = [f'Worker {i}' for i in range(self.num_workers)]
-        wedges, texts, autotexts = ax2.pie(tiempos_totales, labels=labels, autopct='%1.1f%%', 
-                startangle=90, colors=self.colores_worker[:self.num_workers],
-                shadow=True, wedgeprops={'edgecolor': 'white'})
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-        ax2.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-        ax2.set_title('Distribución del Tiempo Total de Ejecución')
-        fig2.tight_layout()
-        
-        # Gráfico 3: Tiempos promedio (barras horizontales)
-        fig3 = plt.Figure(figsize=(5, 4), dpi=100)
-        ax3 = fig3.add_subplot(111)
-        bars = ax3.barh(range(self.num_workers), tiempos_promedio, 
-                     color=self.colores_worker[:self.num_workers], alpha=0.8)
-        
-        # Añadir etiquetas con valores
-        for i, bar in enumerate(bars):
-            ax3.text(bar.get_width() + 0.1, bar.get_y() + bar.get_height()/2, 
-                    f"{tiempos_promedio[i]:.2f}s", va='center')
-            
-        ax3.set_yticks(range(self.num_workers))
-        ax3.set_yticklabels([f'Worker {i}' for i in range(self.num_workers)])
-        ax3.set_xlabel('Tiempo (segundos)')
-        ax3.set_title('Tiempo Promedio por Worker')
-        fig3.tight_layout()
-        
-        # Colocar los gráficos en la ventana
-        canvas1 = FigureCanvasTkAgg(fig1, frame_graficos)
-        canvas1.draw()
-        canvas1.get_tk_widget().grid(row=0, column=0, padx=5, pady=5, sticky="nsew")
-        
-        canvas2 = FigureCanvasTkAgg(fig2, frame_graficos)
-        canvas2.draw()
-        canvas2.get_tk_widget().grid(row=0, column=1, padx=5, pady=5, sticky="nsew")
-        
-        canvas3 = FigureCanvasTkAgg(fig3, frame_graficos)
-        canvas3.draw()
-        canvas3.get_tk_widget().grid(row=1, column=0, columnspan=2, padx=5, pady=5, sticky="nsew")
-        
-        frame_graficos.grid_columnconfigure(0, weight=1)
-        frame_graficos.grid_columnconfigure(1, weight=1)
-        frame_graficos.grid_rowconfigure(0, weight=1)
-        frame_graficos.grid_rowconfigure(1, weight=1)
-        
-        # Tabla de resumen en la parte inferior
-        frame_resumen = tk.Frame(ventana_resultados, bg="#f5f5f5", padx=20, pady=10)
-        frame_resumen.pack(fill=tk.X)
-        
-        # Crear una tabla con mejor diseño
-        encabezados = ["Worker", "Tareas Completadas", "Tareas Fallidas", "Tiempo Total (s)", "Tiempo Promedio (s)"]
-        for i, header in enumerate(encabezados):
-            tk.Label(frame_resumen, text=header, font=("Arial", 10, "bold"), 
-                    bg="#34495e", fg="white", width=15, relief=tk.RIDGE, pady=5).grid(row=0, column=i, sticky="nsew")
-        
-        for i in range(self.num_workers):
-            tk.Label(frame_resumen, text=f"Worker {i}", bg=self.colores_worker[i], fg="white", 
-                    relief=tk.RIDGE, pady=5).grid(row=i+1, column=0, sticky="nsew")
-            tk.Label(frame_resumen, text=f"{tareas_completadas[i]}", bg="#f0f0f0",
-                    relief=tk.RIDGE, pady=5).grid(row=i+1, column=1, sticky="nsew")
-            tk.Label(frame_resumen, text=f"{tareas_fallidas[i]}", bg="#f0f0f0",
-                    relief=tk.RIDGE, pady=5).grid(row=i+1, column=2, sticky="nsew")
-            tk.Label(frame_resumen, text=f"{tiempos_totales[i]:.2f}", bg="#f0f0f0",
-                    relief=tk.RIDGE, pady=5).grid(row=i+1, column=3, sticky="nsew")
-            tk.Label(frame_resumen, text=f"{tiempos_promedio[i]:.2f}", bg="#f0f0f0",
-                    relief=tk.RIDGE, pady=5).grid(row=i+1, column=4, sticky="nsew")
-        
-        # Fila de totales
-        tk.Label(frame_resumen, text="TOTAL", font=("Arial", 9, "bold"), bg="#2c3e50", fg="white",
-                relief=tk.RIDGE, pady=5).grid(row=self.num_workers+1, column=0, sticky="nsew")
-        tk.Label(frame_resumen, text=f"{sum(tareas_completadas)}", font=("Arial", 9, "bold"), bg="#ecf0f1",
-                relief=tk.RIDGE, pady=5).grid(row=self.num_workers+1, column=1, sticky="nsew")
-        tk.Label(frame_resumen, text=f"{sum(tareas_fallidas)}", font=("Arial", 9, "bold"), bg="#ecf0f1",
-                relief=tk.RIDGE, pady=5).grid(row=self.num_workers+1, column=2, sticky="nsew")
-        tk.Label(frame_resumen, text=f"{sum(tiempos_totales):.2f}", font=("Arial", 9, "bold"), bg="#ecf0f1",
-                relief=tk.RIDGE, pady=5).grid(row=self.num_workers+1, column=3, sticky="nsew")
-        tk.Label(frame_resumen, text=f"{sum(tiempos_promedio)/self.num_workers:.2f}", font=("Arial", 9, "bold"), bg="#ecf0f1",
-                relief=tk.RIDGE, pady=5).grid(row=self.num_workers+1, column=4, sticky="nsew")
-        
-        # Ajustar tabla para que se expanda
-        for i in range(5):
-            frame_resumen.grid_columnconfigure(i, weight=1)
-        
-        # Botón para cerrar
-        tk.Button(ventana_resultados, text="Cerrar", command=ventana_resultados.destroy,
-                 padx=10, pady=5, bg="#e74c3c", fg="white", font=("Arial", 10, "bold"), width=20).pack(pady=15)
+        """Muestra resultados con gráficos en una ventana detallada (no hace nada sin interfaz)"""
+        if not self.interactivo:
+            return
+        # matplotlib y su backend TkAgg solo se cargan al dibujar resultados
+        from interfaz_resultados import mostrar_resultados
+        mostrar_resultados(self.obtener_resultado(), self.colores_worker)
         
         # Si hay una ventana root, destrúyela ya que ahora tenemos los resultados
         if hasattr(self, 'root') and self.root is not None:
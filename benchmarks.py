@@ -0,0 +1,148 @@
+"""
+Benchmarks de regresión del simulador.
+
+Cada benchmark devuelve una lista de filas (dict) con su medición, su presupuesto y si
+lo cumple (un máximo para tiempos, un mínimo para rendimientos). Ejecutado como script
+corre los benchmarks indicados (todos por defecto) y termina con código 1 si alguno no
+cumple su presupuesto:
+    python benchmarks.py importacion decisiones
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import deque
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Presupuestos de `python -X importtime -c "import <modulo>"` (mejor de N arranques, en ms).
+# Línea base medida con la GUI diferida: main ~250 ms, ejecutor_lote ~220 ms,
+# balanceador_base ~210 ms (antes, ~975 ms por cargar matplotlib/TkAgg al importar).
+PRESUPUESTOS_IMPORTACION_MS = {
+    "main": 400,
+    "ejecutor_lote": 350,
+    "balanceador_base": 350,
+    "servidor_simulado": 300,
+}
+# Módulos que no deben cargarse al importar, solo al mostrar resultados
+IMPORTACIONES_DIFERIDAS = ("matplotlib",)
+_LINEA_IMPORTTIME = re.compile(r"import time:\s*(\d+) \|\s*(\d+) \| (\s*)(\S+)")
+
+
+def medir_importacion(modulo, repeticiones=5):
+    """Devuelve (mejor tiempo acumulado en ms, conjunto de módulos cargados) al importar modulo"""
+    mejor = None
+    cargados = set()
+    for _ in range(repeticiones):
+        proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                                 cwd=DIRECTORIO, capture_output=True, text=True, check=True)
+        for linea in proceso.stderr.splitlines():
+            coincidencia = _LINEA_IMPORTTIME.match(linea)
+            if coincidencia is None:
+                continue
+            nombre = coincidencia.group(4)
+            cargados.add(nombre.split(".")[0])
+            if nombre == modulo and not coincidencia.group(3):
+                acumulado_ms = int(coincidencia.group(2)) / 1000
+                mejor = acumulado_ms if mejor is None else min(mejor, acumulado_ms)
+    return mejor, cargados
+
+
+def benchmark_importacion(repeticiones=5):
+    """Tiempo de importación de los puntos de entrada frente a su presupuesto"""
+    filas = []
+    for modulo, presupuesto in PRESUPUESTOS_IMPORTACION_MS.items():
+        tiempo_ms, cargados = medir_importacion(modulo, repeticiones)
+        indebidos = sorted(set(IMPORTACIONES_DIFERIDAS) & cargados)
+        filas.append({
+            "benchmark": f"importacion:{modulo}",
+            "valor": tiempo_ms,
+            "unidad": "ms",
+            "presupuesto": presupuesto,
+            "detalle": f"carga {', '.join(indebidos)}" if indebidos else "",
+            "cumple": tiempo_ms <= presupuesto and not indebidos,
+        })
+    return filas
+
+
+# Mínimo de decisiones por segundo del reparto por menor carga (IndiceCarga), por número
+# de workers. Línea base: ~330k dec/s con 10 workers y ~150k con 2000; el recorrido
+# lineal es más rápido con pocos workers (min() está en C) pero cae a ~30k con 2000.
+PRESUPUESTOS_DECISIONES = {
+    10: 80_000,
+    100: 80_000,
+    1000: 60_000,
+    2000: 60_000,
+}
+
+
+def _medir_decisiones(elegir, completar, num_workers, num_decisiones):
+    """Decisiones por segundo manteniendo 2 tareas en curso por worker de media"""
+    en_curso = deque()
+    limite = 2 * num_workers
+    inicio = time.perf_counter()
+    for _ in range(num_decisiones):
+        en_curso.append(elegir())
+        if len(en_curso) > limite:
+            completar(en_curso.popleft())
+    return num_decisiones / (time.perf_counter() - inicio)
+
+
+def benchmark_decisiones(num_decisiones=100_000):
+    """Decisiones por segundo de la elección del worker menos cargado según el número de workers"""
+    from indice_carga import IndiceCarga
+
+    filas = []
+    for num_workers, presupuesto in PRESUPUESTOS_DECISIONES.items():
+        indice = IndiceCarga(num_workers)
+        por_segundo = _medir_decisiones(lambda: indice.asignar_minimo(1), lambda w: indice.sumar(w, -1),
+                                        num_workers, num_decisiones)
+
+        # Referencia: el recorrido lineal que usaban antes los balanceadores
+        cargas = [0] * num_workers
+        def elegir_lineal():
+            w = cargas.index(min(cargas))
+            cargas[w] += 1
+            return w
+        def completar_lineal(w):
+            cargas[w] -= 1
+        lineal = _medir_decisiones(elegir_lineal, completar_lineal, num_workers,
+                                   max(1000, num_decisiones // max(1, num_workers // 10)))
+
+        filas.append({
+            "benchmark": f"decisiones:{num_workers}_workers",
+            "valor": por_segundo,
+            "unidad": "dec/s",
+            "presupuesto": presupuesto,
+            "detalle": f"lineal {lineal:.0f} dec/s",
+            "cumple": por_segundo >= presupuesto,
+        })
+    return filas
+
+
+BENCHMARKS = {
+    "importacion": benchmark_importacion,
+    "decisiones": benchmark_decisiones,
+}
+
+
+def main(argv=None):
+    nombres = (argv if argv is not None else sys.argv[1:]) or list(BENCHMARKS)
+    desconocidos = [n for n in nombres if n not in BENCHMARKS]
+    if desconocidos:
+        print(f"Benchmarks desconocidos: {', '.join(desconocidos)} (opciones: {', '.join(BENCHMARKS)})")
+        return 2
+    todos_cumplen = True
+    for nombre in nombres:
+        for fila in BENCHMARKS[nombre]():
+            estado = "OK" if fila["cumple"] else "REGRESIÓN"
+            print(f"{fila['benchmark']:<32} {fila['valor']:>10.1f} {fila['unidad']:<6} "
+                  f"(presupuesto {fila['presupuesto']}) {estado} {fila['detalle']}")
+            todos_cumplen &= fila["cumple"]
+    return 0 if todos_cumplen else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
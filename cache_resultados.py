@@ -0,0 +1,240 @@
+"""
+Caché de resultados direccionada por contenido para las funciones de tareas.py.
+
+La clave de cada entrada es un hash de (función, argumentos). Las funciones que usan
+aleatoriedad solo se memoizan cuando la llamada fija su semilla: sin ella, cada
+llamada debe producir un resultado nuevo. La caché es opcional: solo se usa después
+de llamar a activar_cache(). Tiene dos niveles:
+- memoria: LRU acotada por bytes;
+- disco (opcional): ficheros .npy para arrays y .pkl para el resto, que sobreviven
+  entre ejecuciones y se comparten entre procesos.
+
+Los balanceadores se la saltan (sin_cache()) salvo con usar_cache=True, para que los
+tiempos que miden, y que aprenden sus modelos de costes, sean de cómputo real.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+MAX_BYTES_CACHE = 256 * 1024 ** 2
+
+_cache_global = None
+_estado_hilo = threading.local()
+
+
+class CacheResultados:
+    """LRU en memoria acotada por bytes con un nivel opcional en disco"""
+
+    def __init__(self, max_bytes=MAX_BYTES_CACHE, directorio=None):
+        self.max_bytes = max_bytes
+        self.directorio = directorio
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self.entradas = OrderedDict()  # clave -> (valor, tamaño en bytes)
+        self.bytes_usados = 0
+        self.lock = threading.Lock()
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def obtener(self, clave):
+        """Devuelve (encontrado, valor) buscando primero en memoria y luego en disco"""
+        with self.lock:
+            if clave in self.entradas:
+                self.entradas.move_to_end(clave)
+                self.aciertos += 1
+                return True, self.entradas[clave][0]
+        encontrado, valor = self._leer_disco(clave)
+        with self.lock:
+            if encontrado:
+                self.aciertos_disco += 1
+            else:
+                self.fallos += 1
+        if encontrado:
+            self._guardar_memoria(clave, valor)
+        return encontrado, valor
+
+    def guardar(self, clave, valor):
+        """Guarda un resultado en memoria y, si hay directorio, también en disco"""
+        self._guardar_memoria(clave, valor)
+        self._escribir_disco(clave, valor)
+
+    def _guardar_memoria(self, clave, valor):
+        tamano = _tamano_en_bytes(valor)
+        if tamano > self.max_bytes:
+            return  # No cabe: solo se conserva en disco
+        with self.lock:
+            if clave in self.entradas:
+                self.bytes_usados -= self.entradas.pop(clave)[1]
+            self.entradas[clave] = (valor, tamano)
+            self.bytes_usados += tamano
+            # Desalojar las entradas menos usadas recientemente hasta respetar el límite
+            while self.bytes_usados > self.max_bytes:
+                _, (_, tamano_desalojado) = self.entradas.popitem(last=False)
+                self.bytes_usados -= tamano_desalojado
+                self.desalojos += 1
+
+    def _rutas(self, clave):
+        base = os.path.join(self.directorio, clave)
+        return base + ".npy", base + ".pkl"
+
+    def _leer_disco(self, clave):
+        if not self.directorio:
+            return False, None
+        ruta_npy, ruta_pkl = self._rutas(clave)
+        try:
+            if os.path.exists(ruta_npy):
+                return True, np.load(ruta_npy)
+            if os.path.exists(ruta_pkl):
+                with open(ruta_pkl, "rb") as f:
+                    return True, pickle.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            pass  # Fichero incompleto o corrupto: se trata como fallo
+        return False, None
+
+    def _escribir_disco(self, clave, valor):
+        if not self.directorio:
+            return
+        ruta_npy, ruta_pkl = self._rutas(clave)
+        # Escritura atómica: primero a un temporal y luego se renombra
+        temporal = os.path.join(self.directorio, f".{clave}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temporal, "wb") as f:
+                if isinstance(valor, np.ndarray):
+                    np.save(f, np.asarray(valor))
+                    destino = ruta_npy
+                else:
+                    pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    destino = ruta_pkl
+            os.replace(temporal, destino)
+        except (OSError, pickle.PicklingError):
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+    def limpiar(self):
+        """Vacía el nivel en memoria (el nivel en disco se conserva)"""
+        with self.lock:
+            self.entradas.clear()
+            self.bytes_usados = 0
+
+    def estadisticas(self):
+        """Devuelve los contadores de aciertos, fallos y desalojos"""
+        with self.lock:
+            consultas = self.aciertos + self.aciertos_disco + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "aciertos_disco": self.aciertos_disco,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "entradas": len(self.entradas),
+                "bytes_usados": self.bytes_usados,
+                "max_bytes": self.max_bytes,
+                "tasa_aciertos": (self.aciertos + self.aciertos_disco) / max(1, consultas),
+            }
+
+
+def _tamano_en_bytes(valor):
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    try:
+        return len(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+def calcular_clave(funcion, args, kwargs):
+    """Hash estable de (función, argumentos); None si los argumentos no son serializables"""
+    nombre = f"{funcion.__module__}.{funcion.__qualname__}"
+    try:
+        datos = pickle.dumps((nombre, args, sorted(kwargs.items())), protocol=4)
+    except Exception:
+        return None
+    return hashlib.sha256(datos).hexdigest()
+
+
+def activar_cache(max_bytes=MAX_BYTES_CACHE, directorio=None):
+    """Activa la caché global para las funciones marcadas como cacheables"""
+    global _cache_global
+    _cache_global = CacheResultados(max_bytes, directorio)
+    return _cache_global
+
+
+def desactivar_cache():
+    """Desactiva la caché global"""
+    global _cache_global
+    _cache_global = None
+
+
+def obtener_cache():
+    """Devuelve la caché global activa o None"""
+    return _cache_global
+
+
+def configuracion_cache():
+    """Parámetros de la caché activa, para replicarla en otros procesos (o None)"""
+    if _cache_global is None:
+        return None
+    return _cache_global.max_bytes, _cache_global.directorio
+
+
+@contextmanager
+def sin_cache():
+    """Desactiva la caché en el hilo actual (p. ej. para medir tiempos de cómputo reales)"""
+    anterior = getattr(_estado_hilo, "omitir", False)
+    _estado_hilo.omitir = True
+    try:
+        yield
+    finally:
+        _estado_hilo.omitir = anterior
+
+
+def _valor_argumento(firma, nombre, args, kwargs):
+    """Valor con que se llamó al parámetro `nombre` (también dentro de **kwargs), o None"""
+    try:
+        argumentos = firma.bind_partial(*args, **kwargs).arguments
+    except TypeError:
+        return None
+    if nombre in argumentos:
+        return argumentos[nombre]
+    for parametro in firma.parameters.values():
+        if parametro.kind is inspect.Parameter.VAR_KEYWORD:
+            return argumentos.get(parametro.name, {}).get(nombre)
+    return None
+
+
+def cacheable(funcion=None, *, semilla=None):
+    """Decorador que memoiza la función en la caché global cuando está activa.
+
+    Con semilla="parámetro", la función es aleatoria y solo se memoiza cuando la
+    llamada da a ese parámetro un valor distinto de None.
+    """
+    if funcion is None:
+        return functools.partial(cacheable, semilla=semilla)
+    firma = inspect.signature(funcion) if semilla else None
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        cache = _cache_global
+        if cache is None or getattr(_estado_hilo, "omitir", False):
+            return funcion(*args, **kwargs)
+        if semilla and _valor_argumento(firma, semilla, args, kwargs) is None:
+            return funcion(*args, **kwargs)
+        clave = calcular_clave(funcion, args, kwargs)
+        if clave is None:
+            return funcion(*args, **kwargs)
+        encontrado, valor = cache.obtener(clave)
+        if encontrado:
+            return valor
+        valor = funcion(*args, **kwargs)
+        cache.guardar(clave, valor)
+        return valor
+    return envoltura
@@ -2,13 +2,20 @@
 Este módulo define cargas de trabajo especializadas para diferentes tipos de balanceadores.
 Cada carga está diseñada para mostrar las fortalezas y debilidades de un algoritmo específico,
 manteniendo un equilibrio para comparaciones justas entre balanceadores.
+
+Las tareas matemáticas se construyen con functools.partial (y no con lambdas) para que
+puedan serializarse y ejecutarse en el backend de procesos de BalanceadorBase, y se
+envuelven en DescriptorTarea con su tipo y tamaño para que ModeloCostos pueda predecir
+su duración.
 """
 
 import random
+from functools import partial
 from tareas import calcular_primos_pesado, simulacion_montecarlo, multiplicar_matrices_gigantes
+from modelo_costos import DescriptorTarea
 from servidor_simulado import (
     generar_tarea_calculo, generar_tarea_consulta_db, 
-    generar_tarea_procesamiento_imagen, generar_conjunto_tareas
+    generar_tarea_procesamiento_imagen, generar_conjunto_tareas, obtener_cluster
 )
 
 # Constantes para equilibrar cargas
@@ -19,6 +26,16 @@ COMPLEJIDAD_BASE = {
     "matrices": 900,
 }
 
+def tarea_primos(n):
+    return DescriptorTarea(partial(calcular_primos_pesado, n, modo="referencia"), "primos", n)
+
+def tarea_montecarlo(n):
+    return DescriptorTarea(partial(simulacion_montecarlo, n, modo="referencia"), "montecarlo", n)
+
+def tarea_matrices(n):
+    # Un hilo de BLAS por tarea: el paralelismo lo ponen los workers, no BLAS
+    return DescriptorTarea(partial(multiplicar_matrices_gigantes, n, hilos_blas=1), "matrices", n)
+
 def obtener_carga_centralizada(cluster):
     """
     Carga especializada para el balanceador centralizado:
@@ -28,14 +45,14 @@ def obtener_carga_centralizada(cluster):
     """
     return [
         # 8 tareas computacionales similares para distribución uniforme
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] + 10000),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"]),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] + 5000),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] - 5000),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] + 15000),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] - 10000),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] + 20000),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] - 15000),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] + 10000),
+        tarea_primos(COMPLEJIDAD_BASE["primos"]),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] + 5000),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] - 5000),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] + 15000),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] - 10000),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] + 20000),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] - 15000),
     ]
 
 def obtener_carga_distribuida(cluster):
@@ -47,14 +64,14 @@ def obtener_carga_distribuida(cluster):
     """
     return [
         # Mezcla de tareas ligeras y pesadas para beneficiar la distribución por capacidad
-        lambda: simulacion_montecarlo(COMPLEJIDAD_BASE["montecarlo"] // 2),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] // 2),
-        lambda: multiplicar_matrices_gigantes(int(COMPLEJIDAD_BASE["matrices"] * 1.3)),
-        lambda: simulacion_montecarlo(COMPLEJIDAD_BASE["montecarlo"]),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"]),
-        lambda: multiplicar_matrices_gigantes(int(COMPLEJIDAD_BASE["matrices"] * 1.5)),
-        lambda: simulacion_montecarlo(COMPLEJIDAD_BASE["montecarlo"] // 3),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] // 3),
+        tarea_montecarlo(COMPLEJIDAD_BASE["montecarlo"] // 2),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] // 2),
+        tarea_matrices(int(COMPLEJIDAD_BASE["matrices"] * 1.3)),
+        tarea_montecarlo(COMPLEJIDAD_BASE["montecarlo"]),
+        tarea_primos(COMPLEJIDAD_BASE["primos"]),
+        tarea_matrices(int(COMPLEJIDAD_BASE["matrices"] * 1.5)),
+        tarea_montecarlo(COMPLEJIDAD_BASE["montecarlo"] // 3),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] // 3),
     ]
 
 def obtener_carga_adaptativa(cluster):
@@ -66,14 +83,14 @@ def obtener_carga_adaptativa(cluster):
     """
     return [
         # Tareas que incrementan progresivamente en carga
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] // 3),
-        lambda: simulacion_montecarlo(COMPLEJIDAD_BASE["montecarlo"] // 2),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] // 2),
-        lambda: simulacion_montecarlo(COMPLEJIDAD_BASE["montecarlo"]),
-        lambda: multiplicar_matrices_gigantes(COMPLEJIDAD_BASE["matrices"]),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"]),
-        lambda: multiplicar_matrices_gigantes(int(COMPLEJIDAD_BASE["matrices"] * 1.2)),
-        lambda: simulacion_montecarlo(int(COMPLEJIDAD_BASE["montecarlo"] * 1.3)),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] // 3),
+        tarea_montecarlo(COMPLEJIDAD_BASE["montecarlo"] // 2),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] // 2),
+        tarea_montecarlo(COMPLEJIDAD_BASE["montecarlo"]),
+        tarea_matrices(COMPLEJIDAD_BASE["matrices"]),
+        tarea_primos(COMPLEJIDAD_BASE["primos"]),
+        tarea_matrices(int(COMPLEJIDAD_BASE["matrices"] * 1.2)),
+        tarea_montecarlo(int(COMPLEJIDAD_BASE["montecarlo"] * 1.3)),
     ]
 
 def obtener_carga_predictiva(cluster):
@@ -90,15 +107,15 @@ def obtener_carga_predictiva(cluster):
     # Repetido dos veces para aprendizaje
     for _ in range(2):
         tareas.extend([
-            lambda: multiplicar_matrices_gigantes(COMPLEJIDAD_BASE["matrices"] // 2),
-            lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"]),
-            lambda: simulacion_montecarlo(COMPLEJIDAD_BASE["montecarlo"]),
+            tarea_matrices(COMPLEJIDAD_BASE["matrices"] // 2),
+            tarea_primos(COMPLEJIDAD_BASE["primos"]),
+            tarea_montecarlo(COMPLEJIDAD_BASE["montecarlo"]),
         ])
     
     # Agregar tareas finales para completar las 8 estándar
     tareas.extend([
-        lambda: multiplicar_matrices_gigantes(COMPLEJIDAD_BASE["matrices"] // 2),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] * 1.2),  # Un cambio para ver adaptabilidad
+        tarea_matrices(COMPLEJIDAD_BASE["matrices"] // 2),
+        tarea_primos(int(COMPLEJIDAD_BASE["primos"] * 1.2)),  # Un cambio para ver adaptabilidad
     ])
     
     return tareas
@@ -112,17 +129,17 @@ def obtener_carga_reactiva(cluster):
     """
     return [
         # Mezcla que genera picos de carga para probar reactividad
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] // 2),
-        lambda: simulacion_montecarlo(COMPLEJIDAD_BASE["montecarlo"] // 2),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] // 2),
+        tarea_montecarlo(COMPLEJIDAD_BASE["montecarlo"] // 2),
         # Pico de carga repentino
-        lambda: multiplicar_matrices_gigantes(int(COMPLEJIDAD_BASE["matrices"] * 1.4)),
-        lambda: multiplicar_matrices_gigantes(int(COMPLEJIDAD_BASE["matrices"] * 1.5)),
+        tarea_matrices(int(COMPLEJIDAD_BASE["matrices"] * 1.4)),
+        tarea_matrices(int(COMPLEJIDAD_BASE["matrices"] * 1.5)),
         # Retorno a carga normal
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"]),
-        lambda: simulacion_montecarlo(COMPLEJIDAD_BASE["montecarlo"]),
+        tarea_primos(COMPLEJIDAD_BASE["primos"]),
+        tarea_montecarlo(COMPLEJIDAD_BASE["montecarlo"]),
         # Otro pico más moderado
-        lambda: multiplicar_matrices_gigantes(int(COMPLEJIDAD_BASE["matrices"] * 1.2)),
-        lambda: calcular_primos_pesado(COMPLEJIDAD_BASE["primos"] // 3),  # Tarea ligera final
+        tarea_matrices(int(COMPLEJIDAD_BASE["matrices"] * 1.2)),
+        tarea_primos(COMPLEJIDAD_BASE["primos"] // 3),  # Tarea ligera final
     ]
 
 def obtener_carga_servidores_especializada(cluster, tipo_balanceador):
@@ -196,6 +213,64 @@ def obtener_carga_servidores_especializada(cluster, tipo_balanceador):
         tareas.append(generar_tarea_procesamiento_imagen(cluster))
     return tareas
 
+# Cargas por balanceador para cada tipo de tareas
+CARGAS_MATEMATICAS = {
+    "centralizado": obtener_carga_centralizada,
+    "distribuido": obtener_carga_distribuida,
+    "adaptativo": obtener_carga_adaptativa,
+    "predictivo": obtener_carga_predictiva,
+    "reactivo": obtener_carga_reactiva,
+    # Los picos de la carga reactiva desequilibran cualquier reparto estático
+    "robo_trabajo": obtener_carga_reactiva,
+    # La misma carga desigual: LPT muestra el reparto de referencia que el robo intenta alcanzar
+    "lote_lpt": obtener_carga_reactiva,
+}
+# Tareas matemáticas de cada balanceador que se incluyen en la carga mixta
+TAREAS_MIXTAS = {"centralizado": 3, "distribuido": 3, "adaptativo": 3, "predictivo": 4, "reactivo": 3,
+                 "robo_trabajo": 3, "lote_lpt": 3}
+TIPOS_TAREAS = ("matematicas", "servidores", "mixto")
+
+def obtener_tareas(tipo, balanceador, cluster=None):
+    """Obtiene tareas según el tipo solicitado ("matematicas", "servidores" o "mixto") y el balanceador.
+
+    Sin cluster, las cargas que lo necesitan usan el clúster compartido (obtener_cluster);
+    las matemáticas no lo crean.
+    """
+    if tipo != "matematicas" and cluster is None:
+        cluster = obtener_cluster()
+    if tipo == "matematicas":
+        # Usar cargas especializadas para cada balanceador si se especifica
+        if balanceador in CARGAS_MATEMATICAS:
+            return CARGAS_MATEMATICAS[balanceador](cluster)
+        # Si no se especifica balanceador, usar carga estándar
+        return [
+            tarea_primos(300_000),
+            tarea_montecarlo(10_000_000),
+            tarea_matrices(1000),
+            tarea_primos(400_000),
+            tarea_montecarlo(15_000_000),
+            tarea_matrices(1200),
+        ]
+    elif tipo == "servidores":
+        if balanceador:
+            return obtener_carga_servidores_especializada(cluster, balanceador)
+        return generar_conjunto_tareas(cluster, num_tareas=12)
+    elif tipo == "mixto":
+        # Combinación de tareas matemáticas y servidor, adaptadas por balanceador
+        if balanceador in CARGAS_MATEMATICAS:
+            n = TAREAS_MIXTAS[balanceador]
+            mat = CARGAS_MATEMATICAS[balanceador](cluster)[:n]
+            srv = obtener_carga_servidores_especializada(cluster, balanceador)[:n]
+        else:
+            mat = [
+                tarea_primos(200_000),
+                tarea_montecarlo(8_000_000),
+                tarea_matrices(800),
+            ]
+            srv = generar_conjunto_tareas(cluster, num_tareas=3)
+        return mat + srv
+    raise ValueError(f"Tipo de tareas no válido: {tipo!r} (opciones: {', '.join(TIPOS_TAREAS)})")
+
 def obtener_descripcion_carga(tipo_balanceador):
     """
     Devuelve una descripción de la carga especializada para cada balanceador
@@ -249,6 +324,25 @@ def obtener_descripcion_carga(tipo_balanceador):
         • Incluye matrices grandes que pueden saturar temporalmente los workers
         • Diseñada para probar la capacidad de reacción ante sobrecargas
         • Muestra cómo el balanceador responde a cambios repentinos de carga
+        """,
+        
+        "robo_trabajo": f"""
+        CARGA ESPECIALIZADA: PICOS DE CARGA ({NUM_TAREAS_ESTANDAR} tareas)
+        
+        • La misma carga con picos que el balanceador reactivo
+        • Las matrices grandes consecutivas caen en workers distintos por round-robin,
+          pero sus duraciones son muy desiguales
+        • Los workers que terminan antes roban las tareas pendientes de los demás
+        • Muestra cómo el robo de trabajo acerca el makespan al óptimo
+        """,
+        
+        "lote_lpt": f"""
+        CARGA ESPECIALIZADA: PICOS DE CARGA ({NUM_TAREAS_ESTANDAR} tareas)
+        
+        • La misma carga con picos que los balanceadores reactivo y de robo de trabajo
+        • Todo el lote se conoce de antemano, así que se reparte antes de ejecutar
+        • Las matrices grandes se colocan primero, cada una en un worker distinto
+        • Sirve de referencia "mejor posible" para comparar con los balanceadores en línea
         """
     }
     
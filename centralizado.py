@@ -1,30 +1,80 @@
-from threading import Thread
 from balanceador_base import BalanceadorBase
-import tkinter as tk
-from tkinter import messagebox
+from modelo_costos import DescriptorTarea
+from round_robin_ponderado import RoundRobinPonderado
 
 class BalanceadorCentralizado(BalanceadorBase):
+    def __init__(self, tareas, num_workers=3, pesos=None, intervalo_recalculo=50, pesos_servidores=None,
+                 **opciones):
+        """pesos (de los workers): None (round-robin simple), lista fija de num_workers
+        pesos, función que la devuelve o "rendimiento" (tareas/s medidas por worker).
+
+        pesos_servidores: lista o función (p. ej. pesos_por_capacidad(cluster)) con un
+        peso por servidor; las solicitudes a servidores se redirigen al servidor que
+        elige el round-robin ponderado, en lugar del que se fijó al crear la tarea.
+        Los pesos dinámicos se recalculan cada intervalo_recalculo tareas."""
+        super().__init__(tareas, num_workers, **opciones)
+        self.pesos = pesos
+        self.pesos_servidores = pesos_servidores
+        self.intervalo_recalculo = intervalo_recalculo
+        self.round_robin = RoundRobinPonderado(self.calcular_pesos())
+        self.round_robin_servidores = None
+        if pesos_servidores is not None:
+            self.round_robin_servidores = RoundRobinPonderado(self.calcular_pesos_servidores())
+
+    def calcular_pesos(self):
+        if self.pesos is None:
+            return [1] * self.num_workers
+        if self.pesos == "rendimiento":
+            # Tareas completadas por segundo de servicio; sin datos, la media de los demás
+            rendimientos = [c / t if t > 0 else None
+                            for c, t in zip(self.metricas.completadas(), self.metricas.tiempos_totales())]
+            conocidos = [r for r in rendimientos if r is not None]
+            media = sum(conocidos) / len(conocidos) if conocidos else 1
+            return [media if r is None else r for r in rendimientos]
+        pesos = list(self.pesos()) if callable(self.pesos) else list(self.pesos)
+        if len(pesos) != self.num_workers:
+            raise ValueError(f"Se esperaban {self.num_workers} pesos (uno por worker) y se recibieron {len(pesos)}")
+        return pesos
+
+    def calcular_pesos_servidores(self):
+        if callable(self.pesos_servidores):
+            return list(self.pesos_servidores())
+        return list(self.pesos_servidores)
+
     def ejecutar(self):
         self.tipo_balanceador = "Centralizado"
-        self.crear_ventana("Balanceo Centralizado", 
-                        "== BALANCEO CENTRALIZADO ==\nLas tareas se asignarán de forma secuencial (round-robin).")
-        
-        hilos = []
-        asignaciones = ""
-        for i, tarea in enumerate(self.tareas):
-            worker_id = i % self.num_workers
-            asignaciones += f"Tarea {i+1} → Worker {worker_id}\n"
+        if self.pesos is None:
+            descripcion = "Las tareas se asignarán de forma secuencial (round-robin)."
+        else:
+            descripcion = f"Las tareas se asignarán por round-robin ponderado suave (pesos {self.round_robin.pesos})."
+        if self.round_robin_servidores is not None:
+            descripcion += ("\nLas solicitudes se envían a los servidores por round-robin ponderado suave "
+                            f"(pesos {self.round_robin_servidores.pesos}).")
+        self.crear_ventana("Balanceo Centralizado",
+                        f"== BALANCEO CENTRALIZADO ==\n{descripcion}")
+
+        dinamico = self.pesos == "rendimiento" or callable(self.pesos)
+        for i, tarea in enumerate(self.iterar_tareas()):
+            if i > 0 and i % self.intervalo_recalculo == 0:
+                if dinamico:
+                    self.round_robin.actualizar_pesos(self.calcular_pesos())
+                if callable(self.pesos_servidores):
+                    self.round_robin_servidores.actualizar_pesos(self.calcular_pesos_servidores())
+            worker_id = self.round_robin.siguiente()
+            destino = ""
+            if (self.round_robin_servidores is not None and isinstance(tarea, DescriptorTarea)
+                    and tarea.servidor is not None):
+                tarea.servidor = self.round_robin_servidores.siguiente()
+                destino = f" (Servidor {tarea.servidor})"
+            self.anotar_asignacion(f"Tarea {i+1} → Worker {worker_id}{destino}")
             try:
-                t = Thread(target=self.worker, args=(worker_id, tarea))
-                hilos.append(t)
-                t.start()
+                self.enviar(worker_id, tarea)
             except Exception as e:
-                asignaciones += f"Error asignando tarea {i+1}: {e}\n"
-        
-        self.crear_ventana("Asignaciones Centralizado", f"Asignaciones realizadas:\n\n{asignaciones}")
-        
-        for t in hilos:
-            t.join()
-        
+                self.anotar_asignacion(f"Error asignando tarea {i+1}: {e}")
+
+        self.crear_ventana("Asignaciones Centralizado", f"Asignaciones realizadas:\n\n{self.texto_asignaciones()}")
+
+        self.esperar_workers()
+
         self.mostrar_resultados()
-        
+
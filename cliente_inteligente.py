@@ -0,0 +1,318 @@
+"""
+Cliente inteligente para ClusterServidores: solicitudes cubiertas, cortocircuitos y
+presupuesto de reintentos.
+
+Las tareas de generar_tarea_* fijan un servidor al crearse y fallan en cuanto éste
+responde "Servidor saturado"; un único servidor lento domina la cola de latencias y
+la tasa de error. ClienteInteligente envuelve ClusterServidores.enviar_solicitud_async:
+
+- Solicitudes cubiertas (hedged requests): si la respuesta tarda más que el p95
+  reciente de ese tipo de solicitud, se lanza una copia a otro servidor; la primera
+  respuesta correcta gana y la otra se cancela (libera su conexión en el servidor).
+- Cortocircuito por servidor (cerrado / abierto / semiabierto): se abre cuando la
+  tasa de rechazo de las últimas solicitudes supera un umbral; pasado un tiempo deja
+  pasar una única solicitud de prueba y se cierra si tiene éxito. La prueba lleva un
+  número de pase: las respuestas tardías de solicitudes anteriores no cambian el estado.
+- Presupuesto de reintentos: cada solicitud nueva deposita una fracción de ficha y
+  cada copia o reintento gasta una ficha entera, así que la carga extra queda acotada
+  (10% por defecto) en lugar de duplicarse cuando todo va lento.
+
+La cancelación real solo es posible con los servidores locales (corrutinas); con
+servidores TCP la solicitud perdedora termina en su hilo y su respuesta se descarta.
+
+Las tareas de servidor_simulado usan el cliente tras ClusterServidores.activar_cliente_inteligente()
+(opción --cliente-inteligente de ejecutor_lote).
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+
+from metricas import HistogramaLog, percentiles
+from modelo_costos import DescriptorTarea
+from servidor_simulado import CONSULTAS_DB
+
+CERRADO, ABIERTO, SEMIABIERTO = "cerrado", "abierto", "semiabierto"
+TIPOS_SOLICITUD = ("calculo", "consulta_db", "procesamiento_img")
+
+
+class CortocircuitoServidor:
+    """Cortocircuito de un servidor alimentado por su tasa de rechazo reciente"""
+
+    def __init__(self, ventana=20, umbral_rechazo=0.5, minimo_solicitudes=10, tiempo_apertura=2.0,
+                 reloj=time.monotonic):
+        self.resultados = deque(maxlen=ventana)  # True = rechazada / fallida
+        self.umbral_rechazo = umbral_rechazo
+        self.minimo_solicitudes = minimo_solicitudes
+        self.tiempo_apertura = tiempo_apertura
+        self.reloj = reloj
+        self.estado = CERRADO
+        self.abierto_desde = None
+        self.prueba = 0  # Pase de la solicitud de prueba en curso (0: ninguna)
+        self.pases = 0
+        self.aperturas = 0
+        self.lock = threading.Lock()
+
+    def permitir(self):
+        """Pase para enviar una solicitud: None si el circuito no lo permite, 0 para una
+        solicitud normal y el número de la prueba en semiabierto (solo una a la vez)"""
+        with self.lock:
+            if self.estado == ABIERTO:
+                if self.reloj() - self.abierto_desde < self.tiempo_apertura:
+                    return None
+                self.estado = SEMIABIERTO
+            if self.estado == SEMIABIERTO:
+                if self.prueba:
+                    return None
+                self.pases += 1
+                self.prueba = self.pases
+                return self.prueba
+            return 0
+
+    def registrar(self, exito, pase=0):
+        """Resultado de una solicitud enviada con el pase dado; en semiabierto solo cuenta
+        el de la prueba en curso"""
+        with self.lock:
+            if self.estado == SEMIABIERTO:
+                if pase != self.prueba:
+                    return  # Respuesta tardía de una solicitud anterior a la prueba
+                self.prueba = 0
+                if exito:
+                    self.estado = CERRADO
+                    self.resultados.clear()
+                else:
+                    self._abrir()
+                return
+            self.resultados.append(not exito)
+            if (self.estado == CERRADO and len(self.resultados) >= self.minimo_solicitudes
+                    and sum(self.resultados) / len(self.resultados) >= self.umbral_rechazo):
+                self._abrir()
+
+    def cancelar(self, pase=0):
+        """La solicitud se canceló sin respuesta: libera el hueco de prueba si lo ocupaba"""
+        with self.lock:
+            if pase and pase == self.prueba:
+                self.prueba = 0
+
+    def _abrir(self):
+        self.estado = ABIERTO
+        self.abierto_desde = self.reloj()
+        self.aperturas += 1
+
+
+class PresupuestoReintentos:
+    """Cubo de fichas: cada solicitud deposita `proporcion` fichas y cada reintento gasta una"""
+
+    def __init__(self, proporcion=0.1, minimo=5, maximo=50):
+        self.proporcion = proporcion
+        self.maximo = maximo
+        self.fichas = float(minimo)  # Reserva inicial para poder reintentar desde el principio
+        self.lock = threading.Lock()
+
+    def depositar(self):
+        with self.lock:
+            self.fichas = min(self.maximo, self.fichas + self.proporcion)
+
+    def retirar(self):
+        with self.lock:
+            if self.fichas < 1:
+                return False
+            self.fichas -= 1
+            return True
+
+
+class ClienteInteligente:
+    """Envía solicitudes al clúster con cobertura, cortocircuitos y presupuesto de reintentos"""
+
+    def __init__(self, cluster, max_reintentos=2, proporcion_reintentos=0.1, cuantil_cobertura=95,
+                 retardo_cobertura_inicial=1.0, muestras_minimas=20, ventana_latencias=200, **opciones_circuito):
+        self.cluster = cluster
+        self.max_reintentos = max_reintentos
+        self.cuantil_cobertura = cuantil_cobertura
+        self.retardo_cobertura_inicial = retardo_cobertura_inicial
+        self.muestras_minimas = muestras_minimas
+        self.ventana_latencias = ventana_latencias
+        self.circuitos = [CortocircuitoServidor(**opciones_circuito) for _ in range(cluster.num_servidores)]
+        self.presupuesto = PresupuestoReintentos(proporcion_reintentos)
+        # Latencias recientes de las respuestas correctas por tipo, para el retardo de cobertura
+        self.latencias_tipo = {}
+        self.lock = threading.Lock()
+        self.latencias = HistogramaLog()  # Latencia extremo a extremo vista por el cliente
+        self.solicitudes = 0
+        self.fallidas = 0
+        self.envios = 0  # Solicitudes realmente enviadas a servidores (incluye copias y reintentos)
+        self.coberturas = 0
+        self.coberturas_ganadoras = 0
+        self.reintentos = 0
+        self.sin_presupuesto = 0
+        self.bloqueadas_por_circuito = 0
+
+    def retardo_cobertura(self, tipo_solicitud):
+        """p95 (por defecto) de las latencias recientes del tipo, o el retardo inicial"""
+        with self.lock:
+            recientes = self.latencias_tipo.get(tipo_solicitud)
+            if recientes is None or len(recientes) < self.muestras_minimas:
+                return self.retardo_cobertura_inicial
+            ordenadas = sorted(recientes)
+        return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * self.cuantil_cobertura / 100))]
+
+    def elegir_servidor(self, excluidos=(), preferido=None):
+        """(servidor, pase) con el servidor preferido si su circuito lo permite; si no, uno
+        aleatorio disponible. None si ninguno lo permite"""
+        if preferido is not None and preferido not in excluidos:
+            pase = self.circuitos[preferido].permitir()
+            if pase is not None:
+                return preferido, pase
+        candidatos = [s for s in range(len(self.circuitos)) if s not in excluidos and s != preferido]
+        random.shuffle(candidatos)
+        for servidor in candidatos:
+            pase = self.circuitos[servidor].permitir()
+            if pase is not None:
+                return servidor, pase
+        return None
+
+    async def _solicitar(self, servidor_id, pase, tipo_solicitud, datos):
+        circuito = self.circuitos[servidor_id]
+        inicio = time.perf_counter()
+        with self.lock:
+            self.envios += 1
+        try:
+            exito, respuesta = await self.cluster.enviar_solicitud_async(servidor_id, tipo_solicitud, datos)
+        except asyncio.CancelledError:
+            circuito.cancelar(pase)
+            raise
+        except Exception as e:
+            exito, respuesta = False, str(e)
+        circuito.registrar(exito, pase)
+        if exito:
+            with self.lock:
+                recientes = self.latencias_tipo.setdefault(tipo_solicitud, deque(maxlen=self.ventana_latencias))
+                recientes.append(time.perf_counter() - inicio)
+        return exito, respuesta, servidor_id
+
+    async def _con_cobertura(self, servidor_id, pase, tipo_solicitud, datos, excluidos):
+        """Envía a servidor_id y, si tarda más del p95, una copia a otro; gana la primera correcta"""
+        principal = asyncio.ensure_future(self._solicitar(servidor_id, pase, tipo_solicitud, datos))
+        hechas, _ = await asyncio.wait({principal}, timeout=self.retardo_cobertura(tipo_solicitud))
+        if hechas:
+            return principal.result()
+
+        eleccion = self.elegir_servidor(excluidos | {servidor_id})
+        if eleccion is None:
+            return await principal
+        otro, pase_otro = eleccion
+        if not self.presupuesto.retirar():
+            self.circuitos[otro].cancelar(pase_otro)
+            with self.lock:
+                self.sin_presupuesto += 1
+            return await principal
+        cobertura = asyncio.ensure_future(self._solicitar(otro, pase_otro, tipo_solicitud, datos))
+        with self.lock:
+            self.coberturas += 1
+
+        pendientes = {principal, cobertura}
+        ultimo = None
+        try:
+            while pendientes:
+                hechas, pendientes = await asyncio.wait(pendientes, return_when=asyncio.FIRST_COMPLETED)
+                for tarea in hechas:
+                    ultimo = tarea.result()
+                    if ultimo[0]:
+                        if tarea is cobertura:
+                            with self.lock:
+                                self.coberturas_ganadoras += 1
+                        return ultimo
+            return ultimo
+        finally:
+            # La perdedora se cancela: el servidor libera su conexión al instante
+            for tarea in pendientes:
+                tarea.cancel()
+
+    async def enviar_async(self, tipo_solicitud, datos=None, servidor_preferido=None):
+        """Envía una solicitud; devuelve (exito, respuesta) como ClusterServidores.enviar_solicitud"""
+        inicio_ns = time.perf_counter_ns()
+        self.presupuesto.depositar()
+        with self.lock:
+            self.solicitudes += 1
+        excluidos = set()
+        exito, respuesta = False, "Sin servidores disponibles"
+        for intento in range(self.max_reintentos + 1):
+            if intento > 0:
+                if not self.presupuesto.retirar():
+                    with self.lock:
+                        self.sin_presupuesto += 1
+                    break
+                with self.lock:
+                    self.reintentos += 1
+            eleccion = self.elegir_servidor(excluidos, servidor_preferido)
+            if eleccion is None:
+                with self.lock:
+                    self.bloqueadas_por_circuito += 1
+                respuesta = "Todos los circuitos abiertos"
+                break
+            servidor_id, pase = eleccion
+            exito, respuesta, servidor_id = await self._con_cobertura(servidor_id, pase, tipo_solicitud, datos,
+                                                                      excluidos)
+            if exito:
+                break
+            excluidos.add(servidor_id)
+        with self.lock:
+            self.fallidas += not exito
+            self.latencias.registrar(time.perf_counter_ns() - inicio_ns)
+        return exito, respuesta
+
+    def enviar(self, tipo_solicitud, datos=None, servidor_preferido=None):
+        """Versión bloqueante de enviar_async (con un event loop propio del hilo que llama)"""
+        return asyncio.run(self.enviar_async(tipo_solicitud, datos, servidor_preferido))
+
+    def obtener_estadisticas(self):
+        with self.lock:
+            estadisticas = {
+                "solicitudes": self.solicitudes,
+                "fallidas": self.fallidas,
+                "envios": self.envios,
+                "carga_extra": self.envios / max(1, self.solicitudes) - 1,
+                "coberturas": self.coberturas,
+                "coberturas_ganadoras": self.coberturas_ganadoras,
+                "reintentos": self.reintentos,
+                "sin_presupuesto": self.sin_presupuesto,
+                "bloqueadas_por_circuito": self.bloqueadas_por_circuito,
+                "latencia": percentiles(self.latencias.como_array()),
+            }
+        estadisticas["circuitos"] = [{"estado": c.estado, "aperturas": c.aperturas} for c in self.circuitos]
+        return estadisticas
+
+
+DATOS_SOLICITUD = {
+    "calculo": lambda: random.randint(5000, 20000),
+    "consulta_db": lambda: random.choice(CONSULTAS_DB),
+    "procesamiento_img": lambda: None,
+}
+
+
+def generar_tarea_inteligente(cliente, tipo_solicitud=None, servidor_id=None):
+    """Tarea asíncrona que envía su solicitud a través del cliente inteligente.
+
+    servidor_id es solo el preferido: si su circuito está abierto o tarda, se usa otro.
+    """
+    if tipo_solicitud is None:
+        tipo_solicitud = random.choice(TIPOS_SOLICITUD)
+    if servidor_id is None:
+        servidor_id = random.randint(0, cliente.cluster.num_servidores - 1)
+
+    async def tarea():
+        servidor_id = descriptor.servidor
+        exito, respuesta = await cliente.enviar_async(tipo_solicitud, DATOS_SOLICITUD[tipo_solicitud](), servidor_id)
+        if not exito:
+            raise Exception(f"Error en servidor {servidor_id}: {respuesta}")
+        return respuesta["resultado"]
+
+    descriptor = DescriptorTarea(tarea, tipo_solicitud, servidor=servidor_id)
+    return descriptor
+
+
+def generar_conjunto_tareas_inteligentes(cliente, num_tareas=10):
+    """Conjunto mixto de tareas asíncronas que usan el cliente inteligente"""
+    return [generar_tarea_inteligente(cliente) for _ in range(num_tareas)]
@@ -0,0 +1,115 @@
+"""
+Colas de los workers persistentes de BalanceadorBase.
+
+- ColasIndependientes: una cola FIFO acotada por worker; cada worker solo ejecuta lo
+  que el balanceador le asignó (comportamiento por defecto).
+- ColasRobo: robo de trabajo. Cada worker tiene un deque; el dueño toma sus tareas por
+  el final (LIFO) y, cuando se queda sin trabajo, roba por el principio (FIFO) del
+  worker con más tareas pendientes. Así una asignación estática desequilibrada (p. ej.
+  dos multiplicaciones grandes en el mismo worker) no deja a los demás ociosos.
+
+Ambas exponen la misma interfaz: poner(w, elemento), tomar(w), extraer(w), tamano(w),
+cerrar(). tomar() devuelve FIN cuando el worker debe terminar; extraer() saca sin
+bloquear la última tarea encolada (aún no empezada) para migrarla a otro worker.
+"""
+
+import queue
+import threading
+from collections import deque
+
+FIN = object()
+
+
+class ColasIndependientes:
+    """Una cola FIFO acotada por worker"""
+
+    def __init__(self, num_workers, capacidad):
+        self.colas = [queue.Queue(maxsize=capacidad) for _ in range(num_workers)]
+        self.robos = [0] * num_workers
+
+    def poner(self, worker_id, elemento):
+        self.colas[worker_id].put(elemento)
+
+    def tomar(self, worker_id):
+        return self.colas[worker_id].get()
+
+    def extraer(self, worker_id):
+        """Saca la última tarea encolada del worker, o None si no tiene ninguna pendiente"""
+        cola = self.colas[worker_id]
+        with cola.mutex:
+            if not cola.queue or cola.queue[-1] is FIN:
+                return None
+            elemento = cola.queue.pop()
+            cola.unfinished_tasks -= 1
+            cola.not_full.notify()
+            return elemento
+
+    def tamano(self, worker_id):
+        return self.colas[worker_id].qsize()
+
+    def cerrar(self):
+        """Cada worker termina después de vaciar su cola"""
+        for cola in self.colas:
+            cola.put(FIN)
+
+
+class ColasRobo:
+    """Deques por worker con robo de trabajo desde el worker más cargado"""
+
+    def __init__(self, num_workers, capacidad):
+        self.deques = [deque() for _ in range(num_workers)]
+        self.capacidad = capacidad
+        self.robos = [0] * num_workers  # Tareas que cada worker ha robado a otros
+        self._lock = threading.Lock()
+        self._hay_trabajo = threading.Condition(self._lock)
+        self._hay_hueco = threading.Condition(self._lock)
+        self._cerrado = False
+
+    def poner(self, worker_id, elemento):
+        with self._lock:
+            while len(self.deques[worker_id]) >= self.capacidad:
+                self._hay_hueco.wait()
+            self.deques[worker_id].append(elemento)
+            self._hay_trabajo.notify()
+
+    def tomar(self, worker_id):
+        with self._lock:
+            while True:
+                propio = self.deques[worker_id]
+                if propio:
+                    elemento = propio.pop()
+                    break
+                victima = max(self.deques, key=len)
+                if victima:
+                    elemento = victima.popleft()
+                    self.robos[worker_id] += 1
+                    break
+                if self._cerrado:
+                    return FIN
+                self._hay_trabajo.wait()
+            self._hay_hueco.notify_all()
+            return elemento
+
+    def extraer(self, worker_id):
+        """Saca la última tarea encolada del worker, o None si no tiene ninguna pendiente"""
+        with self._lock:
+            if not self.deques[worker_id]:
+                return None
+            elemento = self.deques[worker_id].pop()
+            self._hay_hueco.notify_all()
+            return elemento
+
+    def tamano(self, worker_id):
+        return len(self.deques[worker_id])
+
+    def cerrar(self):
+        """Los workers terminan cuando ya no queda nada que ejecutar ni que robar"""
+        with self._lock:
+            self._cerrado = True
+            self._hay_trabajo.notify_all()
+
+
+MODOS_COLA = {
+    "fifo": ColasIndependientes,
+    "robo": ColasRobo,
+}
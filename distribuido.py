@@ -1,45 +1,116 @@
-from threading import Thread
 from balanceador_base import BalanceadorBase
+import heapq
+import itertools
 import random
-import tkinter as tk
-from tkinter import messagebox
+import time
+from threading import Lock
 
 class BalanceadorDistribuido(BalanceadorBase):
-    def __init__(self, tareas, num_workers=3):
-        super().__init__(tareas, num_workers)
+    def __init__(self, tareas, num_workers=3, d=2, max_reintentos=8, espera_base=0.1, espera_maxima=5.0,
+                 **opciones):
+        super().__init__(tareas, num_workers, **opciones)
         self.capacidad_max = [random.randint(1, 3) for _ in range(num_workers)]
         self.cargas_actuales = [0] * num_workers
         self.tipo_balanceador = "Distribuido"
+        # Potencia de d opciones: se consultan d workers al azar y se elige el menos cargado
+        self.d = min(d, num_workers)
+        # Reintentos con espera exponencial y jitter completo: uniforme en [0, min(máx, base·2^n)]
+        self.max_reintentos = max_reintentos
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.lock = Lock()
+        self.reintentos = []  # Montículo (instante, orden, intento, primer_rechazo, índice, tarea)
+        self._orden = itertools.count()
+        self.rechazos = 0  # Rechazos que fueron a la cola de reintentos
+        self.rechazos_definitivos = 0
+        self.aceptadas_tras_reintento = 0
+        self.suma_latencia_reintento = 0.0
+        self.max_latencia_reintento = 0.0
+
+    def elegir_worker(self):
+        """Menos cargado entre d workers al azar con hueco libre, o None si ninguno lo tiene"""
+        candidatos = random.sample(range(self.num_workers), self.d)
+        with self.lock:
+            libres = [w for w in candidatos if self.cargas_actuales[w] < self.capacidad_max[w]]
+            if not libres:
+                return None
+            w_id = min(libres, key=self.cargas_actuales.__getitem__)
+            self.cargas_actuales[w_id] += 1
+            return w_id
+
+    def liberar(self, worker_id, exito, tiempo, resultado):
+        """Devuelve el hueco del worker al terminar la tarea (también si falló)"""
+        with self.lock:
+            self.cargas_actuales[worker_id] -= 1
+
+    def colocar(self, i, tarea, intento=0, primer_rechazo=None):
+        w_id = self.elegir_worker()
+        if w_id is None:
+            ahora = time.perf_counter()
+            if intento >= self.max_reintentos:
+                self.rechazos_definitivos += 1
+                self.anotar_asignacion(f"Tarea {i+1} rechazada tras {intento} reintentos.")
+                self.registrar_rechazo()
+                return
+            espera = random.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** intento))
+            heapq.heappush(self.reintentos, (ahora + espera, next(self._orden), intento + 1,
+                                             primer_rechazo or ahora, i, tarea))
+            self.rechazos += 1
+            self.anotar_asignacion(f"Tarea {i+1} rechazada: reintento {intento + 1} en {espera:.2f}s")
+            return
+        if primer_rechazo is not None:
+            latencia = time.perf_counter() - primer_rechazo
+            self.aceptadas_tras_reintento += 1
+            self.suma_latencia_reintento += latencia
+            self.max_latencia_reintento = max(self.max_latencia_reintento, latencia)
+        self.anotar_asignacion(f"Tarea {i+1} aceptada por Worker {w_id}")
+        try:
+            self.enviar(w_id, tarea, al_terminar=self.liberar)
+        except Exception as e:
+            self.liberar(w_id, False, 0.0, None)
+            self.anotar_asignacion(f"Error asignando tarea {i+1}: {e}")
+
+    def procesar_reintentos(self, esperar=False):
+        """Recoloca los reintentos vencidos; con esperar=True duerme hasta el próximo"""
+        if esperar and self.reintentos:
+            time.sleep(max(0.0, self.reintentos[0][0] - time.perf_counter()))
+        ahora = time.perf_counter()
+        while self.reintentos and self.reintentos[0][0] <= ahora:
+            _, _, intento, primer_rechazo, i, tarea = heapq.heappop(self.reintentos)
+            self.colocar(i, tarea, intento, primer_rechazo)
+
+    def detalles_resultado(self):
+        return {
+            "rechazos": self.rechazos,
+            "rechazos_definitivos": self.rechazos_definitivos,
+            "tasa_rechazo": self.rechazos_definitivos / max(1, self.tareas_recibidas),
+            "aceptadas_tras_reintento": self.aceptadas_tras_reintento,
+            "latencia_reintento_media": self.suma_latencia_reintento / max(1, self.aceptadas_tras_reintento),
+            "latencia_reintento_maxima": self.max_latencia_reintento,
+        }
 
     def ejecutar(self):
         capacidades = "\n".join([f"Worker {i}: capacidad máxima {cap}" for i, cap in enumerate(self.capacidad_max)])
         self.crear_ventana("Balanceo Distribuido", 
                         f"== BALANCEO DISTRIBUIDO ==\nCapacidades de los workers:\n{capacidades}")
         
-        hilos = []
-        asignaciones = ""
-        
-        for i, tarea in enumerate(self.tareas):
-            asignado = False
-            for intento in range(self.num_workers):
-                w_id = random.randint(0, self.num_workers - 1)
-                if self.cargas_actuales[w_id] < self.capacidad_max[w_id]:
-                    self.cargas_actuales[w_id] += 1
-                    asignaciones += f"Tarea {i+1} aceptada por Worker {w_id}\n"
-                    try:
-                        t = Thread(target=self.worker, args=(w_id, tarea))
-                        hilos.append(t)
-                        t.start()
-                    except Exception as e:
-                        asignaciones += f"Error asignando tarea {i+1}: {e}\n"
-                    asignado = True
-                    break
-            if not asignado:
-                asignaciones += f"Tarea {i+1} rechazada: todos los workers están ocupados.\n"
+        for i, tarea in enumerate(self.iterar_tareas()):
+            # Contrapresión: con demasiados reintentos pendientes no se aceptan tareas nuevas
+            self.procesar_reintentos(esperar=len(self.reintentos) >= self.max_en_vuelo)
+            self.colocar(i, tarea)
+        while self.reintentos:
+            self.procesar_reintentos(esperar=True)
                 
-        self.crear_ventana("Asignaciones Distribuido", f"Asignaciones realizadas:\n\n{asignaciones}")
+        self.crear_ventana("Asignaciones Distribuido", f"Asignaciones realizadas:\n\n{self.texto_asignaciones()}")
+        
+        self.esperar_workers()
         
-        for t in hilos:
-            t.join()
+        detalles = self.detalles_resultado()
+        self.crear_ventana("Reintentos Distribuido",
+                           f"Rechazos enviados a reintento: {detalles['rechazos']}\n"
+                           f"Rechazos definitivos: {detalles['rechazos_definitivos']} "
+                           f"({detalles['tasa_rechazo']:.1%})\n"
+                           f"Latencia media de reintento: {detalles['latencia_reintento_media']:.2f}s "
+                           f"(máx. {detalles['latencia_reintento_maxima']:.2f}s)")
             
         self.mostrar_resultados()
@@ -0,0 +1,270 @@
+"""
+Backends de ejecución para los balanceadores.
+
+Cada backend asocia cada worker lógico (worker_id) a un contexto de ejecución real:
+- "hilos": la tarea se ejecuta en el hilo del propio worker (comportamiento original).
+- "procesos": cada worker tiene su propio proceso del sistema operativo, de modo que las
+  tareas de CPU puro (primos, Monte Carlo) se ejecutan realmente en paralelo sin el GIL.
+- "interpretes" (experimental): cada worker tiene su propio subintérprete (requiere
+  Python 3.14+). No aplica hilos_blas ni la caché del proceso padre, y numpy no
+  admite subintérpretes, así que no sirve para las tareas de tareas.py; por eso no se
+  ofrece en la línea de comandos.
+- "asyncio": todas las tareas se ejecutan como corrutinas en un único event loop, de
+  modo que miles de solicitudes de E/S (servidores simulados) pueden estar en vuelo
+  sin un hilo por solicitud. Las tareas síncronas se delegan en asyncio.to_thread.
+"""
+
+import asyncio
+import inspect
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import NamedTuple, Optional
+
+from cache_resultados import activar_cache, configuracion_cache, sin_cache
+from tareas import limitar_hilos_blas
+
+try:
+    from concurrent.futures import InterpreterPoolExecutor
+except ImportError:  # Python < 3.14
+    InterpreterPoolExecutor = None
+
+BACKENDS = ("hilos", "procesos", "interpretes", "asyncio")
+BACKENDS_EXPERIMENTALES = ("interpretes",)
+# Variables de entorno que leen las distintas implementaciones de BLAS al cargarse
+VARIABLES_HILOS_BLAS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                        "BLIS_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+
+class MarcasEjecucion(NamedTuple):
+    """Instantes (perf_counter_ns) y CPU de una tarea, tomados en el contexto que la ejecuta"""
+    inicio_ns: int
+    fin_ns: int
+    cpu_ns: Optional[int]  # CPU del hilo que ejecutó la tarea (None si compartía hilo con otras)
+    tipo_excepcion: Optional[str]
+
+
+def ejecutar_medido(tarea, usar_cache=True):
+    """Ejecuta una tarea midiendo su duración dentro del contexto que la corre.
+
+    Devuelve (exito, tiempo, resultado, marcas) con marcas de tipo MarcasEjecucion.
+    """
+    with nullcontext() if usar_cache else sin_cache():
+        cpu_inicio = time.thread_time_ns()
+        inicio = time.perf_counter_ns()
+        try:
+            resultado = tarea()
+            if inspect.iscoroutine(resultado):
+                # Tarea asíncrona fuera del backend "asyncio": se completa en un loop propio
+                resultado = asyncio.run(resultado)
+            exito, tipo_excepcion = True, None
+        except Exception as e:
+            resultado, exito, tipo_excepcion = str(e), False, type(e).__name__
+        fin = time.perf_counter_ns()
+        marcas = MarcasEjecucion(inicio, fin, time.thread_time_ns() - cpu_inicio, tipo_excepcion)
+        return exito, (fin - inicio) / 1e9, resultado, marcas
+
+
+async def ejecutar_medido_async(tarea, usar_cache=True):
+    """Como ejecutar_medido, pero esperando las tareas corrutina en el loop actual"""
+    # Un DescriptorTarea envuelve la función real: es esta la que puede ser corrutina
+    if not inspect.iscoroutinefunction(getattr(tarea, "funcion", tarea)):
+        # Una tarea bloqueante pararía el loop entero: se ejecuta en un hilo aparte
+        return await asyncio.to_thread(ejecutar_medido, tarea, usar_cache)
+    inicio = time.perf_counter_ns()
+    try:
+        resultado = await tarea()
+        exito, tipo_excepcion = True, None
+    except Exception as e:
+        resultado, exito, tipo_excepcion = str(e), False, type(e).__name__
+    fin = time.perf_counter_ns()
+    # Las corrutinas comparten el hilo del loop: su CPU no se puede separar
+    return exito, (fin - inicio) / 1e9, resultado, MarcasEjecucion(inicio, fin, None, tipo_excepcion)
+
+
+@contextmanager
+def entorno_hilos_blas(hilos):
+    """Fija los hilos de BLAS en os.environ y restaura los valores anteriores al salir.
+
+    BLAS dimensiona su pool al importar numpy, así que el límite solo tiene efecto en
+    los procesos que se crean dentro del bloque (heredan el entorno antes de importarlo).
+    """
+    anteriores = {variable: os.environ.get(variable) for variable in VARIABLES_HILOS_BLAS}
+    os.environ.update({variable: str(hilos) for variable in VARIABLES_HILOS_BLAS})
+    try:
+        yield
+    finally:
+        for variable, valor in anteriores.items():
+            if valor is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = valor
+
+
+def _inicializar_proceso(config_cache):
+    """Prepara un proceso worker con la misma caché que el proceso padre"""
+    if config_cache is not None:
+        activar_cache(*config_cache)
+
+
+def hilos_blas_por_worker(num_workers, hilos_blas=None):
+    """Hilos de BLAS de cada worker: por defecto se reparten los núcleos entre los workers
+    para que N multiplicaciones simultáneas no sobresuscriban la CPU"""
+    return hilos_blas or max(1, (os.cpu_count() or 1) // num_workers)
+
+
+def es_serializable(tarea):
+    """Indica si una tarea puede enviarse a otro proceso o intérprete"""
+    try:
+        pickle.dumps(tarea)
+        return True
+    except Exception:
+        return False
+
+
+class EjecutorHilos:
+    """Ejecuta cada tarea directamente en el hilo que la solicita"""
+
+    nombre = "hilos"
+
+    def __init__(self, num_workers, hilos_blas=None):
+        self.num_workers = num_workers
+        # Los hilos comparten el pool de BLAS del proceso: se limita el pool entero a la
+        # parte de cada worker mientras viva el ejecutor (requiere threadpoolctl)
+        self.hilos_blas = hilos_blas_por_worker(num_workers, hilos_blas)
+        self._limite_blas = ExitStack()
+        self._limite_blas.enter_context(limitar_hilos_blas(self.hilos_blas))
+
+    def ejecutar(self, worker_id, tarea, usar_cache=True):
+        return ejecutar_medido(tarea, usar_cache)
+
+    def cerrar(self):
+        self._limite_blas.close()
+
+
+class EjecutorAislado:
+    """Asigna a cada worker lógico un ejecutor propio de un único proceso/intérprete"""
+
+    nombre = "aislado"
+
+    def __init__(self, num_workers, hilos_blas=None):
+        self.num_workers = num_workers
+        self.hilos_blas = hilos_blas_por_worker(num_workers, hilos_blas)
+        self.ejecutores = [self._crear_ejecutor() for _ in range(num_workers)]
+
+    def _crear_ejecutor(self):
+        raise NotImplementedError
+
+    def ejecutar(self, worker_id, tarea, usar_cache=True):
+        # Las tareas que dependen de estado local (p. ej. closures sobre el clúster
+        # de servidores) no pueden salir del proceso: se ejecutan en el hilo actual.
+        if not es_serializable(tarea):
+            return ejecutar_medido(tarea, usar_cache)
+        try:
+            return self.ejecutores[worker_id].submit(ejecutar_medido, tarea, usar_cache).result()
+        except Exception as e:
+            # Fallo del propio ejecutor (p. ej. proceso caído), no de la tarea
+            ahora = time.perf_counter_ns()
+            return False, 0.0, str(e), MarcasEjecucion(ahora, ahora, None, type(e).__name__)
+
+    def cerrar(self):
+        for ejecutor in self.ejecutores:
+            ejecutor.shutdown(wait=True)
+
+
+class EjecutorProcesos(EjecutorAislado):
+    """Un proceso del sistema operativo por worker lógico"""
+
+    nombre = "procesos"
+
+    def _crear_ejecutor(self):
+        # "spawn" evita heredar el estado de Tk y de los hilos del proceso padre
+        contexto = multiprocessing.get_context("spawn")
+        ejecutor = ProcessPoolExecutor(max_workers=1, mp_context=contexto, initializer=_inicializar_proceso,
+                                       initargs=(configuracion_cache(),))
+        # El proceso se crea con el primer envío: se fuerza aquí, con el límite de BLAS
+        # en el entorno, porque el hijo importa numpy al deserializar el inicializador
+        with entorno_hilos_blas(self.hilos_blas):
+            ejecutor.submit(os.getpid).result()
+        return ejecutor
+
+
+class EjecutorInterpretes(EjecutorAislado):
+    """Un subintérprete por worker lógico (experimental: solo tareas de Python puro sin numpy)"""
+
+    nombre = "interpretes"
+
+    def __init__(self, num_workers, hilos_blas=None):
+        if InterpreterPoolExecutor is None:
+            raise RuntimeError("El backend 'interpretes' requiere Python 3.14 o superior")
+        super().__init__(num_workers, hilos_blas)
+
+    def _crear_ejecutor(self):
+        return InterpreterPoolExecutor(max_workers=1)
+
+
+class EjecutorAsyncio:
+    """Ejecuta las tareas como corrutinas en un event loop propio que corre en un hilo"""
+
+    nombre = "asyncio"
+
+    def __init__(self, num_workers, hilos_blas=None):
+        self.num_workers = num_workers
+        self.loop = asyncio.new_event_loop()
+        self._pendientes = 0
+        self._condicion = threading.Condition()
+        self._hilo = threading.Thread(target=self.loop.run_forever, name="Loop-asyncio", daemon=True)
+        self._hilo.start()
+
+    def ejecutar(self, worker_id, tarea, usar_cache=True):
+        # Interfaz síncrona común a todos los backends (bloquea al llamante, no al loop)
+        futuro = asyncio.run_coroutine_threadsafe(ejecutar_medido_async(tarea, usar_cache), self.loop)
+        return futuro.result()
+
+    async def ejecutar_async(self, worker_id, tarea, usar_cache=True):
+        return await ejecutar_medido_async(tarea, usar_cache)
+
+    def programar(self, corrutina):
+        """Lanza una corrutina en el loop sin esperar su resultado (seguro desde cualquier hilo)"""
+        with self._condicion:
+            self._pendientes += 1
+        self.loop.call_soon_threadsafe(self._crear_tarea, corrutina)
+
+    def _crear_tarea(self, corrutina):
+        self.loop.create_task(corrutina).add_done_callback(self._tarea_terminada)
+
+    def _tarea_terminada(self, _):
+        with self._condicion:
+            self._pendientes -= 1
+            if self._pendientes == 0:
+                self._condicion.notify_all()
+
+    def esperar(self):
+        """Bloquea hasta que terminan todas las corrutinas programadas"""
+        with self._condicion:
+            self._condicion.wait_for(lambda: self._pendientes == 0)
+
+    def cerrar(self):
+        if self.loop.is_closed():
+            return
+        self.esperar()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._hilo.join()
+        self.loop.close()
+
+
+def crear_ejecutor(backend, num_workers, hilos_blas=None):
+    """Crea el ejecutor correspondiente al backend solicitado"""
+    if backend == "hilos":
+        return EjecutorHilos(num_workers, hilos_blas)
+    elif backend == "procesos":
+        return EjecutorProcesos(num_workers, hilos_blas)
+    elif backend == "interpretes":
+        return EjecutorInterpretes(num_workers, hilos_blas)
+    elif backend == "asyncio":
+        return EjecutorAsyncio(num_workers, hilos_blas)
+    raise ValueError(f"Backend no válido: {backend!r} (opciones: {', '.join(BACKENDS)})")
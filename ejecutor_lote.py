@@ -0,0 +1,154 @@
+"""
+Ejecución por lotes de los balanceadores, sin interfaz gráfica.
+
+Separa la planificación de la ventana de resultados: cada repetición construye el
+balanceador con interactivo=False (no se abre ninguna ventana ni se espera a que
+alguien pulse "Aceptar") y produce un ResultadoBalanceo que se vuelca en JSON o CSV.
+
+Uso:
+    python -m ejecutor_lote --balanceador centralizado --carga matematicas \\
+        --workers 3 --repeticiones 5 --formato json --salida resultados.json
+"""
+
+import argparse
+import csv
+import json
+import sys
+from contextlib import redirect_stdout
+
+from adaptativo import BalanceadorAdaptativo
+from cache_resultados import activar_cache, desactivar_cache
+from cargas_especializadas import TIPOS_TAREAS, obtener_tareas
+from centralizado import BalanceadorCentralizado
+from distribuido import BalanceadorDistribuido
+from lote_lpt import BalanceadorLoteLPT
+from round_robin_ponderado import pesos_por_capacidad
+from ejecucion import BACKENDS, BACKENDS_EXPERIMENTALES
+from predictivo import BalanceadorPredictivo
+from reactivo import BalanceadorReactivo
+from robo_trabajo import BalanceadorRoboTrabajo
+from servidor_simulado import MODOS_ADMISION, ClusterServidores, obtener_cluster
+from colas_workers import MODOS_COLA
+
+BALANCEADORES = {
+    "centralizado": BalanceadorCentralizado,
+    "distribuido": BalanceadorDistribuido,
+    "adaptativo": BalanceadorAdaptativo,
+    "predictivo": BalanceadorPredictivo,
+    "reactivo": BalanceadorReactivo,
+    "robo_trabajo": BalanceadorRoboTrabajo,
+    "lote_lpt": BalanceadorLoteLPT,
+}
+# Balanceadores que aceptan archivo_modelo
+BALANCEADORES_MODELO_COSTOS = ("adaptativo", "lote_lpt", "predictivo")
+FORMATOS = ("json", "csv")
+COLUMNAS_CSV = ("repeticion", "balanceador", "backend", "worker", "completadas", "fallidas",
+                "tiempo_total", "tiempo_promedio", "duracion", "tareas_rechazadas",
+                "latencia_p50", "latencia_p95", "latencia_p99", "latencia_p99.9", "robos")
+
+
+def ejecutar_lote(balanceador, carga="matematicas", num_workers=3, repeticiones=1, cluster=None,
+                  **opciones):
+    """Ejecuta un balanceador varias veces sin interfaz y devuelve la lista de ResultadoBalanceo.
+
+    Las tareas se regeneran en cada repetición; sin cluster, las cargas de servidores
+    usan el clúster compartido. opciones se pasa al constructor del balanceador
+    (backend, capacidad_cola, usar_cache...).
+    """
+    if balanceador not in BALANCEADORES:
+        raise ValueError(f"Balanceador no válido: {balanceador!r} (opciones: {', '.join(BALANCEADORES)})")
+    resultados = []
+    for _ in range(repeticiones):
+        tareas = obtener_tareas(carga, balanceador, cluster)
+        instancia = BALANCEADORES[balanceador](tareas, num_workers=num_workers, interactivo=False, **opciones)
+        instancia.ejecutar()
+        resultados.append(instancia.obtener_resultado())
+    return resultados
+
+
+def escribir_json(resultados, salida):
+    json.dump([r._asdict() for r in resultados], salida, indent=2)
+    salida.write("\n")
+
+
+def escribir_csv(resultados, salida):
+    """Una fila por repetición y worker"""
+    escritor = csv.writer(salida)
+    escritor.writerow(COLUMNAS_CSV)
+    for repeticion, r in enumerate(resultados):
+        for w in range(r.num_workers):
+            escritor.writerow([repeticion, r.balanceador, r.backend, w, r.completadas[w], r.fallidas[w],
+                               f"{r.tiempos_totales[w]:.6f}", f"{r.tiempos_promedio[w]:.6f}",
+                               f"{r.duracion:.6f}", r.tareas_rechazadas,
+                               *(f"{r.percentiles_latencia[p]:.6f}" for p in ("p50", "p95", "p99", "p99.9")),
+                               r.robos[w]])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta balanceadores sin interfaz gráfica")
+    parser.add_argument("--balanceador", choices=BALANCEADORES, required=True)
+    parser.add_argument("--carga", choices=TIPOS_TAREAS, default="matematicas")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--repeticiones", type=int, default=1)
+    parser.add_argument("--backend", choices=[b for b in BACKENDS if b not in BACKENDS_EXPERIMENTALES],
+                        default="hilos")
+    parser.add_argument("--modo-cola", choices=MODOS_COLA, default=None,
+                        help="\"robo\" activa el robo de trabajo entre workers en cualquier balanceador")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reutiliza resultados ya calculados (los tiempos medidos dejan de ser de cómputo real)")
+    parser.add_argument("--formato", choices=FORMATOS, default="json")
+    parser.add_argument("--salida", help="Fichero de salida (por defecto, la salida estándar)")
+    parser.add_argument("--eventos", help="Fichero JSONL donde añadir un evento por tarea")
+    parser.add_argument("--modelo-costos",
+                        help="Fichero JSON del modelo de costes de los balanceadores adaptativo, lote_lpt y predictivo (se carga y se actualiza)")
+    parser.add_argument("--admision", choices=MODOS_ADMISION, default=None,
+                        help="Usa un clúster propio cuyos servidores encolan las solicitudes que llegan llenos")
+    parser.add_argument("--ponderar-servidores", action="store_true",
+                        help="Centralizado: envía las solicitudes a los servidores por round-robin ponderado por su capacidad libre")
+    parser.add_argument("--cliente-inteligente", action="store_true",
+                        help="Usa un clúster propio cuyas tareas envían con cobertura, cortocircuitos y reintentos")
+    parser.add_argument("--historial",
+                        help="Fichero del historial de tiempos del balanceador predictivo (se carga y se actualiza)")
+    args = parser.parse_args(argv)
+
+    # Los mensajes informativos del clúster y de los workers van a stderr para no
+    # mezclarse con los resultados cuando se escriben en la salida estándar
+    opciones = {"modo_cola": args.modo_cola} if args.modo_cola else {}
+    if args.modelo_costos:
+        if args.balanceador not in BALANCEADORES_MODELO_COSTOS:
+            parser.error(f"--modelo-costos solo se aplica a los balanceadores {', '.join(BALANCEADORES_MODELO_COSTOS)}")
+        opciones["archivo_modelo"] = args.modelo_costos
+    if args.historial:
+        if args.balanceador != "predictivo":
+            parser.error("--historial solo se aplica al balanceador predictivo")
+        opciones["archivo_historial"] = args.historial
+    if args.cache:
+        activar_cache()
+    else:
+        desactivar_cache()
+    if args.ponderar_servidores and (args.balanceador != "centralizado" or args.carga == "matematicas"):
+        parser.error("--ponderar-servidores solo se aplica al balanceador centralizado con cargas de servidores")
+    if args.cliente_inteligente and args.carga == "matematicas":
+        parser.error("--cliente-inteligente solo se aplica a las cargas de servidores")
+    with redirect_stdout(sys.stderr):
+        cluster = None
+        if args.admision or args.cliente_inteligente:
+            cluster = ClusterServidores(5, modo_admision=args.admision or "inmediato")
+        if args.cliente_inteligente:
+            cluster.activar_cliente_inteligente()
+        if args.ponderar_servidores:
+            cluster = cluster or obtener_cluster()
+            opciones["pesos_servidores"] = pesos_por_capacidad(cluster)
+        resultados = ejecutar_lote(args.balanceador, args.carga, args.workers, args.repeticiones, cluster,
+                                   backend=args.backend, usar_cache=args.cache,
+                                   archivo_eventos=args.eventos, **opciones)
+    escribir = escribir_json if args.formato == "json" else escribir_csv
+    if args.salida:
+        with open(args.salida, "w", newline="", encoding="utf-8") as salida:
+            escribir(resultados, salida)
+    else:
+        escribir(resultados, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Índice de carga de los workers para elegir el menos cargado en O(log W).
+
+Los balanceadores sensibles a la carga elegían destino con cargas.index(min(cargas)) o
+recorriendo todos los workers: O(W) por decisión, que con miles de workers y millones
+de tareas convierte al propio bucle de reparto en el cuello de botella.
+
+IndiceCarga es un montículo binario de mínimos indexado: además del montículo guarda la
+posición de cada worker en él, de modo que sumar o restar carga a un worker concreto
+(al asignarle una tarea o al terminarla) recoloca solo ese worker en O(log W), y el
+menos cargado se consulta en O(1). Los empates se deshacen por identificador de worker
+para que el reparto sea determinista.
+
+Opcionalmente cuenta cuántos workers están en o por encima de un umbral, para saber
+en O(1) si hay alguno saturado sin buscar el máximo.
+"""
+
+import threading
+
+
+class IndiceCarga:
+    """Montículo de mínimos indexado por worker con aumento y disminución de clave"""
+
+    def __init__(self, num_workers, cargas_iniciales=None, umbral=None):
+        self.cargas = list(cargas_iniciales) if cargas_iniciales is not None else [0] * num_workers
+        self.umbral = umbral
+        self.saturados = 0 if umbral is None else sum(c >= umbral for c in self.cargas)
+        # Las completaciones llegan desde los hilos de los workers
+        self.lock = threading.Lock()
+        self._monticulo = sorted(range(num_workers), key=lambda w: (self.cargas[w], w))
+        self._posicion = [0] * num_workers
+        for i, w in enumerate(self._monticulo):
+            self._posicion[w] = i
+
+    def __len__(self):
+        return len(self.cargas)
+
+    def minimo(self):
+        """Devuelve (worker, carga) del worker menos cargado"""
+        with self.lock:
+            w = self._monticulo[0]
+            return w, self.cargas[w]
+
+    def carga(self, worker_id):
+        return self.cargas[worker_id]
+
+    def sumar(self, worker_id, delta):
+        """Suma delta (positivo o negativo) a la carga del worker y lo recoloca"""
+        with self.lock:
+            self._fijar(worker_id, self.cargas[worker_id] + delta)
+
+    def fijar(self, worker_id, carga):
+        with self.lock:
+            self._fijar(worker_id, carga)
+
+    def asignar_minimo(self, delta):
+        """Elige el worker menos cargado y le suma delta en una sola operación atómica"""
+        with self.lock:
+            w = self._monticulo[0]
+            self._fijar(w, self.cargas[w] + delta)
+            return w
+
+    def _fijar(self, worker_id, carga):
+        anterior = self.cargas[worker_id]
+        self.cargas[worker_id] = carga
+        if self.umbral is not None:
+            self.saturados += (carga >= self.umbral) - (anterior >= self.umbral)
+        if carga < anterior:
+            self._subir(self._posicion[worker_id])
+        elif carga > anterior:
+            self._bajar(self._posicion[worker_id])
+
+    def _menor(self, a, b):
+        ca, cb = self.cargas[a], self.cargas[b]
+        return ca < cb or (ca == cb and a < b)
+
+    def _colocar(self, i, w):
+        self._monticulo[i] = w
+        self._posicion[w] = i
+
+    def _subir(self, i):
+        monticulo = self._monticulo
+        w = monticulo[i]
+        while i > 0:
+            padre = (i - 1) >> 1
+            if not self._menor(w, monticulo[padre]):
+                break
+            self._colocar(i, monticulo[padre])
+            i = padre
+        self._colocar(i, w)
+
+    def _bajar(self, i):
+        monticulo = self._monticulo
+        n = len(monticulo)
+        w = monticulo[i]
+        while True:
+            hijo = 2 * i + 1
+            if hijo >= n:
+                break
+            if hijo + 1 < n and self._menor(monticulo[hijo + 1], monticulo[hijo]):
+                hijo += 1
+            if not self._menor(monticulo[hijo], w):
+                break
+            self._colocar(i, monticulo[hijo])
+            i = hijo
+        self._colocar(i, w)
@@ -0,0 +1,105 @@
+"""
+Registro de eventos por tarea para los balanceadores.
+
+Cada tarea deja un EventoTarea con cuatro instantes de time.perf_counter_ns():
+- envio: el balanceador la entrega a un worker (enviar);
+- despacho: el worker la saca de su cola;
+- inicio / fin: ejecución real, medida en el hilo, proceso o intérprete que la corre
+  (perf_counter usa un reloj monótono del sistema, comparable entre procesos).
+Además guarda la CPU consumida por el hilo que la ejecutó, el worker, el éxito y el
+tipo de excepción. Con ellos se calculan la espera en cola, el tiempo de servicio,
+el makespan y la utilización de cada worker.
+
+Los eventos se guardan en un buffer circular en memoria (deque con maxlen, cuyo
+append es atómico) y, opcionalmente, se añaden a un fichero JSONL.
+"""
+
+import itertools
+import json
+import threading
+from collections import deque
+from typing import NamedTuple, Optional
+
+CAPACIDAD_EVENTOS = 65536
+
+
+class EventoTarea(NamedTuple):
+    id_tarea: int
+    worker: int  # -1 si la tarea fue rechazada sin llegar a ningún worker
+    envio_ns: int
+    despacho_ns: Optional[int]
+    inicio_ns: Optional[int]
+    fin_ns: Optional[int]
+    cpu_ns: Optional[int]
+    exito: bool
+    tipo_excepcion: Optional[str]
+
+    @property
+    def espera_ns(self):
+        """Tiempo desde el envío hasta que empezó a ejecutarse"""
+        return None if self.inicio_ns is None else self.inicio_ns - self.envio_ns
+
+    @property
+    def servicio_ns(self):
+        """Tiempo de ejecución de la tarea"""
+        return None if self.fin_ns is None else self.fin_ns - self.inicio_ns
+
+
+class RegistroEventos:
+    """Buffer circular de EventoTarea con volcado opcional a un fichero JSONL"""
+
+    def __init__(self, capacidad=CAPACIDAD_EVENTOS, archivo=None):
+        self.capacidad = capacidad
+        self.archivo = archivo
+        self._eventos = deque(maxlen=capacidad)
+        self._lock_archivo = threading.Lock()
+        self._salida = None
+        self._contador = itertools.count(1)
+        self.registrados = 0  # Total registrado (los más antiguos se descartan al superar la capacidad)
+
+    def registrar(self, evento):
+        self._eventos.append(evento)
+        self.registrados = next(self._contador)
+        if self.archivo is not None:
+            linea = json.dumps(evento._asdict(), separators=(",", ":")) + "\n"
+            with self._lock_archivo:
+                if self._salida is None:
+                    self._salida = open(self.archivo, "a", encoding="utf-8")
+                self._salida.write(linea)
+
+    def eventos(self):
+        """Copia de los eventos retenidos, del más antiguo al más reciente"""
+        return list(self._eventos)
+
+    def __len__(self):
+        return len(self._eventos)
+
+    def cerrar(self):
+        """Vuelca y cierra el fichero JSONL (se reabre si llegan más eventos)"""
+        with self._lock_archivo:
+            if self._salida is not None:
+                self._salida.close()
+                self._salida = None
+
+    def resumen(self):
+        """Makespan, esperas, latencias y utilización por worker de los eventos retenidos"""
+        ejecutados = [e for e in self._eventos if e.fin_ns is not None]
+        if not ejecutados:
+            return {"tareas": 0, "rechazadas": len(self._eventos)}
+        primero = min(e.envio_ns for e in ejecutados)
+        makespan_ns = max(e.fin_ns for e in ejecutados) - primero
+        latencias = sorted(e.fin_ns - e.envio_ns for e in ejecutados)
+        servicio_por_worker = {}
+        for e in ejecutados:
+            servicio_por_worker[e.worker] = servicio_por_worker.get(e.worker, 0) + e.servicio_ns
+        return {
+            "tareas": len(ejecutados),
+            "rechazadas": len(self._eventos) - len(ejecutados),
+            "fallidas": sum(not e.exito for e in ejecutados),
+            "makespan": makespan_ns / 1e9,
+            "espera_media": sum(e.espera_ns for e in ejecutados) / len(ejecutados) / 1e9,
+            "latencia_p50": latencias[len(latencias) // 2] / 1e9,
+            "latencia_p99": latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))] / 1e9,
+            "cpu_total": sum(e.cpu_ns or 0 for e in ejecutados) / 1e9,
+            "utilizacion": {w: s / max(1, makespan_ns) for w, s in sorted(servicio_por_worker.items())},
+        }
@@ -0,0 +1,173 @@
+"""
+Planificación por lotes que minimiza el makespan (Longest Processing Time first).
+
+Cuando todo el lote de tareas se conoce de antemano, decidir tarea a tarea deja mucho
+makespan por el camino. BalanceadorLoteLPT recibe el lote completo, estima el coste
+de cada tarea con el modelo de costes, las ordena de mayor a menor y asigna cada una
+al worker menos cargado (LPT, a lo sumo 4/3 del óptimo). Después refina el reparto
+con una búsqueda local (mover o intercambiar tareas del worker más cargado) mientras
+quede presupuesto de tiempo.
+
+Como referencia de "lo mejor posible" informa de la brecha con la cota inferior
+trivial max(total / W, tarea más larga), tanto con los costes estimados como con los
+tiempos medidos al terminar.
+"""
+
+import time
+from functools import partial
+from balanceador_base import BalanceadorBase
+from indice_carga import IndiceCarga
+from modelo_costos import DescriptorTarea, ModeloCostos
+
+PRESUPUESTO_REFINADO = 0.05  # Segundos de búsqueda local por lote
+
+
+def cota_inferior(costes, num_workers):
+    """Ningún reparto termina antes que el reparto perfecto ni que la tarea más larga"""
+    if not costes:
+        return 0.0
+    return max(sum(costes) / num_workers, max(costes))
+
+
+def planificar_lpt(costes, num_workers):
+    """Devuelve (worker de cada tarea, carga de cada worker) con LPT"""
+    indice = IndiceCarga(num_workers)
+    asignacion = [0] * len(costes)
+    for i in sorted(range(len(costes)), key=lambda i: -costes[i]):
+        asignacion[i] = indice.asignar_minimo(costes[i])
+    return asignacion, list(indice.cargas)
+
+
+def refinar_busqueda_local(costes, asignacion, cargas, presupuesto):
+    """Mejora el reparto in situ moviendo o intercambiando tareas del worker más cargado.
+
+    En cada paso aplica el movimiento que deja más baja la carga del par de workers
+    implicados; termina sin movimientos que mejoren o al agotar el presupuesto (s).
+    Devuelve el número de movimientos aplicados.
+    """
+    limite = time.perf_counter() + presupuesto
+    num_workers = len(cargas)
+    tareas_worker = [[] for _ in range(num_workers)]
+    for i, w in enumerate(asignacion):
+        tareas_worker[w].append(i)
+
+    movimientos = 0
+    while time.perf_counter() < limite:
+        origen = max(range(num_workers), key=cargas.__getitem__)
+        maximo = cargas[origen]
+        mejor = None  # (carga máxima del par tras el cambio, tarea, destino, tarea intercambiada)
+        for a in tareas_worker[origen]:
+            for destino in range(num_workers):
+                if destino == origen:
+                    continue
+                par = max(maximo - costes[a], cargas[destino] + costes[a])
+                if par < maximo and (mejor is None or par < mejor[0]):
+                    mejor = (par, a, destino, None)
+                for b in tareas_worker[destino]:
+                    diferencia = costes[a] - costes[b]
+                    if diferencia <= 0:
+                        continue
+                    par = max(maximo - diferencia, cargas[destino] + diferencia)
+                    if par < maximo and (mejor is None or par < mejor[0]):
+                        mejor = (par, a, destino, b)
+        if mejor is None:
+            break
+        _, a, destino, b = mejor
+        tareas_worker[origen].remove(a)
+        tareas_worker[destino].append(a)
+        asignacion[a] = destino
+        cargas[origen] -= costes[a]
+        cargas[destino] += costes[a]
+        if b is not None:
+            tareas_worker[destino].remove(b)
+            tareas_worker[origen].append(b)
+            asignacion[b] = origen
+            cargas[destino] -= costes[b]
+            cargas[origen] += costes[b]
+        movimientos += 1
+    return movimientos
+
+
+class BalanceadorLoteLPT(BalanceadorBase):
+    """Reparto offline de un lote completo con LPT y búsqueda local"""
+
+    def __init__(self, tareas, num_workers=3, presupuesto_refinado=PRESUPUESTO_REFINADO, costes=None,
+                 modelo_costos=None, archivo_modelo=None, **opciones):
+        super().__init__(tareas, num_workers, **opciones)
+        self.tipo_balanceador = "Lote LPT"
+        self.presupuesto_refinado = presupuesto_refinado
+        # costes: None (modelo de costes), una función tarea -> segundos o una lista por tarea
+        self.costes = costes
+        self.modelo = modelo_costos if modelo_costos is not None else ModeloCostos(archivo_modelo)
+        self.plan = {}
+
+    def estimar_costes(self, tareas):
+        if self.costes is None:
+            return [self.modelo.estimar(t) for t in tareas]
+        if callable(self.costes):
+            return [self.costes(t) for t in tareas]
+        if len(self.costes) != len(tareas):
+            raise ValueError(f"Se esperaban {len(tareas)} costes y se recibieron {len(self.costes)}")
+        return list(self.costes)
+
+    def tarea_terminada(self, worker_id, exito, tiempo, resultado, tarea):
+        if exito and isinstance(tarea, DescriptorTarea):
+            self.modelo.observar(tarea.tipo, tarea.tamano, tiempo)
+
+    def detalles_resultado(self):
+        if not self.plan:
+            return {}
+        # Cota con los tiempos de servicio medidos: la referencia para la duración real
+        resumen = self.metricas.resumen()
+        cota_real = max(sum(self.metricas.tiempos_totales()) / self.num_workers, resumen["tiempo_maximo"])
+        duracion = 0.0
+        if self.instante_inicio is not None and self.instante_fin is not None:
+            duracion = self.instante_fin - self.instante_inicio
+        return {
+            **self.plan,
+            "cota_inferior_real": cota_real,
+            "brecha_real": duracion / cota_real - 1 if cota_real > 0 else 0.0,
+        }
+
+    def ejecutar(self):
+        self.crear_ventana("Planificación por Lotes (LPT)",
+                        "== PLANIFICACIÓN POR LOTES (LPT) ==\nSe reparte el lote completo: las tareas más largas "
+                        "primero, cada una al worker menos cargado, y se refina con búsqueda local.")
+
+        # El lote se necesita completo: un flujo infinito no se puede planificar así
+        tareas = list(self.iterar_tareas())
+        costes = self.estimar_costes(tareas)
+        asignacion, cargas = planificar_lpt(costes, self.num_workers)
+        makespan_lpt = max(cargas, default=0.0)
+        movimientos = refinar_busqueda_local(costes, asignacion, cargas, self.presupuesto_refinado)
+        makespan = max(cargas, default=0.0)
+        cota = cota_inferior(costes, self.num_workers)
+        self.plan = {
+            "makespan_lpt": makespan_lpt,
+            "makespan_estimado": makespan,
+            "cota_inferior": cota,
+            "brecha": makespan / cota - 1 if cota > 0 else 0.0,
+            "movimientos_busqueda_local": movimientos,
+        }
+
+        # Se envían de mayor a menor coste: cada worker empieza por sus tareas más largas
+        for i in sorted(range(len(tareas)), key=lambda i: -costes[i]):
+            worker_id = asignacion[i]
+            self.anotar_asignacion(f"Tarea {i+1} (≈{costes[i]:.2f} s) → Worker {worker_id}")
+            try:
+                self.enviar(worker_id, tareas[i], al_terminar=partial(self.tarea_terminada, tarea=tareas[i]))
+            except Exception as e:
+                self.anotar_asignacion(f"Error asignando tarea {i+1}: {e}")
+
+        resumen_plan = (f"Makespan estimado: {makespan:.2f}s (LPT: {makespan_lpt:.2f}s, "
+                        f"{movimientos} mejoras por búsqueda local)\n"
+                        f"Cota inferior: {cota:.2f}s (brecha {self.plan['brecha']:.1%})")
+        self.crear_ventana("Asignaciones Lote LPT",
+                           f"{resumen_plan}\n\nAsignaciones realizadas:\n\n{self.texto_asignaciones()}")
+
+        self.esperar_workers()
+        if self.modelo.archivo:
+            self.modelo.guardar()
+
+        self.mostrar_resultados()
+
@@ -1,75 +1,16 @@
-from centralizado import BalanceadorCentralizado
-from distribuido import BalanceadorDistribuido
-from adaptativo import BalanceadorAdaptativo
-from predictivo import BalanceadorPredictivo
-from reactivo import BalanceadorReactivo
-from tareas import calcular_primos_pesado, simulacion_montecarlo, multiplicar_matrices_gigantes
-from servidor_simulado import ClusterServidores, generar_conjunto_tareas
-from cargas_especializadas import (
-    obtener_carga_centralizada, obtener_carga_distribuida, 
-    obtener_carga_adaptativa, obtener_carga_predictiva, 
-    obtener_carga_reactiva, obtener_carga_servidores_especializada,
-    obtener_descripcion_carga
-)
+from ejecutor_lote import BALANCEADORES
+from servidor_simulado import obtener_cluster
+import cargas_especializadas
+from cargas_especializadas import obtener_descripcion_carga
 import tkinter as tk
 from tkinter import messagebox, ttk
 import threading
 
-# Crear un cluster global de servidores para reutilizarlo
-cluster_global = ClusterServidores(num_servidores=5)
+# El clúster global de servidores se crea la primera vez que se usa (obtener_cluster)
 
 def obtener_tareas(tipo="matematicas", balanceador=None):
     """Obtiene tareas según el tipo solicitado y el balanceador"""
-    if tipo == "matematicas":
-        # Usar cargas especializadas para cada balanceador si se especifica
-        if balanceador == "centralizado":
-            return obtener_carga_centralizada(cluster_global)
-        elif balanceador == "distribuido":
-            return obtener_carga_distribuida(cluster_global)
-        elif balanceador == "adaptativo":
-            return obtener_carga_adaptativa(cluster_global)
-        elif balanceador == "predictivo":
-            return obtener_carga_predictiva(cluster_global)
-        elif balanceador == "reactivo":
-            return obtener_carga_reactiva(cluster_global)
-        # Si no se especifica balanceador, usar carga estándar
-        return [
-            lambda: calcular_primos_pesado(300_000),
-            lambda: simulacion_montecarlo(10_000_000),
-            lambda: multiplicar_matrices_gigantes(1000),
-            lambda: calcular_primos_pesado(400_000),
-            lambda: simulacion_montecarlo(15_000_000),
-            lambda: multiplicar_matrices_gigantes(1200),
-        ]
-    elif tipo == "servidores":
-        if balanceador:
-            return obtener_carga_servidores_especializada(cluster_global, balanceador)
-        return generar_conjunto_tareas(cluster_global, num_tareas=12)
-    else:  # Mixtas
-        # Combinación de tareas matemáticas y servidor, adaptadas por balanceador
-        if balanceador == "centralizado":
-            mat = obtener_carga_centralizada(cluster_global)[:3]
-            srv = obtener_carga_servidores_especializada(cluster_global, balanceador)[:3]
-        elif balanceador == "distribuido":
-            mat = obtener_carga_distribuida(cluster_global)[:3]
-            srv = obtener_carga_servidores_especializada(cluster_global, balanceador)[:3]
-        elif balanceador == "adaptativo":
-            mat = obtener_carga_adaptativa(cluster_global)[:3]
-            srv = obtener_carga_servidores_especializada(cluster_global, balanceador)[:3]
-        elif balanceador == "predictivo":
-            mat = obtener_carga_predictiva(cluster_global)[:4]
-            srv = obtener_carga_servidores_especializada(cluster_global, balanceador)[:4]
-        elif balanceador == "reactivo":
-            mat = obtener_carga_reactiva(cluster_global)[:3]
-            srv = obtener_carga_servidores_especializada(cluster_global, balanceador)[:3]
-        else:
-            mat = [
-                lambda: calcular_primos_pesado(200_000),
-                lambda: simulacion_montecarlo(8_000_000),
-                lambda: multiplicar_matrices_gigantes(800),
-            ]
-            srv = generar_conjunto_tareas(cluster_global, num_tareas=3)
-        return mat + srv
+    return cargas_especializadas.obtener_tareas(tipo, balanceador)
 
 def ejecutar_balanceador(tipo, root, tipo_tareas="matematicas"):
     """Ejecuta un tipo específico de balanceador en un hilo separado"""
@@ -77,24 +18,10 @@ def ejecutar_balanceador(tipo, root, tipo_tareas="matematicas"):
         # Obtener tareas especializadas para el tipo de balanceador
         tareas = obtener_tareas(tipo_tareas, tipo)
         try:
-            if tipo == "centralizado":
-                balanceador = BalanceadorCentralizado(tareas, num_workers=3)
-                balanceador.tipo_balanceador = "Centralizado"
-            elif tipo == "distribuido":
-                balanceador = BalanceadorDistribuido(tareas, num_workers=3)
-                balanceador.tipo_balanceador = "Distribuido"
-            elif tipo == "adaptativo":
-                balanceador = BalanceadorAdaptativo(tareas, num_workers=3)
-                balanceador.tipo_balanceador = "Adaptativo"
-            elif tipo == "predictivo":
-                balanceador = BalanceadorPredictivo(tareas, num_workers=3)
-                balanceador.tipo_balanceador = "Predictivo"
-            elif tipo == "reactivo":
-                balanceador = BalanceadorReactivo(tareas, num_workers=3)
-                balanceador.tipo_balanceador = "Reactivo"
-            else:
+            if tipo not in BALANCEADORES:
                 messagebox.showerror("Error", "Tipo de balanceador no válido.")
                 return
+            balanceador = BALANCEADORES[tipo](tareas, num_workers=3)
                 
             # Mostrar información sobre la carga especializada
             mostrar_info_carga_especializada(tipo)
@@ -204,19 +131,51 @@ def mostrar_info_balanceador(tipo):
         BALANCEADOR REACTIVO
         
         Monitorea constantemente la carga de cada worker y reacciona cuando detecta
-        que alguno está por encima del límite establecido, reasignando tareas.
+        que alguno está por encima del límite establecido, migrando sus tareas
+        pendientes a los workers ociosos.
         
         Características:
         - Prioriza workers con menor carga
         - Establece límites de saturación
-        - Puede rechazar tareas si todos los workers están saturados
+        - Guarda en una cola de desborde las tareas que llegan con todos saturados
+        - Informa de las migraciones y de la latencia de reacción
         
         Eficaz para prevenir la sobrecarga de workers individuales.
+        """,
+        
+        "robo_trabajo": """
+        BALANCEADOR CON ROBO DE TRABAJO
+        
+        Reparte las tareas en round-robin, pero cada worker guarda las suyas en una
+        cola doble: ejecuta primero la última recibida y, cuando se queda sin trabajo,
+        roba la más antigua del worker con más tareas pendientes.
+        
+        Características:
+        - Corrige en ejecución los repartos estáticos desequilibrados
+        - Ningún worker queda ocioso mientras otro tenga tareas en cola
+        - Informa de cuántas tareas ha robado cada worker
+        
+        Ideal para cargas con tareas de duración muy desigual.
+        """,
+        
+        "lote_lpt": """
+        PLANIFICACIÓN POR LOTES (LPT)
+        
+        Recibe el lote completo antes de ejecutar nada: estima la duración de cada
+        tarea, las ordena de más larga a más corta y asigna cada una al worker menos
+        cargado. Después refina el reparto con una búsqueda local.
+        
+        Características:
+        - Minimiza el makespan estimado (LPT está a menos de 4/3 del óptimo)
+        - Informa de la brecha con la cota inferior max(total / workers, tarea más larga)
+        - Solo sirve cuando el lote es finito y se conoce de antemano
+        
+        Referencia para comparar los balanceadores en línea.
         """
     }
     
     top = tk.Toplevel()
-    top.title(f"Información - Balanceador {tipo.capitalize()}")
+    top.title(f"Información - Balanceador {tipo.replace('_', ' ').capitalize()}")
     top.geometry("500x400")
     top.configure(bg="#f5f5f5")
     
@@ -247,7 +206,7 @@ def mostrar_info_balanceador(tipo):
 
 def mostrar_info_cluster():
     """Muestra información sobre el estado del cluster de servidores"""
-    stats = cluster_global.obtener_estadisticas_cluster()
+    stats = obtener_cluster().obtener_estadisticas_cluster()
     
     top = tk.Toplevel()
     top.title("Estado del Clúster de Servidores")
@@ -302,7 +261,7 @@ def mostrar_info_cluster():
 def main_gui():
     root = tk.Tk()
     root.title("Simulador de Balanceo de Carga")
-    root.geometry("650x700")  # Un poco más alto para acomodar el nuevo texto
+    root.geometry("650x800")  # Un poco más alto para acomodar el nuevo texto
     root.eval('tk::PlaceWindow . center')
     
     # Mejora visual con estilo ttk
@@ -354,7 +313,9 @@ def main_gui():
         ("distribuido", "Balanceo Distribuido", "#e74c3c"),
         ("adaptativo", "Balanceo Adaptativo", "#f39c12"),
         ("predictivo", "Balanceo Predictivo", "#9b59b6"),
-        ("reactivo", "Balanceo Reactivo", "#1abc9c")
+        ("reactivo", "Balanceo Reactivo", "#1abc9c"),
+        ("robo_trabajo", "Robo de Trabajo", "#34495e"),
+        ("lote_lpt", "Lote LPT", "#16a085")
     ]
     
     for i, (tipo, nombre, color) in enumerate(balanceadores):
@@ -0,0 +1,164 @@
+"""
+Almacén compacto de métricas por balanceador.
+
+En lugar de guardar cada tiempo en listas de Python (que crecen sin límite y se
+recorren enteras para cada suma), cada worker mantiene:
+- agregados acumulados en O(1): tareas, éxitos, suma, suma de cuadrados, mínimo y máximo;
+- histogramas logarítmicos estilo HDR del tiempo de servicio y de la latencia
+  (envío → fin) sobre columnas array('q') preasignadas.
+
+Cada worker escribe solo en su propio bloque (con un lock propio, sin contención) y
+los bloques se combinan al leer. La memoria es constante: no depende del número de
+tareas, solo del rango y la precisión de los histogramas.
+"""
+
+import math
+import threading
+from array import array
+
+import numpy as np
+
+# 2**(BITS_SUBCUBETA - 1) subcubetas por potencia de dos: error relativo < 1/64 (~1.6%)
+BITS_SUBCUBETA = 7
+MAX_VALOR_NS = 1 << 44  # ~4.9 horas; los valores mayores se acumulan en la última cubeta
+CUANTILES = (50, 95, 99, 99.9)
+
+
+def _indice_cubeta(valor):
+    """Índice de la cubeta log-lineal para un valor entero no negativo"""
+    if valor < (1 << BITS_SUBCUBETA):
+        return valor
+    exponente = valor.bit_length() - BITS_SUBCUBETA
+    return (exponente << (BITS_SUBCUBETA - 1)) + (valor >> exponente)
+
+
+NUM_CUBETAS = _indice_cubeta(MAX_VALOR_NS) + 1
+
+
+def _valor_cubeta(indice):
+    """Punto medio del rango de valores de una cubeta"""
+    mitad = 1 << (BITS_SUBCUBETA - 1)
+    if indice < (1 << BITS_SUBCUBETA):
+        return float(indice)
+    exponente = indice // mitad - 1
+    mantisa = indice - exponente * mitad
+    return float((mantisa << exponente) + ((1 << exponente) >> 1))
+
+
+class HistogramaLog:
+    """Histograma log-lineal (estilo HDR) de valores enteros en nanosegundos"""
+
+    def __init__(self):
+        self.cuentas = array("q", bytes(8 * NUM_CUBETAS))
+
+    def registrar(self, valor_ns):
+        self.cuentas[_indice_cubeta(min(max(0, valor_ns), MAX_VALOR_NS))] += 1
+
+    def como_array(self):
+        return np.frombuffer(self.cuentas, dtype=np.int64)
+
+
+def percentiles(cuentas, cuantiles=CUANTILES):
+    """Percentiles (en segundos) a partir de un vector de cuentas por cubeta"""
+    acumuladas = np.cumsum(cuentas)
+    total = int(acumuladas[-1]) if len(acumuladas) else 0
+    if total == 0:
+        return {f"p{q:g}": 0.0 for q in cuantiles}
+    resultado = {}
+    for q in cuantiles:
+        rango = max(1, math.ceil(q / 100 * total))
+        indice = int(np.searchsorted(acumuladas, rango))
+        resultado[f"p{q:g}"] = _valor_cubeta(indice) / 1e9
+    return resultado
+
+
+class _MetricasWorker:
+    __slots__ = ("lock", "tareas", "exitos", "suma_ns", "suma_cuadrados", "minimo_ns", "maximo_ns",
+                 "servicio", "latencia")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tareas = 0
+        self.exitos = 0
+        self.suma_ns = 0
+        self.suma_cuadrados = 0.0
+        self.minimo_ns = None
+        self.maximo_ns = None
+        self.servicio = HistogramaLog()
+        self.latencia = HistogramaLog()
+
+
+class MetricasBalanceo:
+    """Métricas por worker con agregados O(1) y percentiles a partir de histogramas"""
+
+    def __init__(self, num_workers):
+        self.num_workers = num_workers
+        self._workers = [_MetricasWorker() for _ in range(num_workers)]
+
+    def registrar(self, worker_id, exito, servicio_ns, latencia_ns=None):
+        """Añade una tarea terminada; latencia_ns es el tiempo desde su envío hasta el fin"""
+        m = self._workers[worker_id]
+        with m.lock:
+            m.tareas += 1
+            m.exitos += exito
+            m.suma_ns += servicio_ns
+            m.suma_cuadrados += float(servicio_ns) ** 2
+            if m.minimo_ns is None or servicio_ns < m.minimo_ns:
+                m.minimo_ns = servicio_ns
+            if m.maximo_ns is None or servicio_ns > m.maximo_ns:
+                m.maximo_ns = servicio_ns
+            m.servicio.registrar(servicio_ns)
+            m.latencia.registrar(servicio_ns if latencia_ns is None else latencia_ns)
+
+    def completadas(self):
+        return [m.exitos for m in self._workers]
+
+    def fallidas(self):
+        return [m.tareas - m.exitos for m in self._workers]
+
+    def tiempos_totales(self):
+        """Suma de los tiempos de servicio de cada worker, en segundos"""
+        return [m.suma_ns / 1e9 for m in self._workers]
+
+    def tiempos_promedio(self):
+        return [m.suma_ns / max(1, m.tareas) / 1e9 for m in self._workers]
+
+    def desviacion(self, worker_id):
+        """Desviación típica del tiempo de servicio de un worker, en segundos"""
+        m = self._workers[worker_id]
+        if m.tareas < 2:
+            return 0.0
+        media = m.suma_ns / m.tareas
+        return math.sqrt(max(0.0, m.suma_cuadrados / m.tareas - media * media)) / 1e9
+
+    def histograma(self, tipo="latencia", worker_id=None):
+        """Cuentas por cubeta de "servicio" o "latencia" (de un worker o de todos combinados)"""
+        workers = self._workers if worker_id is None else [self._workers[worker_id]]
+        cuentas = np.zeros(NUM_CUBETAS, dtype=np.int64)
+        for m in workers:
+            with m.lock:
+                cuentas += getattr(m, tipo).como_array()
+        return cuentas
+
+    def percentiles(self, tipo="latencia", worker_id=None, cuantiles=CUANTILES):
+        """p50/p95/p99/p99.9 en segundos, con error relativo < 2%"""
+        return percentiles(self.histograma(tipo, worker_id), cuantiles)
+
+    def cubetas(self, tipo="latencia", worker_id=None):
+        """Lista [(valor representativo en segundos, cuenta)] de las cubetas no vacías"""
+        cuentas = self.histograma(tipo, worker_id)
+        return [(_valor_cubeta(int(i)) / 1e9, int(cuentas[i])) for i in np.flatnonzero(cuentas)]
+
+    def resumen(self):
+        tareas = sum(m.tareas for m in self._workers)
+        minimos = [m.minimo_ns for m in self._workers if m.minimo_ns is not None]
+        maximos = [m.maximo_ns for m in self._workers if m.maximo_ns is not None]
+        return {
+            "tareas": tareas,
+            "completadas": sum(self.completadas()),
+            "tiempo_medio": sum(m.suma_ns for m in self._workers) / max(1, tareas) / 1e9,
+            "tiempo_minimo": min(minimos) / 1e9 if minimos else 0.0,
+            "tiempo_maximo": max(maximos) / 1e9 if maximos else 0.0,
+            "servicio": self.percentiles("servicio"),
+            "latencia": self.percentiles("latencia"),
+        }
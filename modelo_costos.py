@@ -0,0 +1,151 @@
+"""
+Descriptores de tareas y modelo de costes aprendido en línea.
+
+Una DescriptorTarea envuelve la función de una tarea junto con su tipo ("primos",
+"matrices", "montecarlo", o el tipo de solicitud de servidor) y el tamaño del problema,
+sin cambiar cómo se ejecuta: sigue siendo un invocable sin argumentos. Las solicitudes
+a servidores guardan además su servidor destino, que se lee al ejecutarse, de modo
+que un balanceador puede cambiarlo antes de enviarlas.
+
+ModeloCostos ajusta, por tipo de tarea, una regresión lineal
+    segundos ≈ a + b · complejidad(tamaño)
+con complejidad n·√n para primos (división por tentativa), n³ para matrices y n para
+Monte Carlo. Se actualiza de forma incremental (Welford) con cada tarea completada y
+puede guardarse en JSON para empezar la siguiente ejecución con lo aprendido.
+"""
+
+import json
+import math
+import os
+import threading
+
+# Complejidad asintótica de cada tipo en función del tamaño del problema
+COMPLEJIDADES = {
+    "primos": lambda n: n * math.sqrt(n),
+    "matrices": lambda n: float(n) ** 3,
+    "montecarlo": float,
+}
+# Duración supuesta (s) de cada tipo mientras el modelo no tiene observaciones
+DURACIONES_INICIALES = {
+    "primos": 3.0,
+    "matrices": 2.5,
+    "montecarlo": 1.8,
+    "calculo": 1.0,
+    "consulta_db": 1.0,
+    "procesamiento_img": 1.5,
+}
+DURACION_DESCONOCIDA = 1.5  # Tareas sin descriptor o de un tipo sin duración inicial
+
+
+class DescriptorTarea:
+    """Tarea invocable que conoce su tipo y el tamaño de su problema"""
+
+    __slots__ = ("funcion", "tipo", "tamano", "servidor")
+
+    def __init__(self, funcion, tipo, tamano=1, servidor=None):
+        self.funcion = funcion
+        self.tipo = tipo
+        self.tamano = tamano
+        self.servidor = servidor  # Servidor destino de las solicitudes a servidores (None si no aplica)
+
+    def __call__(self):
+        return self.funcion()
+
+    def __getstate__(self):
+        return self.funcion, self.tipo, self.tamano, self.servidor
+
+    def __setstate__(self, estado):
+        self.funcion, self.tipo, self.tamano, self.servidor = estado
+
+    def __repr__(self):
+        return f"DescriptorTarea({self.tipo}, tamano={self.tamano})"
+
+
+def complejidad(tipo, tamano):
+    return COMPLEJIDADES.get(tipo, lambda n: 1.0)(tamano)
+
+
+class _RegresionTipo:
+    """Regresión lineal simple con medias y covarianzas acumuladas (Welford)"""
+
+    __slots__ = ("n", "media_x", "media_y", "m2_x", "c_xy")
+
+    def __init__(self, n=0, media_x=0.0, media_y=0.0, m2_x=0.0, c_xy=0.0):
+        self.n = n
+        self.media_x = media_x
+        self.media_y = media_y
+        self.m2_x = m2_x
+        self.c_xy = c_xy
+
+    def observar(self, x, y):
+        self.n += 1
+        dx = x - self.media_x
+        self.media_x += dx / self.n
+        self.media_y += (y - self.media_y) / self.n
+        self.m2_x += dx * (x - self.media_x)
+        self.c_xy += dx * (y - self.media_y)
+
+    def predecir(self, x):
+        if self.m2_x > 1e-12 * max(1.0, self.media_x ** 2) * self.n:
+            pendiente = self.c_xy / self.m2_x
+            if pendiente > 0:
+                return max(0.0, self.media_y + pendiente * (x - self.media_x))
+        # Sin variación en el tamaño (o pendiente absurda): escalar proporcionalmente
+        if self.media_x > 0:
+            return self.media_y * x / self.media_x
+        return self.media_y
+
+
+class ModeloCostos:
+    """Predice la duración (s) de una tarea a partir de su tipo y tamaño"""
+
+    def __init__(self, archivo=None):
+        self.archivo = archivo
+        self.regresiones = {}
+        self.lock = threading.Lock()
+        if archivo and os.path.exists(archivo):
+            self.cargar(archivo)
+
+    def observar(self, tipo, tamano, segundos):
+        """Incorpora la duración medida de una tarea completada"""
+        x = complejidad(tipo, tamano)
+        with self.lock:
+            self.regresiones.setdefault(tipo, _RegresionTipo()).observar(x, segundos)
+
+    def predecir(self, tipo, tamano, defecto=None):
+        """Segundos estimados, o defecto si aún no hay observaciones de ese tipo"""
+        with self.lock:
+            regresion = self.regresiones.get(tipo)
+            if regresion is None or regresion.n == 0:
+                return defecto
+            return regresion.predecir(complejidad(tipo, tamano))
+
+    def estimar(self, tarea):
+        """Segundos estimados de cualquier tarea: con descriptor, la predicción del modelo
+        (o la duración inicial de su tipo); sin él, una duración intermedia"""
+        if not isinstance(tarea, DescriptorTarea):
+            return DURACION_DESCONOCIDA
+        inicial = DURACIONES_INICIALES.get(tarea.tipo, DURACION_DESCONOCIDA)
+        return self.predecir(tarea.tipo, tarea.tamano, defecto=inicial)
+
+    def observaciones(self, tipo):
+        regresion = self.regresiones.get(tipo)
+        return 0 if regresion is None else regresion.n
+
+    def guardar(self, archivo=None):
+        archivo = archivo or self.archivo
+        with self.lock:
+            datos = {tipo: [r.n, r.media_x, r.media_y, r.m2_x, r.c_xy] for tipo, r in self.regresiones.items()}
+        temporal = f"{archivo}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f)
+        os.replace(temporal, archivo)
+
+    def cargar(self, archivo):
+        try:
+            with open(archivo, encoding="utf-8") as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return  # Fichero ausente o corrupto: se empieza sin historial
+        with self.lock:
+            self.regresiones = {tipo: _RegresionTipo(*valores) for tipo, valores in datos.items()}
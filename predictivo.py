@@ -1,36 +1,167 @@
-from threading import Thread
-from balanceador_base import BalanceadorBase
+import json
+import os
 import random
-import tkinter as tk
-from tkinter import messagebox
+import threading
+from functools import partial
+from balanceador_base import BalanceadorBase
+from indice_carga import IndiceCarga
+from modelo_costos import DescriptorTarea, ModeloCostos, complejidad
+
+TIPO_DESCONOCIDO = "desconocido"
+ESCANEO_COMPLETO_MAX = 64  # Hasta este número de workers se evalúan todos en cada decisión
+
+
+class HistorialServicio:
+    """Media móvil exponencial (EWMA) del tiempo de servicio por worker y tipo de tarea.
+
+    Se guarda el tiempo por unidad de complejidad del tipo (ver modelo_costos), de modo
+    que una misma estimación sirve para tareas del mismo tipo y distinto tamaño.
+    """
+
+    def __init__(self, num_workers, alfa=0.3, archivo=None):
+        self.num_workers = num_workers
+        self.alfa = alfa
+        self.archivo = archivo
+        self.estimaciones = [{} for _ in range(num_workers)]  # tipo -> [ewma, observaciones]
+        self.lock = threading.Lock()
+        if archivo and os.path.exists(archivo):
+            self.cargar(archivo)
+
+    @staticmethod
+    def clave(tarea):
+        if isinstance(tarea, DescriptorTarea):
+            return tarea.tipo, complejidad(tarea.tipo, tarea.tamano)
+        return TIPO_DESCONOCIDO, 1.0
+
+    def predecir(self, worker_id, tipo, unidades, defecto=None):
+        """Segundos esperados de la tarea en el worker; sin historial propio, la media de los
+        demás, y si ningún worker ha ejecutado el tipo, defecto"""
+        with self.lock:
+            propia = self.estimaciones[worker_id].get(tipo)
+            if propia is not None:
+                return propia[0] * unidades
+            otras = [e[tipo][0] for e in self.estimaciones if tipo in e]
+        if otras:
+            return sum(otras) / len(otras) * unidades
+        return defecto
+
+    def observar(self, worker_id, tipo, unidades, segundos):
+        por_unidad = segundos / unidades
+        with self.lock:
+            estimacion = self.estimaciones[worker_id].get(tipo)
+            if estimacion is None:
+                self.estimaciones[worker_id][tipo] = [por_unidad, 1]
+            else:
+                estimacion[0] += self.alfa * (por_unidad - estimacion[0])
+                estimacion[1] += 1
+
+    def guardar(self, archivo=None):
+        archivo = archivo or self.archivo
+        with self.lock:
+            datos = [{tipo: [float(f"{e:.6g}"), n] for tipo, (e, n) in estimaciones.items()}
+                     for estimaciones in self.estimaciones]
+        temporal = f"{archivo}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f, separators=(",", ":"))
+        os.replace(temporal, archivo)
+
+    def cargar(self, archivo):
+        try:
+            with open(archivo, encoding="utf-8") as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return  # Fichero ausente o corrupto: se empieza sin historial
+        with self.lock:
+            # Si cambió el número de workers se conservan los que coinciden
+            for w, estimaciones in enumerate(datos[:self.num_workers]):
+                self.estimaciones[w] = {tipo: list(valores) for tipo, valores in estimaciones.items()}
+
 
 class BalanceadorPredictivo(BalanceadorBase):
+    def __init__(self, tareas, num_workers=3, alfa=0.3, archivo_historial=None, muestras=2,
+                 modelo_costos=None, archivo_modelo=None, **opciones):
+        super().__init__(tareas, num_workers, **opciones)
+        self.historial = HistorialServicio(self.num_workers, alfa, archivo_historial)
+        # Estimación de arranque en frío: mientras ningún worker ha ejecutado un tipo, la
+        # duración la predice el modelo de costes (o la duración inicial del tipo según su tamaño)
+        self.modelo = modelo_costos if modelo_costos is not None else ModeloCostos(archivo_modelo)
+        self.muestras = muestras  # Workers aleatorios evaluados además del menos cargado (muchos workers)
+        # Segundos de trabajo pendiente previstos por worker
+        self.pendiente = IndiceCarga(self.num_workers)
+        self.lock_errores = threading.Lock()
+        self.predicciones_evaluadas = 0
+        self.suma_error_absoluto = 0.0
+        self.suma_error = 0.0
+        self.suma_error_relativo = 0.0
+
+    def candidatos(self):
+        if self.num_workers <= ESCANEO_COMPLETO_MAX:
+            return range(self.num_workers)
+        # Con muchos workers: el de menos trabajo pendiente más unas muestras aleatorias
+        menos_cargado, _ = self.pendiente.minimo()
+        return {menos_cargado, *random.sample(range(self.num_workers), self.muestras)}
+
+    def elegir_worker(self, tipo, unidades, inicial):
+        """Worker con el menor instante de fin esperado: trabajo pendiente + duración prevista en él
+        (inicial si todavía no hay historial del tipo)"""
+        mejor = None
+        for w in self.candidatos():
+            prevision = self.historial.predecir(w, tipo, unidades, defecto=inicial)
+            fin = self.pendiente.carga(w) + prevision
+            if mejor is None or fin < mejor[0]:
+                mejor = (fin, w, prevision)
+        return mejor
+
+    def tarea_terminada(self, worker_id, exito, tiempo, resultado, tarea, tipo, unidades, prevision):
+        """Descuenta el trabajo previsto, mide el error de la predicción y actualiza el historial
+        y el modelo de costes"""
+        self.pendiente.sumar(worker_id, -prevision)
+        if not exito:
+            return
+        error = prevision - tiempo
+        with self.lock_errores:
+            self.predicciones_evaluadas += 1
+            self.suma_error_absoluto += abs(error)
+            self.suma_error += error
+            self.suma_error_relativo += abs(error) / max(tiempo, 1e-9)
+        self.historial.observar(worker_id, tipo, unidades, tiempo)
+        if isinstance(tarea, DescriptorTarea):
+            self.modelo.observar(tarea.tipo, tarea.tamano, tiempo)
+
+    def detalles_resultado(self):
+        n = max(1, self.predicciones_evaluadas)
+        return {
+            "predicciones_evaluadas": self.predicciones_evaluadas,
+            "mae": self.suma_error_absoluto / n,
+            "sesgo": self.suma_error / n,  # Positivo: se sobrestima la duración
+            "error_relativo_medio": self.suma_error_relativo / n,
+        }
+
     def ejecutar(self):
         self.tipo_balanceador = "Predictivo"
-        self.crear_ventana("Balanceo Predictivo", 
-                        "== BALANCEO PREDICTIVO ==\nSe asignarán tareas según predicción de carga estimada.")
-        
-        hilos = []
-        historial = [random.uniform(3, 10) for _ in range(self.num_workers)]
-        asignaciones = ""
-        
-        for i, tarea in enumerate(self.tareas):
-            predicciones = [(w, historial[w]) for w in range(self.num_workers)]
-            predicciones.sort(key=lambda x: x[1])
-            worker_id = predicciones[0][0]
-            asignaciones += f"Tarea {i+1} → Worker {worker_id} (tiempo estimado: {historial[worker_id]:.2f}s)\n"
-            
+        self.crear_ventana("Balanceo Predictivo",
+                        "== BALANCEO PREDICTIVO ==\nSe asignarán tareas al worker que se prevé que las termine antes.")
+
+        for i, tarea in enumerate(self.iterar_tareas()):
+            tipo, unidades = HistorialServicio.clave(tarea)
+            fin, worker_id, prevision = self.elegir_worker(tipo, unidades, self.modelo.estimar(tarea))
+            self.anotar_asignacion(f"Tarea {i+1} ({tipo}) → Worker {worker_id} "
+                                   f"(duración estimada: {prevision:.2f}s, fin estimado: {fin:.2f}s)")
+
             try:
-                t = Thread(target=self.worker, args=(worker_id, tarea))
-                hilos.append(t)
-                t.start()
-                historial[worker_id] += random.uniform(2, 5)
+                self.pendiente.sumar(worker_id, prevision)
+                self.enviar(worker_id, tarea, al_terminar=partial(self.tarea_terminada, tarea=tarea, tipo=tipo,
+                                                                  unidades=unidades, prevision=prevision))
             except Exception as e:
-                asignaciones += f"Error asignando tarea {i+1}: {e}\n"
-                
-        self.crear_ventana("Asignaciones Predictivo", f"Asignaciones realizadas:\n\n{asignaciones}")
-        
-        for t in hilos:
-            t.join()
-            
+                self.pendiente.sumar(worker_id, -prevision)
+                self.anotar_asignacion(f"Error asignando tarea {i+1}: {e}")
+
+        self.crear_ventana("Asignaciones Predictivo", f"Asignaciones realizadas:\n\n{self.texto_asignaciones()}")
+
+        self.esperar_workers()
+        if self.historial.archivo:
+            self.historial.guardar()
+        if self.modelo.archivo:
+            self.modelo.guardar()
+
         self.mostrar_resultados()
@@ -1,48 +1,198 @@
 # reactivo.py
 
-from threading import Thread
+import threading
+import time
+from collections import deque
 from balanceador_base import BalanceadorBase
-import tkinter as tk
-from tkinter import messagebox
+from indice_carga import IndiceCarga
 
 class BalanceadorReactivo(BalanceadorBase):
+    """Asignación al worker menos cargado con un monitor que reacciona durante la ejecución.
+
+    El monitor muestrea cada intervalo_monitor segundos (o en cuanto termina una tarea)
+    la carga de cada worker, el tiempo que lleva su tarea en curso y, si se indica un
+    cluster, la carga de CPU del servidor asociado. Con esa información:
+    - coloca las tareas que esperaban en la cola de desborde porque todos los workers
+      estaban en el límite (solo se rechazan si el desborde también está lleno);
+    - migra tareas encoladas y aún no empezadas de los workers saturados a los ociosos.
+    """
+
+    def __init__(self, tareas, num_workers=3, limite=2, intervalo_monitor=0.05, capacidad_desborde=1000,
+                 umbral_ejecucion=None, cluster=None, umbral_cpu=0.8, **opciones):
+        super().__init__(tareas, num_workers, **opciones)
+        self.limite = limite
+        self.intervalo_monitor = intervalo_monitor
+        self.capacidad_desborde = capacidad_desborde
+        self.umbral_ejecucion = umbral_ejecucion  # Segundos de ejecución a partir de los que un worker se considera atascado
+        self.cluster = cluster  # Worker w ↔ servidor w % num_servidores
+        self.umbral_cpu = umbral_cpu
+        # Tareas asignadas y no terminadas por worker; se descuentan al terminar cada una
+        self.indice = IndiceCarga(self.num_workers)
+        self.desborde = deque()  # (tarea, número de tarea)
+        # Serializa las reservas del bucle principal y del monitor; los envíos, que pueden
+        # bloquear por contrapresión, se hacen siempre sin él
+        self.lock = threading.Lock()
+        self.en_vuelo = 0  # Tareas reservadas en algún worker y aún no terminadas
+        self.sin_trabajo = threading.Condition(self.lock)  # Se notifica al quedar todo terminado
+        self.despertar = threading.Event()
+        self.detener_monitor = threading.Event()
+        self.aviso_ns = None  # Primera finalización aún no atendida por el monitor
+        # Métricas del monitor
+        self.muestras_monitor = 0
+        self.migraciones = 0
+        self.tareas_desbordadas = 0
+        self.desborde_maximo = 0
+        self.reacciones = 0
+        self.suma_latencia_reaccion = 0.0
+        self.max_latencia_reaccion = 0.0
+        self.carga_cpu_maxima = 0.0
+
+    def reservar(self):
+        """Reserva un hueco en el worker menos cargado (con self.lock tomado); None si
+        todos están en el límite"""
+        worker_id, carga = self.indice.minimo()
+        if carga >= self.limite:
+            return None
+        self.indice.sumar(worker_id, 1)
+        self.en_vuelo += 1
+        return worker_id
+
+    def descontar(self, worker_id):
+        """Deshace una reserva (con self.lock tomado) y avisa si ya no queda trabajo"""
+        self.indice.sumar(worker_id, -1)
+        self.en_vuelo -= 1
+        if self.en_vuelo == 0 and not self.desborde:
+            self.sin_trabajo.notify_all()
+
+    def colocar(self, worker_id, tarea, numero):
+        """Envía la tarea al worker reservado, sin self.lock tomado"""
+        try:
+            self.enviar(worker_id, tarea, al_terminar=self.liberar)
+        except Exception as e:
+            with self.lock:
+                self.descontar(worker_id)
+            self.anotar_asignacion(f"Error asignando tarea {numero+1}: {e}")
+            return
+        self.anotar_asignacion(f"Tarea {numero+1} → Worker {worker_id}")
+
+    def liberar(self, worker_id, exito, tiempo, resultado):
+        """Descuenta la tarea terminada de la carga del worker y despierta al monitor"""
+        with self.lock:
+            self.descontar(worker_id)
+        if self.aviso_ns is None:
+            self.aviso_ns = time.perf_counter_ns()
+        self.despertar.set()
+
+    def saturado(self, worker_id):
+        if self.indice.carga(worker_id) >= self.limite:
+            return True
+        if self.umbral_ejecucion is not None and self.tiempo_en_ejecucion(worker_id) > self.umbral_ejecucion:
+            return True
+        if self.cluster is not None:
+            servidores = self.cluster.servidores
+            return servidores[worker_id % len(servidores)].carga_cpu >= self.umbral_cpu
+        return False
+
+    def revisar(self):
+        """Una pasada del monitor: vacía el desborde y migra tareas de los saturados a los ociosos"""
+        aviso_ns, self.aviso_ns = self.aviso_ns, None
+        acciones = 0
+        colocadas = []
+        with self.lock:
+            self.muestras_monitor += 1
+            if self.cluster is not None:
+                self.carga_cpu_maxima = max(self.carga_cpu_maxima,
+                                            max(s.carga_cpu for s in self.cluster.servidores))
+
+            while self.desborde:
+                worker_id = self.reservar()
+                if worker_id is None:
+                    break
+                tarea, numero = self.desborde.popleft()
+                colocadas.append((worker_id, tarea, numero))
+                acciones += 1
+
+            for origen in range(self.num_workers):
+                if self.colas is None or self.colas.tamano(origen) == 0 or not self.saturado(origen):
+                    continue
+                destino, carga = self.indice.minimo()
+                if carga > 0:
+                    break  # No queda ningún worker ocioso
+                if destino != origen and self.migrar_pendiente(origen, destino):
+                    self.indice.sumar(origen, -1)
+                    self.indice.sumar(destino, 1)
+                    self.migraciones += 1
+                    acciones += 1
+                    self.anotar_asignacion(f"Tarea pendiente migrada: Worker {origen} → Worker {destino}")
+
+        # Las tareas sacadas del desborde ya tienen su hueco reservado: se envían sin el lock
+        for worker_id, tarea, numero in colocadas:
+            self.colocar(worker_id, tarea, numero)
+
+        if acciones and aviso_ns is not None:
+            latencia = (time.perf_counter_ns() - aviso_ns) / 1e9
+            self.reacciones += 1
+            self.suma_latencia_reaccion += latencia
+            self.max_latencia_reaccion = max(self.max_latencia_reaccion, latencia)
+
+    def _bucle_monitor(self):
+        while not self.detener_monitor.is_set():
+            self.despertar.wait(self.intervalo_monitor)
+            self.despertar.clear()
+            self.revisar()
+
+    def detalles_resultado(self):
+        detalles = {
+            "migraciones": self.migraciones,
+            "tareas_desbordadas": self.tareas_desbordadas,
+            "desborde_maximo": self.desborde_maximo,
+            "reacciones": self.reacciones,
+            "latencia_reaccion_media": self.suma_latencia_reaccion / max(1, self.reacciones),
+            "latencia_reaccion_maxima": self.max_latencia_reaccion,
+            "muestras_monitor": self.muestras_monitor,
+        }
+        if self.cluster is not None:
+            detalles["carga_cpu_maxima"] = self.carga_cpu_maxima
+        return detalles
+
     def ejecutar(self):
         self.tipo_balanceador = "Reactivo"
-        self.crear_ventana("Balanceo Reactivo", 
-                        "== BALANCEO REACTIVO ==\nSe reasignarán tareas si un worker está saturado (límite 2 tareas).")
-        
-        hilos = []
-        cargas = [0] * self.num_workers
-        limite = 2
-        asignaciones = ""
-        
-        for i, tarea in enumerate(self.tareas):
-            worker_id = cargas.index(min(cargas))
-            if cargas[worker_id] >= limite:
-                reasignado = False
-                for j in range(self.num_workers):
-                    if cargas[j] < limite:
-                        worker_id = j
-                        reasignado = True
-                        asignaciones += f"Tarea {i+1} → Worker {worker_id} (reasignado por saturación)\n"
-                        break
-                if not reasignado:
-                    asignaciones += f"Tarea {i+1} no pudo ser asignada: todos saturados.\n"
-                    continue
+        self.crear_ventana("Balanceo Reactivo",
+                        f"== BALANCEO REACTIVO ==\nSe asigna al worker menos cargado (límite {self.limite} tareas); "
+                        "un monitor migra tareas pendientes de los workers saturados y coloca las que esperan en desborde.")
+
+        monitor = threading.Thread(target=self._bucle_monitor, name="Monitor-reactivo", daemon=True)
+        monitor.start()
+
+        for i, tarea in enumerate(self.iterar_tareas()):
+            worker_id = None
+            with self.lock:
+                # Con tareas ya en desborde, las nuevas esperan detrás para respetar el orden
+                if not self.desborde:
+                    worker_id = self.reservar()
+                if worker_id is None:
+                    encolada = len(self.desborde) < self.capacidad_desborde
+                    if encolada:
+                        self.desborde.append((tarea, i))
+                        self.tareas_desbordadas += 1
+                        self.desborde_maximo = max(self.desborde_maximo, len(self.desborde))
+            if worker_id is not None:
+                self.colocar(worker_id, tarea, i)
+            elif encolada:
+                self.anotar_asignacion(f"Tarea {i+1} en cola de desborde: todos saturados.")
             else:
-                asignaciones += f"Tarea {i+1} → Worker {worker_id}\n"
-                
-            try:
-                t = Thread(target=self.worker, args=(worker_id, tarea))
-                hilos.append(t)
-                t.start()
-                cargas[worker_id] += 1
-            except Exception as e:
-                asignaciones += f"Error asignando tarea {i+1}: {e}\n"
-                
-        self.crear_ventana("Asignaciones Reactivo", f"Asignaciones realizadas:\n\n{asignaciones}")
-        
-        for t in hilos:
-            t.join()
-            
+                self.anotar_asignacion(f"Tarea {i+1} no pudo ser asignada: todos saturados y desborde lleno.")
+                self.registrar_rechazo()
+
+        # El monitor sigue colocando el desborde y migrando hasta que termina la última tarea
+        with self.lock:
+            self.sin_trabajo.wait_for(lambda: self.en_vuelo == 0 and not self.desborde)
+        self.detener_monitor.set()
+        self.despertar.set()
+        monitor.join()
+
+        self.crear_ventana("Asignaciones Reactivo", f"Asignaciones realizadas:\n\n{self.texto_asignaciones()}")
+
+        self.esperar_workers()
+
         self.mostrar_resultados()
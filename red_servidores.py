@@ -0,0 +1,186 @@
+"""
+Modo de red para los servidores simulados.
+
+Cada ServidorSimulado puede servirse en un puerto TCP de localhost con un protocolo
+compacto: cada mensaje es un prefijo de 4 bytes (longitud, big-endian) seguido de un
+JSON en UTF-8. El cliente mantiene por servidor un pool de conexiones persistentes
+(keep-alive) con tamaño y timeouts configurables, de modo que la serialización, el
+establecimiento de conexiones y la contención de red aparecen en las mediciones.
+
+Ejecutado como script sirve un clúster completo en un proceso aparte:
+    python red_servidores.py --servidores 5 --puerto-base 9000
+"""
+
+import argparse
+import json
+import socket
+import socketserver
+import struct
+import threading
+
+_CABECERA = struct.Struct(">I")
+TAM_MAXIMO_MENSAJE = 16 * 1024 ** 2
+
+
+def enviar_mensaje(sock, objeto):
+    """Envía un objeto JSON con su prefijo de longitud"""
+    datos = json.dumps(objeto, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_CABECERA.pack(len(datos)) + datos)
+
+
+def _recibir_exacto(sock, n):
+    partes = []
+    while n > 0:
+        parte = sock.recv(n)
+        if not parte:
+            raise ConnectionError("Conexión cerrada por el otro extremo")
+        partes.append(parte)
+        n -= len(parte)
+    return b"".join(partes)
+
+
+def recibir_mensaje(sock):
+    """Recibe un objeto JSON con prefijo de longitud"""
+    (longitud,) = _CABECERA.unpack(_recibir_exacto(sock, _CABECERA.size))
+    if longitud > TAM_MAXIMO_MENSAJE:
+        raise ConnectionError(f"Mensaje demasiado grande ({longitud} bytes)")
+    return json.loads(_recibir_exacto(sock, longitud).decode("utf-8"))
+
+
+class _ManejadorSolicitudes(socketserver.BaseRequestHandler):
+    """Atiende todas las solicitudes de una conexión persistente"""
+
+    def handle(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        servidor = self.server.servidor_simulado
+        while True:
+            try:
+                mensaje = recibir_mensaje(self.request)
+            except (ConnectionError, OSError, ValueError):
+                return  # El cliente cerró la conexión o envió basura
+            try:
+                exito, respuesta = servidor.procesar_solicitud(mensaje.get("tipo"), mensaje.get("datos"))
+            except Exception as e:
+                exito, respuesta = False, f"Error interno: {e}"
+            try:
+                enviar_mensaje(self.request, [exito, respuesta])
+            except OSError:
+                return
+
+
+class _ServidorTCPConHilos(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ServidorTCP:
+    """Expone un ServidorSimulado en un puerto TCP (un hilo por conexión)"""
+
+    def __init__(self, servidor_simulado, host="127.0.0.1", puerto=0):
+        self.servidor_simulado = servidor_simulado
+        self._servidor = _ServidorTCPConHilos((host, puerto), _ManejadorSolicitudes)
+        self._servidor.servidor_simulado = servidor_simulado
+        self._hilo = None
+
+    @property
+    def direccion(self):
+        return self._servidor.server_address[:2]
+
+    def iniciar(self):
+        """Empieza a aceptar conexiones en segundo plano"""
+        self._hilo = threading.Thread(target=self._servidor.serve_forever,
+                                      name=f"TCP-{self.servidor_simulado.nombre}", daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        """Deja de aceptar conexiones y libera el puerto"""
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        if self._hilo is not None:
+            self._hilo.join()
+
+
+class PoolConexiones:
+    """Pool de conexiones persistentes hacia un servidor, con tamaño y timeouts acotados"""
+
+    def __init__(self, direccion, tam_pool=4, timeout_conexion=2.0, timeout_lectura=30.0,
+                 timeout_espera=None):
+        self.direccion = tuple(direccion)
+        self.tam_pool = tam_pool
+        self.timeout_conexion = timeout_conexion
+        self.timeout_lectura = timeout_lectura
+        # Tiempo máximo esperando una conexión libre (None = sin límite)
+        self.timeout_espera = timeout_espera
+        self._libres = []
+        self._lock = threading.Lock()
+        self._cupos = threading.BoundedSemaphore(tam_pool)
+        self.conexiones_creadas = 0
+
+    def _abrir(self):
+        sock = socket.create_connection(self.direccion, timeout=self.timeout_conexion)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(self.timeout_lectura)
+        with self._lock:
+            self.conexiones_creadas += 1
+        return sock
+
+    def solicitar(self, tipo_solicitud, datos=None):
+        """Envía una solicitud y devuelve (exito, respuesta) como procesar_solicitud"""
+        if not self._cupos.acquire(timeout=self.timeout_espera):
+            return False, "Pool de conexiones agotado"
+        sock = None
+        try:
+            with self._lock:
+                sock = self._libres.pop() if self._libres else None
+            if sock is None:
+                sock = self._abrir()
+            enviar_mensaje(sock, {"tipo": tipo_solicitud, "datos": datos})
+            exito, respuesta = recibir_mensaje(sock)
+            with self._lock:
+                self._libres.append(sock)
+            sock = None
+            return exito, respuesta
+        except (OSError, ConnectionError, ValueError) as e:
+            return False, f"Error de red: {e}"
+        finally:
+            if sock is not None:
+                sock.close()  # Conexión en estado desconocido: no se reutiliza
+            self._cupos.release()
+
+    def cerrar(self):
+        """Cierra las conexiones inactivas del pool"""
+        with self._lock:
+            libres, self._libres = self._libres, []
+        for sock in libres:
+            sock.close()
+
+
+def main():
+    # Importación diferida para evitar el ciclo con servidor_simulado
+    from servidor_simulado import ClusterServidores
+
+    parser = argparse.ArgumentParser(description="Sirve un clúster de servidores simulados por TCP")
+    parser.add_argument("--servidores", type=int, default=5)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto-base", type=int, default=0,
+                        help="Puerto del primer servidor (0 = puertos libres elegidos por el sistema)")
+    args = parser.parse_args()
+
+    cluster = ClusterServidores(num_servidores=args.servidores)
+    servidores_tcp = []
+    for i, servidor in enumerate(cluster.servidores):
+        puerto = args.puerto_base + i if args.puerto_base else 0
+        servidores_tcp.append(ServidorTCP(servidor, args.host, puerto).iniciar())
+    for servidor_tcp in servidores_tcp:
+        host, puerto = servidor_tcp.direccion
+        print(f"{servidor_tcp.servidor_simulado.nombre} escuchando en {host}:{puerto}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        for servidor_tcp in servidores_tcp:
+            servidor_tcp.detener()
+
+
+if __name__ == "__main__":
+    main()
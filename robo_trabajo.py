@@ -0,0 +1,31 @@
+from balanceador_base import BalanceadorBase
+
+class BalanceadorRoboTrabajo(BalanceadorBase):
+    """Reparto inicial round-robin y robo de trabajo entre workers durante la ejecución"""
+
+    def __init__(self, tareas, num_workers=3, **opciones):
+        opciones["modo_cola"] = "robo"
+        super().__init__(tareas, num_workers, **opciones)
+        self.tipo_balanceador = "Robo de trabajo"
+
+    def ejecutar(self):
+        self.crear_ventana("Balanceo con Robo de Trabajo", 
+                        "== ROBO DE TRABAJO ==\nLas tareas se reparten en round-robin y los workers ociosos "
+                        "roban tareas pendientes al worker más cargado.")
+        
+        for i, tarea in enumerate(self.iterar_tareas()):
+            worker_id = i % self.num_workers
+            self.anotar_asignacion(f"Tarea {i+1} → Worker {worker_id}")
+            try:
+                self.enviar(worker_id, tarea)
+            except Exception as e:
+                self.anotar_asignacion(f"Error asignando tarea {i+1}: {e}")
+        
+        self.crear_ventana("Asignaciones Robo de Trabajo", f"Asignaciones realizadas:\n\n{self.texto_asignaciones()}")
+        
+        self.esperar_workers()
+        
+        robos = "\n".join(f"Worker {w}: {n} tareas robadas" for w, n in enumerate(self.robos))
+        self.crear_ventana("Robos de trabajo", f"Tareas robadas por cada worker:\n\n{robos}")
+        
+        self.mostrar_resultados()
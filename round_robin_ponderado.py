@@ -0,0 +1,94 @@
+"""
+Round-robin ponderado suave (estilo nginx) con elección O(1).
+
+Como nginx, reparte las elecciones de forma intercalada en lugar de en ráfagas: con
+pesos 5, 1, 1 produce A A A B C A A (nginx da A A B A C A A) en vez de A A A A A B C.
+Aquí la secuencia de un ciclo completo se precalcula al fijar los pesos: cada worker
+aparece peso_i veces y su k-ésima aparición se coloca en el instante virtual
+(k + 0.5) / peso_i (los empates, por índice de worker), ordenando con un montículo
+(O(W log n), con W la suma de pesos cuantizados). Cada elección es solo avanzar un
+índice sobre la tabla, así que cuesta O(1) aunque haya cientos de workers.
+
+Los pesos pueden ser arbitrarios (capacidades, rendimiento medido...): se cuantizan a
+enteros con RESOLUCION_PESOS niveles para acotar la longitud de la tabla.
+"""
+
+import heapq
+from math import gcd
+
+RESOLUCION_PESOS = 100
+
+
+class RoundRobinPonderado:
+    """Secuencia de round-robin ponderado suave precalculada por ciclos"""
+
+    def __init__(self, pesos, resolucion=RESOLUCION_PESOS):
+        self.resolucion = resolucion
+        self.tabla = []
+        self.posicion = 0
+        self.actualizar_pesos(pesos)
+
+    def actualizar_pesos(self, pesos):
+        """Recalcula la tabla del ciclo; los pesos no positivos excluyen al worker (si
+        ninguno es positivo, todos cuentan igual, así que la tabla nunca queda vacía).
+
+        El cursor conserva su fase dentro del ciclo: volver siempre al principio haría
+        que, con recálculos frecuentes, los workers de peso bajo (que caen a mitad de
+        ciclo) no llegaran a elegirse nunca.
+        """
+        if not pesos:
+            raise ValueError("Se necesita al menos un peso")
+        anterior = len(self.tabla)
+        self.pesos = self._cuantizar(pesos)
+        self.tabla = self._construir_tabla(self.pesos)
+        self.posicion = self.posicion * len(self.tabla) // anterior if anterior else 0
+
+    def _cuantizar(self, pesos):
+        maximo = max(pesos, default=0)
+        if maximo <= 0:
+            return [1] * len(pesos)  # Sin información: round-robin simple
+        if all(isinstance(p, int) for p in pesos) and maximo <= self.resolucion:
+            enteros = [max(0, p) for p in pesos]  # Pesos enteros pequeños (capacidades): exactos
+        else:
+            # Un peso positivo muy pequeño no debe redondearse a cero
+            enteros = [max(1, round(p / maximo * self.resolucion)) if p > 0 else 0 for p in pesos]
+        divisor = 0
+        for e in enteros:
+            divisor = gcd(divisor, e)
+        return [e // divisor for e in enteros]
+
+    @staticmethod
+    def _construir_tabla(pesos):
+        monticulo = [(0.5 / p, i) for i, p in enumerate(pesos) if p > 0]
+        heapq.heapify(monticulo)
+        apariciones = [0] * len(pesos)
+        tabla = []
+        for _ in range(sum(pesos)):
+            _, i = heapq.heappop(monticulo)
+            tabla.append(i)
+            apariciones[i] += 1
+            if apariciones[i] < pesos[i]:
+                heapq.heappush(monticulo, ((apariciones[i] + 0.5) / pesos[i], i))
+        return tabla
+
+    def siguiente(self):
+        """Devuelve el siguiente worker del ciclo"""
+        elegido = self.tabla[self.posicion]
+        self.posicion += 1
+        if self.posicion == len(self.tabla):
+            self.posicion = 0
+        return elegido
+
+
+def pesos_por_capacidad(cluster, libre=True):
+    """Función que devuelve los pesos de los servidores de un ClusterServidores.
+
+    Con libre=True el peso es la capacidad aún disponible según la carga de CPU actual
+    (capacidad * (1 - carga_cpu)), de modo que al recalcular se reflejan los servidores
+    que se están saturando; con libre=False, solo la capacidad nominal.
+    """
+    def obtener_pesos():
+        if libre:
+            return [s.capacidad * (1 - s.carga_cpu) for s in cluster.servidores]
+        return [s.capacidad for s in cluster.servidores]
+    return obtener_pesos
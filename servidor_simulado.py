@@ -1,78 +1,387 @@
 import time
 import random
 import socket
+import asyncio
+import itertools
 import threading
+import math
+from collections import deque
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor
+from red_servidores import PoolConexiones, ServidorTCP
+from modelo_costos import DescriptorTarea
+from metricas import HistogramaLog, percentiles
+
+# Distribuciones de tiempos de servicio y dinámica de carga, compartidas por el
+# servidor en tiempo real y por la simulación de eventos discretos
+RANGOS_TIEMPO_PROCESO = {
+    "calculo": (0.5, 3.0),
+    "consulta_db": (0.2, 1.5),
+    "procesamiento_img": (1.0, 5.0),
+}
+RANGO_TIEMPO_GENERICO = (0.1, 0.5)
+RANGO_RETARDO_JOIN = (0.2, 0.8)
+DIMENSIONES_IMAGEN = [(800, 600), (1024, 768), (1920, 1080), (3840, 2160)]
+RANGO_RETARDO_IMAGEN = (0.1, 0.3)
+CARGA_MINIMA = 0.1
+CARGA_MAXIMA = 0.95
+INCREMENTO_CARGA = 0.05
+DECREMENTO_CARGA = 0.03
+RETARDO_DECREMENTO = 2  # Segundos hasta que se disipa cada incremento de carga
+
+# Admisión de solicitudes cuando el servidor está al máximo de conexiones:
+# "inmediato" rechaza al instante; "cola" espera en una cola FIFO acotada (descarte por
+# cola llena y por tiempo de espera); "codel" además descarta al desencolar mientras la
+# espera se mantiene por encima de un objetivo, al estilo CoDel
+MODOS_ADMISION = ("inmediato", "cola", "codel")
+
+# Consultas que envían las tareas de base de datos
+CONSULTAS_DB = [
+    "SELECT * FROM usuarios WHERE activo=1",
+    "UPDATE productos SET precio=precio*1.05 WHERE categoria='electronics'",
+    "SELECT p.nombre, c.nombre FROM productos p JOIN categorias c ON p.categoria_id = c.id",
+    "DELETE FROM sesiones WHERE fecha < NOW() - INTERVAL 1 DAY"
+]
+
+# np.trapz se eliminó en NumPy 2.x en favor de np.trapezoid
+_trapecio = getattr(np, "trapezoid", None) or getattr(np, "trapz")
+
+def muestrear_latencia(latencia_base, rng=random):
+    """Latencia de red variable alrededor de la latencia base del servidor"""
+    return latencia_base * (1 + rng.random())
+
+def muestrear_tiempo_proceso(tipo_solicitud, carga_cpu, rng=random):
+    """Tiempo de proceso según el tipo de solicitud, penalizado por la carga de CPU"""
+    minimo, maximo = RANGOS_TIEMPO_PROCESO.get(tipo_solicitud, RANGO_TIEMPO_GENERICO)
+    return rng.uniform(minimo, maximo) * (1 + carga_cpu)
+
+def muestrear_retardo_join(rng=random):
+    """Retardo adicional de las consultas con JOIN"""
+    return rng.uniform(*RANGO_RETARDO_JOIN)
+
+def muestrear_retardo_imagen(dim, rng=random):
+    """Retardo adicional del procesamiento de imagen, proporcional a su tamaño"""
+    factor_tiempo = (dim[0] * dim[1]) / (800 * 600)
+    return rng.uniform(*RANGO_RETARDO_IMAGEN) * factor_tiempo
+
+class CargaCPU:
+    """Carga de CPU cuya disipación se calcula de forma diferida al leerla.
+
+    Cada incremento programa un decremento RETARDO_DECREMENTO segundos después, igual
+    que antes hacía un hilo dormido por solicitud; aquí los decrementos pendientes son
+    solo marcas de tiempo que se aplican en orden la próxima vez que se consulta o
+    modifica la carga. No crea hilos. No es thread-safe: el dueño debe protegerla.
+    """
+
+    def __init__(self, inicial=CARGA_MINIMA, reloj=time.monotonic):
+        self.actual = inicial
+        self.reloj = reloj
+        self.decrementos = deque()  # Instantes (crecientes) en que toca disipar carga
+
+    def _ponerse_al_dia(self, ahora):
+        decrementos = self.decrementos
+        while decrementos and decrementos[0] <= ahora:
+            decrementos.popleft()
+            self.actual = max(CARGA_MINIMA, self.actual - DECREMENTO_CARGA)
+
+    def valor(self, ahora=None):
+        """Carga vigente en el instante dado (por defecto, ahora)"""
+        self._ponerse_al_dia(self.reloj() if ahora is None else ahora)
+        return self.actual
+
+    def incrementar(self, incremento=INCREMENTO_CARGA, ahora=None):
+        """Aumenta la carga y programa su disipación"""
+        if ahora is None:
+            ahora = self.reloj()
+        self._ponerse_al_dia(ahora)
+        self.actual = min(CARGA_MAXIMA, self.actual + incremento)
+        self.decrementos.append(ahora + RETARDO_DECREMENTO)
+
+    def establecer(self, valor):
+        """Fija la carga descartando los decrementos pendientes"""
+        self.actual = valor
+        self.decrementos.clear()
+
+class _Espera:
+    """Solicitud esperando conexión; se despierta con un Event (hilos) o un Future (asyncio)"""
+    __slots__ = ("llegada", "evento", "futuro", "loop", "admitida")
+
+    def __init__(self, llegada, loop=None):
+        self.llegada = llegada
+        self.loop = loop
+        self.evento = threading.Event() if loop is None else None
+        self.futuro = loop.create_future() if loop is not None else None
+        self.admitida = None  # None mientras espera; True o False al resolverse
+
+    def resolver(self, admitida):
+        self.admitida = admitida
+        if self.futuro is None:
+            self.evento.set()
+        else:
+            self.loop.call_soon_threadsafe(_completar_futuro, self.futuro)
+
+def _completar_futuro(futuro):
+    if not futuro.done():
+        futuro.set_result(None)
+
+class ColaAdmision:
+    """Cola de espera acotada de las solicitudes que llegan con el servidor lleno.
+
+    Al liberarse una conexión se cede directamente a la primera de la cola. En modo
+    "codel", si la espera de las solicitudes que salen lleva más de un intervalo por
+    encima del objetivo se descarta la de cabeza, y mientras siga así se descartan
+    más, cada vez más a menudo (intervalo / sqrt(descartes)): la cola no se queda
+    llena de solicitudes que ya esperaron demasiado. No es thread-safe: el dueño debe
+    protegerla.
+    """
+
+    def __init__(self, modo="inmediato", longitud=20, timeout=1.0, objetivo=0.05, intervalo=0.5):
+        if modo not in MODOS_ADMISION:
+            raise ValueError(f"Modo de admisión no válido: {modo!r} (opciones: {', '.join(MODOS_ADMISION)})")
+        self.modo = modo
+        self.longitud = longitud
+        self.timeout = timeout  # Espera máxima de cada solicitud en la cola, en segundos
+        self.objetivo = objetivo
+        self.intervalo = intervalo
+        self.esperas = deque()
+        # Estado de CoDel
+        self.exceso_desde = None
+        self.descartando = False
+        self.descartes_seguidos = 0
+        self.siguiente_descarte = 0.0
+        # Estadísticas
+        self.encoladas = 0
+        self.descartadas_cola_llena = 0
+        self.descartadas_codel = 0
+        self.expiradas = 0
+        self.espera = HistogramaLog()  # Espera en cola de las solicitudes admitidas (0 si entran directas)
+
+    def encolar(self, espera):
+        """Añade la solicitud a la cola; False si no se admite espera o la cola está llena"""
+        if self.modo == "inmediato":
+            return False
+        if len(self.esperas) >= self.longitud:
+            self.descartadas_cola_llena += 1
+            return False
+        self.esperas.append(espera)
+        self.encoladas += 1
+        return True
+
+    def retirar(self, espera):
+        """Quita una solicitud que dejó de esperar (tiempo agotado o cancelada)"""
+        try:
+            self.esperas.remove(espera)
+        except ValueError:
+            pass
+
+    def siguiente(self, ahora):
+        """Saca la siguiente solicitud a admitir, resolviendo como rechazadas las que CoDel descarta"""
+        while self.esperas:
+            espera = self.esperas.popleft()
+            if self.modo == "codel" and self._descartar(ahora, ahora - espera.llegada):
+                self.descartadas_codel += 1
+                espera.resolver(False)
+                continue
+            return espera
+        return None
+
+    def _descartar(self, ahora, estancia):
+        if estancia < self.objetivo or not self.esperas:
+            # Por debajo del objetivo (o cola vaciándose): se sale del estado de descarte
+            self.exceso_desde = None
+            self.descartando = False
+            return False
+        if self.exceso_desde is None:
+            self.exceso_desde = ahora
+            return False
+        if not self.descartando:
+            if ahora - self.exceso_desde < self.intervalo:
+                return False
+            self.descartando = True
+            self.descartes_seguidos = 1
+        elif ahora < self.siguiente_descarte:
+            return False
+        else:
+            self.descartes_seguidos += 1
+        self.siguiente_descarte = ahora + self.intervalo / math.sqrt(self.descartes_seguidos)
+        return True
+
+    def estadisticas(self):
+        return {
+            "modo_admision": self.modo,
+            "en_cola": len(self.esperas),
+            "encoladas": self.encoladas,
+            "descartadas_cola_llena": self.descartadas_cola_llena,
+            "descartadas_codel": self.descartadas_codel,
+            "expiradas": self.expiradas,
+            "espera_cola": percentiles(self.espera.como_array()),
+        }
 
 class ServidorSimulado:
     """Simula un servidor con capacidad limitada y tiempos de respuesta variables"""
     
-    def __init__(self, nombre, capacidad=10, latencia_base=0.05):
+    def __init__(self, nombre, capacidad=10, latencia_base=0.05, modo_admision="inmediato", **opciones_admision):
         self.nombre = nombre
         self.capacidad = capacidad  # Máximo número de conexiones simultáneas
         self.conexiones_activas = 0
         self.latencia_base = latencia_base  # Latencia base en segundos
-        self.carga_cpu = 0.1  # Comienza con baja carga
+        self._carga = CargaCPU(CARGA_MINIMA)  # Comienza con baja carga
         self.disponible = True
         self.lock = threading.RLock()
         self.solicitudes_totales = 0
         self.solicitudes_rechazadas = 0
+        # Solicitudes que llegan con todas las conexiones ocupadas (ver ColaAdmision)
+        self.admision = ColaAdmision(modo_admision, **opciones_admision)
+        self.estancia = HistogramaLog()  # Espera en cola + servicio de las solicitudes atendidas
         print(f"Servidor {nombre} iniciado con capacidad {capacidad}")
     
     def procesar_solicitud(self, tipo_solicitud, datos=None):
         """Procesa una solicitud simulando carga de servidor"""
-        with self.lock:
-            # Verificar si podemos aceptar más conexiones
-            if self.conexiones_activas >= self.capacidad:
-                self.solicitudes_rechazadas += 1
-                return False, "Servidor saturado, solicitud rechazada"
-            
-            self.conexiones_activas += 1
-            self.solicitudes_totales += 1
+        llegada_ns = time.monotonic_ns()
+        # Verificar si podemos aceptar más conexiones (o esperar turno en la cola de admisión)
+        if not self._admitir():
+            return False, "Servidor saturado, solicitud rechazada"
         
         try:
             # Simular latencia de red variable
-            latencia = self.latencia_base * (1 + random.random())
+            latencia = muestrear_latencia(self.latencia_base)
             time.sleep(latencia)
             
             # Diferentes tipos de solicitudes tienen diferentes cargas
-            if tipo_solicitud == "calculo":
-                tiempo_proceso = random.uniform(0.5, 3.0) * (1 + self.carga_cpu)
-                resultado = self._realizar_calculo_complejo(datos)
-            elif tipo_solicitud == "consulta_db":
-                tiempo_proceso = random.uniform(0.2, 1.5) * (1 + self.carga_cpu)
-                resultado = self._simular_consulta_db(datos)
-            elif tipo_solicitud == "procesamiento_img":
-                tiempo_proceso = random.uniform(1.0, 5.0) * (1 + self.carga_cpu)
-                resultado = self._simular_procesamiento_imagen()
-            else:
-                tiempo_proceso = random.uniform(0.1, 0.5) * (1 + self.carga_cpu)
-                resultado = "Solicitud genérica procesada"
+            tiempo_proceso = muestrear_tiempo_proceso(tipo_solicitud, self.carga_cpu)
+            resultado, retardo = self._preparar_resultado(tipo_solicitud, datos)
+            time.sleep(retardo)
             
             # Simular tiempo de procesamiento
             time.sleep(tiempo_proceso)
             
             # Aumentar la carga del servidor temporalmente
-            self._actualizar_carga(0.05)
+            self._actualizar_carga(INCREMENTO_CARGA)
             
             return True, {"resultado": resultado, "tiempo": tiempo_proceso + latencia}
         finally:
+            self._liberar(llegada_ns)
+    
+    async def procesar_solicitud_async(self, tipo_solicitud, datos=None):
+        """Versión corrutina de procesar_solicitud: espera con asyncio.sleep sin ocupar un hilo"""
+        llegada_ns = time.monotonic_ns()
+        if not await self._admitir_async():
+            return False, "Servidor saturado, solicitud rechazada"
+        
+        try:
+            latencia = muestrear_latencia(self.latencia_base)
+            await asyncio.sleep(latencia)
+            
+            tiempo_proceso = muestrear_tiempo_proceso(tipo_solicitud, self.carga_cpu)
+            resultado, retardo = self._preparar_resultado(tipo_solicitud, datos)
+            await asyncio.sleep(retardo + tiempo_proceso)
+            
+            self._actualizar_carga(INCREMENTO_CARGA)
+            
+            return True, {"resultado": resultado, "tiempo": tiempo_proceso + latencia}
+        finally:
+            self._liberar(llegada_ns)
+    
+    def _admitir(self):
+        """Reserva una conexión si hay capacidad; si no, espera en la cola de admisión
+        (según su modo) y cuenta el rechazo si no llega a entrar"""
+        with self.lock:
+            espera = self._reservar_o_encolar()
+        if espera is None or espera is True:
+            return espera is True
+        espera.evento.wait(self.admision.timeout)
+        with self.lock:
+            return self._resolver_espera(espera)
+    
+    async def _admitir_async(self):
+        """Como _admitir, pero esperando turno sin bloquear el event loop"""
+        with self.lock:
+            espera = self._reservar_o_encolar(asyncio.get_running_loop())
+        if espera is None or espera is True:
+            return espera is True
+        try:
+            await asyncio.wait_for(asyncio.shield(espera.futuro), self.admision.timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # Cancelada mientras esperaba (p. ej. la copia perdedora de una solicitud cubierta)
             with self.lock:
-                self.conexiones_activas -= 1
+                admitida = self._resolver_espera(espera, cancelada=True)
+            if admitida:
+                self._liberar()
+            raise
+        with self.lock:
+            return self._resolver_espera(espera)
     
-    def _actualizar_carga(self, incremento):
-        """Actualiza la carga del servidor"""
+    def _reservar_o_encolar(self, loop=None):
+        """Con self.lock: True si hay conexión libre, una _Espera si se encola, None si se rechaza"""
+        # Con solicitudes ya esperando, las nuevas no se cuelan por delante
+        if self.conexiones_activas < self.capacidad and not self.admision.esperas:
+            self._ocupar_conexion(0)
+            return True
+        espera = _Espera(time.monotonic(), loop)
+        if self.admision.encolar(espera):
+            return espera
+        self.solicitudes_rechazadas += 1
+        return None
+    
+    def _resolver_espera(self, espera, cancelada=False):
+        """Con self.lock: si la espera no se resolvió a tiempo, sale de la cola como expirada"""
+        if espera.admitida is None:
+            self.admision.retirar(espera)
+            espera.admitida = False
+            if not cancelada:
+                self.admision.expiradas += 1
+                self.solicitudes_rechazadas += 1
+        elif not espera.admitida:
+            self.solicitudes_rechazadas += 1  # Descartada por CoDel
+        return espera.admitida
+    
+    def _ocupar_conexion(self, espera_s):
+        self.conexiones_activas += 1
+        self.solicitudes_totales += 1
+        self.admision.espera.registrar(int(espera_s * 1e9))
+    
+    def _liberar(self, llegada_ns=None):
+        """Libera la conexión reservada por _admitir y la cede a la primera solicitud en espera"""
         with self.lock:
-            self.carga_cpu = min(0.95, self.carga_cpu + incremento)
-            # La carga disminuye con el tiempo en un thread separado
-            threading.Thread(target=self._disminuir_carga, daemon=True).start()
+            self.conexiones_activas -= 1
+            if llegada_ns is not None:
+                self.estancia.registrar(time.monotonic_ns() - llegada_ns)
+            ahora = time.monotonic()
+            while self.conexiones_activas < self.capacidad:
+                espera = self.admision.siguiente(ahora)
+                if espera is None:
+                    break
+                self._ocupar_conexion(ahora - espera.llegada)
+                espera.resolver(True)
+    
+    def _preparar_resultado(self, tipo_solicitud, datos):
+        """Calcula el resultado de la solicitud y el retardo adicional que implica"""
+        if tipo_solicitud == "calculo":
+            return self._realizar_calculo_complejo(datos), 0.0
+        elif tipo_solicitud == "consulta_db":
+            return self._simular_consulta_db(datos)
+        elif tipo_solicitud == "procesamiento_img":
+            return self._simular_procesamiento_imagen()
+        return "Solicitud genérica procesada", 0.0
     
-    def _disminuir_carga(self):
-        """Disminuye gradualmente la carga del servidor"""
-        time.sleep(2)  # Esperar antes de disminuir
+    @property
+    def carga_cpu(self):
+        """Carga de CPU actual, con la disipación pendiente ya aplicada"""
         with self.lock:
-            self.carga_cpu = max(0.1, self.carga_cpu - 0.03)
+            return self._carga.valor()
+
+    @carga_cpu.setter
+    def carga_cpu(self, valor):
+        with self.lock:
+            self._carga.establecer(valor)
+
+    def _actualizar_carga(self, incremento):
+        """Actualiza la carga del servidor"""
+        with self.lock:
+            # La carga disminuye con el tiempo: el decremento se aplica al leerla
+            self._carga.incrementar(incremento)
     
     def _realizar_calculo_complejo(self, datos):
         """Simula un cálculo matemático complejo"""
@@ -84,11 +393,11 @@ class ServidorSimulado:
         # Cálculo simulado (área bajo la curva normal)
         x = np.linspace(-5, 5, int(valor/100))
         y = 1/(np.sqrt(2*np.pi)) * np.exp(-x**2/2)
-        resultado = np.trapz(y, x)
+        resultado = _trapecio(y, x)
         return f"Resultado del cálculo: {resultado:.6f}"
     
     def _simular_consulta_db(self, query):
-        """Simula una consulta a base de datos"""
+        """Simula una consulta a base de datos; devuelve (resultado, retardo)"""
         tablas = ["usuarios", "productos", "ventas", "inventario", "clientes"]
         operaciones = ["SELECT", "INSERT", "UPDATE", "DELETE", "JOIN"]
         
@@ -98,25 +407,24 @@ class ServidorSimulado:
             query = f"{operacion} en tabla {tabla}"
         
         # Simular diferentes tiempos según complejidad de la consulta
+        retardo = 0.0
         if "JOIN" in query:
             # Las JOINs son más lentas
-            time.sleep(random.uniform(0.2, 0.8))
+            retardo = muestrear_retardo_join()
         
         registros = random.randint(5, 500)
-        return f"Consulta '{query}' completada. {registros} registros procesados."
+        return f"Consulta '{query}' completada. {registros} registros procesados.", retardo
     
     def _simular_procesamiento_imagen(self):
-        """Simula procesamiento de imagen"""
-        dimensiones = [(800, 600), (1024, 768), (1920, 1080), (3840, 2160)]
-        dim = random.choice(dimensiones)
+        """Simula procesamiento de imagen; devuelve (resultado, retardo)"""
+        dim = random.choice(DIMENSIONES_IMAGEN)
         filtros = ["blur", "sharpen", "grayscale", "resize", "rotate"]
         filtro = random.choice(filtros)
         
         # Imágenes más grandes = más tiempo
-        factor_tiempo = (dim[0] * dim[1]) / (800 * 600)
-        time.sleep(random.uniform(0.1, 0.3) * factor_tiempo)
+        retardo = muestrear_retardo_imagen(dim)
         
-        return f"Imagen {dim[0]}x{dim[1]} procesada con filtro {filtro}"
+        return f"Imagen {dim[0]}x{dim[1]} procesada con filtro {filtro}", retardo
     
     def obtener_estadisticas(self):
         """Devuelve estadísticas del servidor"""
@@ -125,98 +433,223 @@ class ServidorSimulado:
                 "nombre": self.nombre,
                 "capacidad": self.capacidad,
                 "conexiones_activas": self.conexiones_activas,
-                "carga_cpu": self.carga_cpu,
+                "carga_cpu": self._carga.valor(),
                 "solicitudes_totales": self.solicitudes_totales,
                 "solicitudes_rechazadas": self.solicitudes_rechazadas,
-                "tasa_rechazo": self.solicitudes_rechazadas / max(1, self.solicitudes_totales)
+                "tasa_rechazo": self.solicitudes_rechazadas / max(1, self.solicitudes_totales),
+                **self.admision.estadisticas(),
+                "estancia": percentiles(self.estancia.como_array()),
             }
 
 class ClusterServidores:
     """Gestiona un grupo de servidores simulados"""
     
-    def __init__(self, num_servidores=3):
+    def __init__(self, num_servidores=3, **opciones_admision):
+        """opciones_admision (modo_admision, longitud, timeout...) se aplican a cada servidor"""
         self.servidores = []
+        self.pools = None  # Pools de conexiones TCP cuando el clúster se usa por red
+        self.servidores_tcp = []
+        self.cliente = None  # ClienteInteligente por el que envían las tareas generadas (opcional)
         for i in range(num_servidores):
             # Servidores con capacidades variables
             capacidad = random.randint(5, 15)
             latencia = random.uniform(0.03, 0.1)
-            servidor = ServidorSimulado(f"Servidor-{i}", capacidad, latencia)
+            servidor = ServidorSimulado(f"Servidor-{i}", capacidad, latencia, **opciones_admision)
             self.servidores.append(servidor)
     
+    @property
+    def num_servidores(self):
+        """Número de servidores alcanzables (locales o remotos)"""
+        return len(self.pools) if self.pools is not None else len(self.servidores)
+    
+    def servir_tcp(self, host="127.0.0.1", **opciones_pool):
+        """Sirve cada servidor en un puerto TCP local y envía las solicitudes por red"""
+        self.servidores_tcp = [ServidorTCP(servidor, host).iniciar() for servidor in self.servidores]
+        self.conectar([s.direccion for s in self.servidores_tcp], **opciones_pool)
+    
+    def conectar(self, direcciones, tam_pool=4, timeout_conexion=2.0, timeout_lectura=30.0,
+                 timeout_espera=None):
+        """Usa servidores remotos (p. ej. lanzados con red_servidores.py en otro proceso)"""
+        self.pools = [PoolConexiones(direccion, tam_pool, timeout_conexion, timeout_lectura, timeout_espera)
+                      for direccion in direcciones]
+    
+    def detener_tcp(self):
+        """Cierra los pools de conexiones y los servidores TCP locales"""
+        for pool in self.pools or []:
+            pool.cerrar()
+        for servidor_tcp in self.servidores_tcp:
+            servidor_tcp.detener()
+        self.pools = None
+        self.servidores_tcp = []
+    
+    def activar_cliente_inteligente(self, **opciones):
+        """Las tareas generadas pasan a enviar sus solicitudes con un ClienteInteligente
+        (cobertura, cortocircuitos y reintentos); su servidor queda como el preferido"""
+        from cliente_inteligente import ClienteInteligente  # cliente_inteligente importa este módulo
+        self.cliente = ClienteInteligente(self, **opciones)
+        return self.cliente
+    
+    def solicitar(self, servidor_id, tipo_solicitud, datos=None):
+        """Solicitud de una tarea: por el cliente inteligente si está activado, si no directa"""
+        if self.cliente is not None:
+            return self.cliente.enviar(tipo_solicitud, datos, servidor_id)
+        return self.enviar_solicitud(servidor_id, tipo_solicitud, datos)
+    
+    async def solicitar_async(self, servidor_id, tipo_solicitud, datos=None):
+        """Versión corrutina de solicitar"""
+        if self.cliente is not None:
+            return await self.cliente.enviar_async(tipo_solicitud, datos, servidor_id)
+        return await self.enviar_solicitud_async(servidor_id, tipo_solicitud, datos)
+    
     def enviar_solicitud(self, servidor_id, tipo_solicitud, datos=None):
         """Envía una solicitud a un servidor específico"""
-        if 0 <= servidor_id < len(self.servidores):
+        if 0 <= servidor_id < self.num_servidores:
+            if self.pools is not None:
+                return self.pools[servidor_id].solicitar(tipo_solicitud, datos)
             return self.servidores[servidor_id].procesar_solicitud(tipo_solicitud, datos)
         return False, "Servidor no encontrado"
     
+    async def enviar_solicitud_async(self, servidor_id, tipo_solicitud, datos=None):
+        """Versión corrutina de enviar_solicitud"""
+        if 0 <= servidor_id < self.num_servidores:
+            if self.pools is not None:
+                # El pool TCP es bloqueante: se delega en un hilo del loop
+                return await asyncio.to_thread(self.pools[servidor_id].solicitar, tipo_solicitud, datos)
+            return await self.servidores[servidor_id].procesar_solicitud_async(tipo_solicitud, datos)
+        return False, "Servidor no encontrado"
+    
     def obtener_estadisticas_cluster(self):
         """Obtiene estadísticas de todos los servidores"""
         return [servidor.obtener_estadisticas() for servidor in self.servidores]
 
+_cluster_global = None
+_lock_cluster_global = threading.Lock()
+
+def obtener_cluster(num_servidores=5):
+    """Devuelve el clúster compartido, creándolo la primera vez que se necesita"""
+    global _cluster_global
+    with _lock_cluster_global:
+        if _cluster_global is None:
+            _cluster_global = ClusterServidores(num_servidores=num_servidores)
+        return _cluster_global
+
 # Generadores de tareas que utilizan los servidores simulados
 def generar_tarea_calculo(cluster, servidor_id=None):
     """Genera una tarea de cálculo intensivo"""
     if servidor_id is None:
-        servidor_id = random.randint(0, len(cluster.servidores) - 1)
+        servidor_id = random.randint(0, cluster.num_servidores - 1)
     
     def tarea():
         valor = random.randint(5000, 20000)
-        exito, respuesta = cluster.enviar_solicitud(servidor_id, "calculo", valor)
+        servidor_id = descriptor.servidor  # El balanceador puede haberlo cambiado
+        exito, respuesta = cluster.solicitar(servidor_id, "calculo", valor)
         if not exito:
             raise Exception(f"Error en servidor {servidor_id}: {respuesta}")
         return respuesta["resultado"]
     
-    return tarea
+    descriptor = DescriptorTarea(tarea, "calculo", servidor=servidor_id)
+    return descriptor
 
 def generar_tarea_consulta_db(cluster, servidor_id=None):
     """Genera una tarea de consulta a base de datos"""
     if servidor_id is None:
-        servidor_id = random.randint(0, len(cluster.servidores) - 1)
+        servidor_id = random.randint(0, cluster.num_servidores - 1)
     
     def tarea():
-        consultas = [
-            "SELECT * FROM usuarios WHERE activo=1",
-            "UPDATE productos SET precio=precio*1.05 WHERE categoria='electronics'",
-            "SELECT p.nombre, c.nombre FROM productos p JOIN categorias c ON p.categoria_id = c.id",
-            "DELETE FROM sesiones WHERE fecha < NOW() - INTERVAL 1 DAY"
-        ]
-        consulta = random.choice(consultas)
-        exito, respuesta = cluster.enviar_solicitud(servidor_id, "consulta_db", consulta)
+        consulta = random.choice(CONSULTAS_DB)
+        servidor_id = descriptor.servidor  # El balanceador puede haberlo cambiado
+        exito, respuesta = cluster.solicitar(servidor_id, "consulta_db", consulta)
         if not exito:
             raise Exception(f"Error en servidor {servidor_id}: {respuesta}")
         return respuesta["resultado"]
     
-    return tarea
+    descriptor = DescriptorTarea(tarea, "consulta_db", servidor=servidor_id)
+    return descriptor
 
 def generar_tarea_procesamiento_imagen(cluster, servidor_id=None):
     """Genera una tarea de procesamiento de imagen"""
     if servidor_id is None:
-        servidor_id = random.randint(0, len(cluster.servidores) - 1)
+        servidor_id = random.randint(0, cluster.num_servidores - 1)
     
     def tarea():
-        exito, respuesta = cluster.enviar_solicitud(servidor_id, "procesamiento_img")
+        servidor_id = descriptor.servidor  # El balanceador puede haberlo cambiado
+        exito, respuesta = cluster.solicitar(servidor_id, "procesamiento_img")
         if not exito:
             raise Exception(f"Error en servidor {servidor_id}: {respuesta}")
         return respuesta["resultado"]
     
-    return tarea
+    descriptor = DescriptorTarea(tarea, "procesamiento_img", servidor=servidor_id)
+    return descriptor
 
 # Función para generar un conjunto mixto de tareas
-def generar_conjunto_tareas(cluster, num_tareas=10):
-    """Genera un conjunto mixto de tareas para balanceo"""
-    tareas = []
+def generar_flujo_tareas(cluster, num_tareas=None):
+    """Genera tareas mixtas de forma perezosa; sin num_tareas el flujo no termina"""
     tipos_tarea = [
         generar_tarea_calculo,
         generar_tarea_consulta_db,
         generar_tarea_procesamiento_imagen
     ]
+    contador = itertools.count() if num_tareas is None else range(num_tareas)
+    for _ in contador:
+        yield random.choice(tipos_tarea)(cluster)
+
+def generar_conjunto_tareas(cluster, num_tareas=10):
+    """Genera un conjunto mixto de tareas para balanceo"""
+    return list(generar_flujo_tareas(cluster, num_tareas))
+
+# Versiones corrutina de los generadores: cada tarea es una función async que el
+# backend "asyncio" ejecuta en un único event loop, sin ocupar un hilo por solicitud
+def _generar_tarea_async(cluster, servidor_id, tipo_solicitud, obtener_datos=None):
+    if servidor_id is None:
+        servidor_id = random.randint(0, cluster.num_servidores - 1)
     
-    for _ in range(num_tareas):
-        generador = random.choice(tipos_tarea)
-        tarea = generador(cluster)
-        tareas.append(tarea)
+    async def tarea():
+        datos = obtener_datos() if obtener_datos is not None else None
+        servidor_id = descriptor.servidor
+        exito, respuesta = await cluster.solicitar_async(servidor_id, tipo_solicitud, datos)
+        if not exito:
+            raise Exception(f"Error en servidor {servidor_id}: {respuesta}")
+        return respuesta["resultado"]
     
-    return tareas
+    descriptor = DescriptorTarea(tarea, tipo_solicitud, servidor=servidor_id)
+    return descriptor
+
+def generar_tarea_calculo_async(cluster, servidor_id=None):
+    """Genera una tarea asíncrona de cálculo intensivo"""
+    return _generar_tarea_async(cluster, servidor_id, "calculo", lambda: random.randint(5000, 20000))
+
+def generar_tarea_consulta_db_async(cluster, servidor_id=None):
+    """Genera una tarea asíncrona de consulta a base de datos"""
+    return _generar_tarea_async(cluster, servidor_id, "consulta_db", lambda: random.choice(CONSULTAS_DB))
+
+def generar_tarea_procesamiento_imagen_async(cluster, servidor_id=None):
+    """Genera una tarea asíncrona de procesamiento de imagen"""
+    return _generar_tarea_async(cluster, servidor_id, "procesamiento_img")
+
+def generar_conjunto_tareas_async(cluster, num_tareas=10):
+    """Genera un conjunto mixto de tareas asíncronas para el backend asyncio"""
+    tipos_tarea = [
+        generar_tarea_calculo_async,
+        generar_tarea_consulta_db_async,
+        generar_tarea_procesamiento_imagen_async
+    ]
+    return [random.choice(tipos_tarea)(cluster) for _ in range(num_tareas)]
+
+async def generar_llegadas_async(cluster, tasa_llegadas, num_tareas=None):
+    """Proceso de llegadas de Poisson: iterador asíncrono de tareas asíncronas mixtas.
+
+    Espera un tiempo exponencial de media 1/tasa_llegadas entre tareas; sin
+    num_tareas no termina nunca.
+    """
+    tipos_tarea = [
+        generar_tarea_calculo_async,
+        generar_tarea_consulta_db_async,
+        generar_tarea_procesamiento_imagen_async
+    ]
+    contador = itertools.count() if num_tareas is None else range(num_tareas)
+    for _ in contador:
+        await asyncio.sleep(random.expovariate(tasa_llegadas))
+        yield random.choice(tipos_tarea)(cluster)
 
 # Prueba simple del simulador si se ejecuta directamente
 if __name__ == "__main__":
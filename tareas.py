@@ -1,7 +1,73 @@
+import math
+import os
+import shutil
+import tempfile
+import time
+import weakref
 import numpy as np
 import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import NamedTuple
+from cache_resultados import cacheable
 
-def calcular_primos_pesado(n=1_000_000):
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # Dependencia opcional
+    threadpool_limits = None
+
+MODOS_PRIMOS = ("criba", "referencia")
+# Números impares por segmento de la criba: 256 KiB de bytes, cabe en la caché L2
+TAM_SEGMENTO = 1 << 18
+
+MODOS_MATRICES = ("denso", "bloques")
+# Memoria de trabajo por defecto del modo por bloques (bytes)
+PRESUPUESTO_MEMORIA_MATRICES = 64 * 1024 ** 2
+
+MODOS_MONTECARLO = ("vectorizado", "referencia")
+METODOS_MONTECARLO = ("pseudo", "antitetico", "halton", "sobol")
+# Muestras por bloque de Monte Carlo: x e y ocupan 16 MiB en total
+TAM_BLOQUE_MONTECARLO = 1 << 20
+
+class ResultadoMontecarlo(NamedTuple):
+    """Estimación de PI junto con el rendimiento medido"""
+    pi: float
+    muestras: int
+    segundos: float
+    procesos: int
+    muestras_por_segundo_nucleo: float
+
+@cacheable
+def calcular_primos_pesado(n=1_000_000, modo="criba", procesos=1, tam_segmento=TAM_SEGMENTO):
+    """Cuenta los primos menores que n.
+
+    - "criba": criba de Eratóstenes segmentada y vectorizada con NumPy. Solo guarda los
+      impares de un segmento (un byte por número) y los primos base hasta sqrt(n), así que
+      la memoria es acotada incluso para n = 10^9. Con procesos > 1 los segmentos se
+      reparten entre varios procesos.
+    - "referencia": división por tentativa original, O(n·√n). Se mantiene para las cargas
+      de los balanceadores que necesitan trabajo de CPU deliberadamente pesado.
+    """
+    if modo == "referencia":
+        return _calcular_primos_referencia(n)
+    if modo != "criba":
+        raise ValueError(f"Modo no válido: {modo!r} (opciones: {', '.join(MODOS_PRIMOS)})")
+
+    n = int(n)
+    if n <= 2:
+        return 0
+    primos_base = _primos_base(math.isqrt(n - 1))
+    if procesos <= 1:
+        return 1 + _contar_primos_impares(3, n, primos_base, tam_segmento)
+
+    # Repartir el rango [3, n) en tramos contiguos, uno por proceso
+    limites = np.linspace(3, n, procesos + 1).astype(np.int64).tolist()
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        conteos = ejecutor.map(_contar_primos_impares, limites[:-1], limites[1:],
+                               [primos_base] * procesos, [tam_segmento] * procesos)
+        return 1 + sum(conteos)  # El 1 corresponde al primo 2
+
+def _calcular_primos_referencia(n):
     primos = []
     for num in range(2, n):
         es_primo = True
@@ -13,16 +79,230 @@ def calcular_primos_pesado(n=1_000_000):
             primos.append(num)
     return len(primos)  # Devolver cantidad de primos encontrados
 
-def multiplicar_matrices_gigantes(tamano=3000):
-    A = np.random.rand(tamano, tamano)
-    B = np.random.rand(tamano, tamano)
-    return np.dot(A, B)  # Devolver resultado (aunque sea muy grande)
+def _primos_base(limite):
+    """Primos impares <= limite, usados para tachar múltiplos en cada segmento"""
+    criba = np.ones(limite + 1, dtype=np.bool_)
+    criba[:2] = False
+    for i in range(2, math.isqrt(limite) + 1):
+        if criba[i]:
+            criba[i * i::i] = False
+    primos = np.flatnonzero(criba)
+    return primos[primos > 2]
+
+def _contar_primos_impares(inicio, fin, primos_base, tam_segmento=TAM_SEGMENTO):
+    """Cuenta los primos impares en [inicio, fin) recorriendo segmentos de solo impares"""
+    inicio = max(3, int(inicio) | 1)  # Primer impar >= inicio
+    fin = int(fin)
+    segmento = np.empty(tam_segmento, dtype=np.uint8)
+    total = 0
+    for bajo in range(inicio, fin, 2 * tam_segmento):
+        alto = min(bajo + 2 * tam_segmento, fin)
+        # El índice k del segmento representa el número bajo + 2k
+        largo = (alto - bajo + 1) // 2
+        vista = segmento[:largo]
+        vista.fill(1)
+        limite = np.searchsorted(primos_base, math.isqrt(alto - 1), side="right")
+        for p in primos_base[:limite].tolist():
+            # Primer múltiplo impar de p dentro del segmento que no sea el propio p
+            multiplo = max(p * p, -(-bajo // p) * p)
+            if multiplo % 2 == 0:
+                multiplo += p
+            if multiplo < alto:
+                vista[(multiplo - bajo) // 2::p] = 0
+        total += int(np.count_nonzero(vista))
+    return total
+
+@cacheable(semilla="semilla")
+def multiplicar_matrices_gigantes(tamano=3000, modo="denso", devolver="matriz", hilos_blas=None,
+                                  presupuesto_memoria=PRESUPUESTO_MEMORIA_MATRICES, directorio=None,
+                                  semilla=None):
+    """Multiplica dos matrices aleatorias de tamano x tamano.
+
+    - "denso": A, B y el producto viven completos en memoria (~24·tamano² bytes).
+    - "bloques": A, B y C se respaldan con ficheros numpy.memmap y se multiplican bloque a
+      bloque, de modo que en RAM solo hay unos pocos bloques dentro de presupuesto_memoria.
+      El resultado es un memmap (en un directorio temporal dentro de `directorio` o del
+      directorio temporal del sistema) que se borra al liberar el array.
+    Con devolver="checksum" solo se devuelve la suma de C. hilos_blas limita los hilos
+    de BLAS durante la multiplicación (requiere threadpoolctl). Con semilla, las matrices
+    son reproducibles (y el resultado puede salir de la caché).
+    """
+    if devolver not in ("matriz", "checksum"):
+        raise ValueError(f"Valor de devolver no válido: {devolver!r} (opciones: matriz, checksum)")
+    with limitar_hilos_blas(hilos_blas):
+        if modo == "denso":
+            rng = np.random.default_rng(semilla)
+            A = rng.random((tamano, tamano))
+            B = rng.random((tamano, tamano))
+            C = np.dot(A, B)  # Devolver resultado (aunque sea muy grande)
+            return float(C.sum()) if devolver == "checksum" else C
+        if modo == "bloques":
+            return _multiplicar_por_bloques(int(tamano), devolver, presupuesto_memoria, directorio, semilla)
+    raise ValueError(f"Modo no válido: {modo!r} (opciones: {', '.join(MODOS_MATRICES)})")
+
+def _multiplicar_por_bloques(tamano, devolver, presupuesto_memoria, directorio, semilla=None):
+    # En cada paso conviven un bloque de A, uno de B, el acumulador de C y el producto parcial
+    bloque = max(1, min(tamano, math.isqrt(max(1, presupuesto_memoria) // (4 * 8))))
+    carpeta = tempfile.mkdtemp(prefix="matrices_", dir=directorio)
+    forma = (tamano, tamano)
+    rutas = [os.path.join(carpeta, f"{nombre}.dat") for nombre in ("A", "B", "C")]
+    A = np.memmap(rutas[0], dtype=np.float64, mode="w+", shape=forma)
+    B = np.memmap(rutas[1], dtype=np.float64, mode="w+", shape=forma)
+    C = np.memmap(rutas[2], dtype=np.float64, mode="w+", shape=forma)
+    rng = np.random.default_rng(semilla)
+    rangos = [(i, min(i + bloque, tamano)) for i in range(0, tamano, bloque)]
+
+    # A y B se rellenan en orden de filas, por tramos, del mismo flujo que usa el modo
+    # "denso": con la misma semilla ambos modos multiplican las mismas matrices
+    tramo = bloque * bloque
+    for matriz in (A, B):
+        plana = matriz.reshape(-1)
+        for k in range(0, plana.size, tramo):
+            plana[k:k + tramo] = rng.random(min(tramo, plana.size - k))
+
+    checksum = 0.0
+    for i0, i1 in rangos:
+        for j0, j1 in rangos:
+            acumulado = np.zeros((i1 - i0, j1 - j0))
+            for k0, k1 in rangos:
+                acumulado += np.asarray(A[i0:i1, k0:k1]) @ np.asarray(B[k0:k1, j0:j1])
+            if devolver == "checksum":
+                checksum += float(acumulado.sum())
+            else:
+                C[i0:i1, j0:j1] = acumulado
+
+    # Las entradas ya no hacen falta: liberar sus mapeos y borrar los ficheros
+    del A, B
+    for ruta in rutas[:2]:
+        os.remove(ruta)
+    if devolver == "checksum":
+        del C
+        shutil.rmtree(carpeta, ignore_errors=True)
+        return checksum
+    C.flush()
+    # El fichero de C vive mientras viva el array devuelto
+    weakref.finalize(C, shutil.rmtree, carpeta, ignore_errors=True)
+    return C
+
+@contextmanager
+def limitar_hilos_blas(hilos):
+    """Limita temporalmente los hilos de BLAS para no sobresuscribir los núcleos"""
+    if not hilos or threadpool_limits is None:
+        yield
+        return
+    with threadpool_limits(limits=hilos, user_api="blas"):
+        yield
+
+@cacheable(semilla="semilla")
+def simulacion_montecarlo(iteraciones=30_000_000, modo="vectorizado", **opciones):
+    """Aproxima PI por Monte Carlo.
+
+    - "vectorizado": núcleo por bloques con NumPy (ver simulacion_montecarlo_detallada,
+      que acepta semilla, metodo, tam_bloque y procesos).
+    - "referencia": bucle original con random.random(), deliberadamente pesado en CPU
+      (solo admite la opción semilla).
+    """
+    if modo == "referencia":
+        return _simulacion_montecarlo_referencia(iteraciones, opciones.get("semilla"))
+    if modo != "vectorizado":
+        raise ValueError(f"Modo no válido: {modo!r} (opciones: {', '.join(MODOS_MONTECARLO)})")
+    return simulacion_montecarlo_detallada(iteraciones, **opciones).pi
+
+def simulacion_montecarlo_detallada(iteraciones=30_000_000, semilla=None, metodo="pseudo",
+                                    tam_bloque=TAM_BLOQUE_MONTECARLO, procesos=1):
+    """Núcleo Monte Carlo por bloques; devuelve la estimación y el rendimiento por núcleo.
+
+    Las muestras se dividen en bloques de tamaño fijo y cada bloque recibe su propia
+    semilla derivada con SeedSequence.spawn, así que para una misma semilla el resultado
+    es idéntico bit a bit sin importar cuántos procesos participen. Métodos:
+    - "pseudo": muestras pseudoaleatorias de numpy.random.Generator.
+    - "antitetico": cada punto (x, y) se evalúa junto a (1-x, 1-y) para reducir varianza.
+    - "halton" / "sobol": secuencias de baja discrepancia con desplazamiento aleatorio;
+      alcanzan la misma precisión con muchas menos muestras.
+    """
+    if metodo not in METODOS_MONTECARLO:
+        raise ValueError(f"Método no válido: {metodo!r} (opciones: {', '.join(METODOS_MONTECARLO)})")
+    iteraciones = int(iteraciones)
+    tam_bloque = max(1, int(tam_bloque))
+    inicio = time.perf_counter()
+
+    raiz = np.random.SeedSequence(semilla)
+    num_bloques = -(-iteraciones // tam_bloque)
+    semillas = raiz.spawn(num_bloques)
+    # Desplazamiento aleatorio común a toda la secuencia cuasialeatoria
+    desplazamiento = np.random.default_rng(raiz.generate_state(2)).integers(0, 2**32, size=2, dtype=np.uint64)
+    bloques = [(b * tam_bloque, min(tam_bloque, iteraciones - b * tam_bloque), semillas[b], metodo, desplazamiento)
+               for b in range(num_bloques)]
+
+    if procesos <= 1:
+        dentro = sum(_contar_bloque_montecarlo(*bloque) for bloque in bloques)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            dentro = sum(ejecutor.map(_contar_bloque_montecarlo, *zip(*bloques)))
+
+    segundos = time.perf_counter() - inicio
+    procesos = max(1, procesos)
+    return ResultadoMontecarlo(
+        pi=4 * dentro / max(1, iteraciones),
+        muestras=iteraciones,
+        segundos=segundos,
+        procesos=procesos,
+        muestras_por_segundo_nucleo=iteraciones / max(segundos, 1e-12) / procesos,
+    )
+
+def _contar_bloque_montecarlo(inicio, tamano, semilla, metodo, desplazamiento):
+    """Cuenta cuántos puntos de un bloque caen dentro del cuarto de círculo"""
+    if metodo == "pseudo":
+        x, y = np.random.default_rng(semilla).random((2, tamano))
+        return int(np.count_nonzero(x * x + y * y <= 1.0))
+    if metodo == "antitetico":
+        pares = tamano // 2
+        x, y = np.random.default_rng(semilla).random((2, pares + tamano % 2))
+        dentro = int(np.count_nonzero(x * x + y * y <= 1.0))
+        xa, ya = 1.0 - x[:pares], 1.0 - y[:pares]
+        return dentro + int(np.count_nonzero(xa * xa + ya * ya <= 1.0))
+
+    indices = np.arange(inicio, inicio + tamano, dtype=np.uint64)
+    if metodo == "sobol":
+        x, y = _sobol_2d(indices, desplazamiento)
+    else:  # halton
+        x = (_radical_inverso(indices + 1, 2) + desplazamiento[0] / 2**32) % 1.0
+        y = (_radical_inverso(indices + 1, 3) + desplazamiento[1] / 2**32) % 1.0
+    return int(np.count_nonzero(x * x + y * y <= 1.0))
+
+def _radical_inverso(indices, base):
+    """Inverso radical (van der Corput) en la base dada, vectorizado"""
+    resultado = np.zeros(indices.shape, dtype=np.float64)
+    restante = indices.copy()
+    factor = 1.0 / base
+    while restante.any():
+        resultado += (restante % base) * factor
+        restante //= base
+        factor /= base
+    return resultado
+
+def _sobol_2d(indices, desplazamiento):
+    """Primeras dos dimensiones de Sobol' (32 bits) con desplazamiento digital XOR"""
+    x = np.zeros(indices.shape, dtype=np.uint64)
+    y = np.zeros(indices.shape, dtype=np.uint64)
+    m = 1  # Números de dirección de la 2ª dimensión: polinomio x + 1, m_k = 2·m_(k-1) XOR m_(k-1)
+    for k in range(32):
+        bit = (indices >> np.uint64(k)) & np.uint64(1)
+        if not bit.any():
+            break
+        x ^= bit * np.uint64(1 << (31 - k))
+        y ^= bit * np.uint64(m << (31 - k))
+        m = (m << 1) ^ m
+    x ^= desplazamiento[0]
+    y ^= desplazamiento[1]
+    return x / 2.0**32, y / 2.0**32
 
-def simulacion_montecarlo(iteraciones=30_000_000):
+def _simulacion_montecarlo_referencia(iteraciones, semilla=None):
+    rng = random.Random(semilla)
     dentro = 0
     for _ in range(iteraciones):
-        x = random.random()
-        y = random.random()
+        x = rng.random()
+        y = rng.random()
         if x**2 + y**2 <= 1:
             dentro += 1
     pi_aprox = (dentro / iteraciones) * 4